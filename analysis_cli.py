@@ -0,0 +1,194 @@
+"""
+analysis_cli.py
+~~~~~~~~~~~~~~~
+
+모든 분석 스크립트를 하나의 진입점에서 실행하는 통합 CLI
+
+스크립트마다 인터프리터를 새로 띄우면 pandas/matplotlib 로딩과 한글 폰트 설정을
+매번 다시 하게 됩니다. 이 진입점은 분석을 모두 한 프로세스에서 실행하므로
+라이브러리와 폰트 설정, 이미 로드한 분석기(설문/델리바이 애슐리/샘플 리뷰)와 메뉴 테이블을 공유합니다.
+각 분석 모듈은 서브커맨드를 실행할 때 처음 불러옵니다.
+
+사용법:
+    python analysis_cli.py list
+    python analysis_cli.py survey --summary-only
+    python analysis_cli.py menu-pricing-real --excel "상품별 판매 데이터.xlsx"
+    python analysis_cli.py --dpi 150 --format webp run-all
+    python analysis_cli.py serve --port 8765
+
+서브커맨드 뒤의 인자는 해당 스크립트의 옵션으로 그대로 전달됩니다.
+run-all은 입력 파일이 필요 없는 모든 분석을 헤드리스 모드로 차례로 실행합니다.
+"""
+
+import argparse
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from chart_rendering import add_render_arguments, apply_render_arguments, configure
+
+@dataclass
+class Command:
+    name: str
+    module: str
+    entry: str
+    help: str
+    takes_argv: bool = False
+    shared: Optional[Tuple[str, str]] = None  # (키워드 인자 이름, 주입할 SharedState 속성 이름)
+    wants_state: bool = False       # SharedState 전체를 state=로 주입
+    in_run_all: bool = True
+
+COMMANDS: Dict[str, Command] = {command.name: command for command in [
+    Command('analyze-real-data', 'analyze_real_data', 'analyze_real_data',
+            '실제 상품 데이터 기반 메뉴 가격 분석 (텍스트)'),
+    Command('bp-menu-pricing', 'bp_menu_pricing', 'analyze_bp_menu_data',
+            'BP 정리 자료 기반 메뉴 가격 산정 (텍스트)'),
+    Command('real-menu-pricing', 'real_menu_pricing', 'main',
+            '실제 상품 데이터 기반 가격 산정과 메뉴판 이미지', takes_argv=True,
+            shared=('table', 'real_menu_table')),
+    Command('menu-pricing', 'menu_pricing', 'main',
+            '재료/레시피 CSV 기반 메뉴 가격 산정', takes_argv=True),
+    Command('menu-pricing-real', 'menu_pricing_real', 'main',
+            'Excel 판매 데이터 기반 메뉴 가격 산정 (--excel 필요)', takes_argv=True, in_run_all=False),
+    Command('survey', 'customer_survey_analysis', 'main',
+            '현장조사 고객별 MECE 통계 분석', takes_argv=True, shared=('analyzer', 'survey')),
+    Command('delivery-ashley', 'delivery_ashley_menu_analysis', 'main',
+            '델리바이 애슐리 메뉴 개발 분석', takes_argv=True, shared=('analyzer', 'delivery')),
+    Command('naver-review', 'naver_review_health_food_analysis', 'main',
+            '네이버 리뷰 기반 건강한 음식 욕구 분석', takes_argv=True, shared=('analyzer', 'naver')),
+    Command('complaint-chart', 'complaint_analysis_chart', 'create_complaint_analysis',
+            '단점 분석 및 아쉬움 중심 차트'),
+    Command('health-chart', 'create_health_focused_chart', 'create_health_focused_analysis',
+            '집밥 건강 니즈 중심 현장조사 차트'),
+    Command('simple-health', 'simple_health_analysis', 'create_health_focused_analysis',
+            '집밥 건강 니즈 간단 분석 (텍스트)'),
+    Command('complaint-categories', 'complaint_categorizer', 'main',
+            '불만사항 자유 응답 카테고리 분류 (--input 필요)', takes_argv=True, in_run_all=False),
+    Command('serve', 'analysis_server', 'main',
+            '분석기를 메모리에 올려 둔 로컬 HTTP/JSON 서비스 실행', takes_argv=True,
+            wants_state=True, in_run_all=False),
+]}
+
+class SharedState:
+    """한 프로세스 안에서 여러 분석이 공유하는 로드된 데이터와 분석기
+
+    survey/delivery/naver/real-menu-pricing 서브커맨드와 analysis_server가 같은 객체를 씁니다.
+    naver는 샘플 리뷰 분석(리뷰 파일/색인/토큰화 옵션 없음)일 때만 공유되며,
+    real_menu_table은 쓰는 쪽이 ``copy()``한 복사본에 가격/구간 컬럼을 계산하므로 원가 데이터만 공유되며
+    공유 테이블 자체는 바뀌지 않습니다 (서버의 동시 요청과 차트 렌더링이 서로 영향을 주지 않음).
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, Any] = {}
+        # 서버의 이벤트 루프와 렌더링 스레드가 동시에 처음 접근해도 한 번만 생성
+        self._lock = threading.RLock()
+
+    def get(self, key: str, factory: Callable[[], Any]) -> Any:
+        """key에 해당하는 객체 (없으면 factory로 한 번만 생성)"""
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = factory()
+            return self._cache[key]
+
+    @property
+    def survey(self):
+        """현장조사 고객 설문 분석기"""
+        from customer_survey_analysis import CustomerSurveyAnalyzer
+        return self.get('survey', CustomerSurveyAnalyzer)
+
+    @property
+    def delivery(self):
+        """델리바이 애슐리 메뉴 개발 분석기"""
+        from delivery_ashley_menu_analysis import DeliveryAshleyMenuAnalyzer
+        return self.get('delivery', DeliveryAshleyMenuAnalyzer)
+
+    @property
+    def naver(self):
+        """샘플 리뷰 기반 네이버 리뷰 분석기"""
+        from naver_review_health_food_analysis import NaverReviewHealthFoodAnalyzer
+        return self.get('naver', NaverReviewHealthFoodAnalyzer)
+
+    @property
+    def real_menu_table(self):
+        """실제 상품 데이터 메뉴 테이블"""
+        from real_menu_pricing import load_real_data
+        return self.get('real_menu_table', load_real_data)
+
+def run_command(name: str, argv: Optional[List[str]] = None,
+                state: Optional[SharedState] = None) -> Any:
+    """서브커맨드 하나를 현재 프로세스에서 실행"""
+    command = COMMANDS[name]
+    argv = list(argv or [])
+    if argv and not command.takes_argv:
+        raise SystemExit(f"'{name}' does not take arguments: {' '.join(argv)}")
+    entry = getattr(importlib.import_module(command.module), command.entry)
+    if not command.takes_argv:
+        return entry()
+    kwargs = {}
+    if command.shared and state is not None:
+        argument, attribute = command.shared
+        kwargs[argument] = getattr(state, attribute)
+    if command.wants_state:
+        kwargs['state'] = state
+    return entry(argv, **kwargs)
+
+def run_all(state: Optional[SharedState] = None) -> Dict[str, Optional[str]]:
+    """입력 파일이 필요 없는 모든 분석을 차례로 실행하고 {이름: 오류 메시지 또는 None} 반환
+
+    한 분석이 실패해도 나머지는 계속 실행합니다.
+    """
+    state = state or SharedState()
+    results: Dict[str, Optional[str]] = {}
+    timings: Dict[str, float] = {}
+    for command in COMMANDS.values():
+        if not command.in_run_all:
+            continue
+        print("\n" + "#" * 100)
+        print(f"# {command.name}: {command.help}")
+        print("#" * 100)
+        start = time.perf_counter()
+        try:
+            run_command(command.name, [], state)
+            results[command.name] = None
+        except (Exception, SystemExit) as e:
+            results[command.name] = f"{type(e).__name__}: {e}"
+        timings[command.name] = time.perf_counter() - start
+
+    print("\n" + "=" * 80)
+    print("📋 전체 분석 실행 결과")
+    print("=" * 80)
+    for name, error in results.items():
+        status = "완료" if error is None else f"실패 - {error}"
+        print(f"  • {name:<20} {timings[name]:>6.2f}초  {status}")
+    return results
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="분석 스크립트 통합 실행기",
+        epilog="서브커맨드: list, run-all, " + ", ".join(COMMANDS))
+    add_render_arguments(parser)
+    parser.add_argument('command', choices=['list', 'run-all'] + list(COMMANDS),
+                        metavar='command', help='실행할 분석 (list로 목록 확인)')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='분석 스크립트에 전달할 옵션')
+    args = parser.parse_args(argv)
+    apply_render_arguments(args)
+
+    if args.command == 'list':
+        for command in COMMANDS.values():
+            print(f"  {command.name:<20} {command.help}")
+        return
+    if args.command == 'run-all':
+        if args.args:
+            parser.error("run-all does not take arguments")
+        # 일괄 실행 중 창이 떠서 멈추지 않도록 파일로만 저장
+        configure(headless=True)
+        failures = [name for name, error in run_all().items() if error]
+        if failures:
+            raise SystemExit(1)
+        return
+    run_command(args.command, args.args, SharedState())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+"""
+analysis_server.py
+~~~~~~~~~~~~~~~~~~
+
+분석기를 메모리에 올려 둔 채 로컬 HTTP/JSON API로 제공하는 상주 서비스
+
+대시보드가 스크립트를 서브프로세스로 호출하면 요청마다 인터프리터와 pandas/matplotlib
+로딩 비용을 치릅니다. 이 서비스는 설문/델리바이 애슐리 분석기와 가격 산정 테이블을
+한 번만 로드해 두고 asyncio 서버로 요청을 받으므로 요청당 지연이 밀리초 단위입니다.
+차트는 전용 렌더링 스레드 하나에서 그리며(matplotlib은 스레드 안전하지 않음),
+같은 차트/설정의 결과 이미지는 메모리에 캐시합니다.
+
+엔드포인트:
+    GET  /health                          상태 확인
+    GET  /pricing/quote?cost_ratio=0.45   원가율 하나에 대한 제안가/총이익률/가격 구간
+         (&base_cost=1000&ideal_pct=0.3&tiers=3990,7990,9990)
+    GET  /pricing/menu                    실제 상품 데이터 전체 가격 산정 결과
+    POST /pricing/quote                   {"items": [{"name": ..., "cost_ratio": ...}, ...],
+                                           "base_cost": ..., "ideal_pct": ..., "tiers": [...]}
+    GET  /survey/summary                  설문 표본 수, 연령/성별 분포, 만족/불만/메뉴 지표
+    GET  /survey/segment?age_group=50대&gender=여성
+                                          세그먼트 응답자 수와 지표별 인원 (사전 집계 큐브 조회)
+    GET  /charts/<이름>                   차트 이미지 (survey, delivery-ashley, naver-review)
+
+사용법:
+    python analysis_server.py [--host 127.0.0.1] [--port 8765]
+    python analysis_cli.py serve --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from analysis_cli import SharedState
+from chart_rendering import chart_format, configure, get_pyplot, output_path, render_config
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+DEFAULT_TIERS = [3990.0, 7990.0, 9990.0]
+
+# 요청 본문 최대 크기 (로컬 대시보드용이므로 작게 제한)
+MAX_BODY_BYTES = 1 << 20
+
+_CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'webp': 'image/webp'}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+# 차트 이름 -> SharedState 분석기로 파일을 그리는 함수
+CHARTS: Dict[str, Callable[[SharedState, str], Any]] = {
+    'survey': lambda state, outfile: state.survey.create_visualizations(outfile),
+    'delivery-ashley': lambda state, outfile: state.delivery.create_health_focused_visualization(outfile,
+                                                                                                 verbose=False),
+    'naver-review': lambda state, outfile: state.naver.create_health_demand_chart(outfile, verbose=False),
+}
+
+def _finite(value: Any, message: str) -> float:
+    """유한한 실수로 변환 (숫자가 아니거나 nan/inf면 400 오류)"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, message)
+    if not math.isfinite(number):
+        raise HTTPError(400, message)
+    return number
+
+def _float_param(query: Dict[str, List[str]], name: str, default: Optional[float] = None) -> float:
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise HTTPError(400, f"missing query parameter '{name}'")
+        return default
+    return _finite(values[-1], f"query parameter '{name}' must be a finite number")
+
+def _tiers_param(value: Any) -> List[float]:
+    if value is None:
+        return DEFAULT_TIERS
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)):
+        raise HTTPError(400, "tiers must be a list of finite numbers")
+    tiers = [_finite(t, "tiers must be a list of finite numbers") for t in value]
+    if not tiers:
+        raise HTTPError(400, "tiers must not be empty")
+    return tiers
+
+def _pricing_payload(table, base_cost: float, ideal_pct: float, tiers: List[float]) -> Dict[str, Any]:
+    if ideal_pct <= 0:
+        raise HTTPError(400, "ideal_pct must be positive")
+    table.calculate_pricing(base_cost=base_cost, ideal_pct=ideal_pct)
+    table.categorize_tier(tiers)
+    return {
+        'base_cost': base_cost,
+        'ideal_pct': ideal_pct,
+        'items': [{'name': name, 'cost_ratio': ratio, 'suggested_price': round(price, 2),
+                   'gross_margin': round(margin, 4), 'tier': tier}
+                  for name, ratio, price, margin, tier in zip(
+                      table.names.tolist(), table.cost_ratio.tolist(), table.suggested_price.tolist(),
+                      table.gross_margin.tolist(), table.tiers)],
+        'tier_counts': table.tier_counts(),
+    }
+
+class AnalysisService:
+    """요청을 처리하는 상주 서비스 (로드된 분석기와 렌더링 캐시 보관)"""
+
+    def __init__(self, state: Optional[SharedState] = None):
+        self.state = state or SharedState()
+        self._render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart-render')
+        self._chart_cache: Dict[Tuple[str, int, str], bytes] = {}
+        self._chart_dir = tempfile.mkdtemp(prefix='analysis-charts-')
+
+    def warm_up(self) -> None:
+        """분석기, 가격 테이블, pyplot과 폰트 설정을 미리 로드 (요청 처리 전에 호출)"""
+        self.state.survey.cube
+        self.state.delivery
+        self.state.naver
+        self.state.real_menu_table
+        get_pyplot()
+
+    def close(self) -> None:
+        self._render_executor.shutdown(wait=True)
+        shutil.rmtree(self._chart_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------ 라우팅
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        """(상태 코드, Content-Type, 응답 본문)"""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = url.path.rstrip('/') or '/'
+        if path == '/health':
+            return self._json({'status': 'ok'})
+        if path == '/pricing/quote':
+            if method == 'GET':
+                return self._json(self.quote_single(query))
+            if method == 'POST':
+                return self._json(self.quote_batch(self._json_body(body)))
+            raise HTTPError(405, "use GET or POST")
+        if method != 'GET':
+            raise HTTPError(405, "use GET")
+        if path == '/pricing/menu':
+            return self._json(self.menu_pricing(query))
+        if path == '/survey/summary':
+            return self._json(self.survey_summary())
+        if path == '/survey/segment':
+            return self._json(self.survey_segment(query))
+        if path.startswith('/charts/'):
+            name = path[len('/charts/'):]
+            name = os.path.splitext(name)[0]
+            data = await self.chart(name)
+            return 200, _CONTENT_TYPES[chart_format()], data
+        raise HTTPError(404, f"no route for {path}")
+
+    @staticmethod
+    def _json(payload: Any, status: int = 200) -> Tuple[int, str, bytes]:
+        return status, 'application/json; charset=utf-8', json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _json_body(body: bytes) -> Dict[str, Any]:
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(400, "request body must be JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "request body must be a JSON object")
+        return payload
+
+    # ------------------------------------------------------------------ 가격 산정
+    def quote_single(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        from price_tiers import tier_classifier
+
+        cost_ratio = _float_param(query, 'cost_ratio')
+        base_cost = _float_param(query, 'base_cost', 1000.0)
+        ideal_pct = _float_param(query, 'ideal_pct', 0.30)
+        tiers = _tiers_param(query.get('tiers', [None])[-1])
+        if ideal_pct <= 0:
+            raise HTTPError(400, "ideal_pct must be positive")
+        actual_cost = base_cost * cost_ratio
+        suggested_price = actual_cost / ideal_pct
+        gross_margin = (suggested_price - actual_cost) / suggested_price if suggested_price > 0 else 0.0
+        return {
+            'cost_ratio': cost_ratio,
+            'actual_cost': actual_cost,
+            'suggested_price': round(suggested_price, 2),
+            'gross_margin': round(gross_margin, 4),
+            'tier': tier_classifier(tiers).classify(suggested_price),
+        }
+
+    def quote_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        from menu_table import MenuTable
+
+        items = payload.get('items')
+        if not isinstance(items, list) or not items:
+            raise HTTPError(400, "'items' must be a non-empty list")
+        message = "each item needs a finite numeric 'cost_ratio' (and 'daily_sales' if given)"
+        try:
+            table = MenuTable([str(item.get('name', i)) for i, item in enumerate(items)],
+                              [_finite(item.get('daily_sales', 0.0), message) for item in items],
+                              [_finite(item['cost_ratio'], message) for item in items])
+        except (AttributeError, KeyError):
+            raise HTTPError(400, message)
+        base_cost = _finite(payload.get('base_cost', 1000.0), "base_cost must be a finite number")
+        ideal_pct = _finite(payload.get('ideal_pct', 0.30), "ideal_pct must be a finite number")
+        return _pricing_payload(table, base_cost, ideal_pct, _tiers_param(payload.get('tiers')))
+
+    def menu_pricing(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        # 공유 테이블은 차트 렌더링 등 다른 사용자와 함께 쓰므로 요청마다 복사본으로 계산
+        table = self.state.real_menu_table.copy()
+        base_cost = _float_param(query, 'base_cost', 1000.0)
+        ideal_pct = _float_param(query, 'ideal_pct', 0.30)
+        tiers = _tiers_param(query.get('tiers', [None])[-1])
+        return _pricing_payload(table, base_cost, ideal_pct, tiers)
+
+    # ------------------------------------------------------------------ 설문 집계
+    def survey_summary(self) -> Dict[str, Any]:
+        analyzer = self.state.survey
+
+        def indicators(prefix: str) -> Dict[str, Dict[str, float]]:
+            return {name: {'count': int(values['count']), 'percentage': round(float(values['percentage']), 2)}
+                    for name, values in analyzer.indicator_summary(prefix).items()}
+
+        return {
+            'sample_size': analyzer.cube.total(),
+            'age_groups': {k: int(v) for k, v in analyzer.distribution('age_group').sort_index().items()},
+            'genders': {k: int(v) for k, v in analyzer.distribution('gender').items()},
+            'visit_frequency': {k: int(v) for k, v in analyzer.distribution('visit_frequency').items()},
+            'satisfaction': indicators('satisfaction_'),
+            'complaints': indicators('complaint_'),
+            'menu_preferences': indicators('menu_'),
+        }
+
+    def survey_segment(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """세그먼트(차원 필터 조합)의 응답자 수와 지표별 인원 - 사전 집계 큐브에서 바로 조회"""
+        cube = self.state.survey.cube
+        filters = {name: values[-1] for name, values in query.items()}
+        try:
+            counts = cube.segment(**filters)
+        except KeyError as e:
+            raise HTTPError(400, e.args[0])
+        return {'filters': filters, **counts}
+
+    # ------------------------------------------------------------------ 차트
+    def _render_chart(self, name: str) -> bytes:
+        outfile = os.path.join(self._chart_dir, name)
+        # 분석 결과 출력은 끈 채로 그림 (서버 로그에는 요청 로그만 남김)
+        CHARTS[name](self.state, outfile)
+        with open(output_path(outfile), 'rb') as f:
+            return f.read()
+
+    async def chart(self, name: str) -> bytes:
+        if name not in CHARTS:
+            raise HTTPError(404, f"unknown chart '{name}' (choose from {', '.join(CHARTS)})")
+        config = render_config()
+        key = (name, config.dpi, config.fmt)
+        data = self._chart_cache.get(key)
+        if data is None:
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(self._render_executor, self._render_chart, name)
+            self._chart_cache[key] = data
+        return data
+
+    # ------------------------------------------------------------------ HTTP
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write(writer, *self._error(400, "malformed request line"), keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+                try:
+                    length = int(headers.get('content-length') or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._write(writer, *self._error(400, "invalid Content-Length"), keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, *self._error(413, "request body too large"), keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                start = time.perf_counter()
+                try:
+                    status, content_type, payload = await self.dispatch(method.upper(), target, body)
+                except HTTPError as e:
+                    status, content_type, payload = self._error(e.status, str(e))
+                except Exception as e:
+                    status, content_type, payload = self._error(500, f"{type(e).__name__}: {e}")
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                print(f"{method} {target} -> {status} ({elapsed_ms:.1f}ms)")
+                await self._write(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _error(self, status: int, message: str) -> Tuple[int, str, bytes]:
+        return self._json({'error': message}, status)
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, content_type: str,
+                     payload: bytes, keep_alive: bool) -> None:
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                state: Optional[SharedState] = None) -> None:
+    """분석기를 로드하고 요청을 계속 처리"""
+    service = AnalysisService(state)
+    service.warm_up()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"📡 분석 서비스 실행 중: http://{host}:{port}  (종료: Ctrl+C)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv: Optional[List[str]] = None, state: Optional[SharedState] = None) -> None:
+    parser = argparse.ArgumentParser(description="분석 결과를 제공하는 로컬 HTTP/JSON 서비스")
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help=f'바인딩 주소 (기본 {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본 {DEFAULT_PORT})')
+    args = parser.parse_args(argv)
+    # 서버에서는 창을 띄우지 않고 이미지 바이트만 반환
+    configure(headless=True)
+    try:
+        asyncio.run(serve(args.host, args.port, state))
+    except KeyboardInterrupt:
+        print("\n분석 서비스를 종료합니다.")
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@
 Excel에서 추출한 실제 상품 데이터를 사용하여 가격 분석을 수행합니다.
 """
 
+from price_tiers import TierClassifier
+
 # 실제 상품별 원가율 데이터 (Excel에서 추출)
 real_products = {
     '시그니처양념치킨': (82.075, 0.536),
@@ -27,6 +29,7 @@ real_products = {
 def analyze_real_data():
     base_cost = 1000.0
     ideal_pct = 0.30
+    classifier = TierClassifier([3990, 7990, 9990])
     
     print('=' * 100)
     print('🍽️ 실제 상품 데이터 기반 메뉴 가격 분석')
@@ -43,6 +46,7 @@ def analyze_real_data():
     
     suggested_prices = []
     gross_margins = []
+    tiers = []
     
     for name, (daily_sales, cost_ratio) in real_products.items():
         actual_cost = base_cost * cost_ratio
@@ -50,19 +54,13 @@ def analyze_real_data():
         gross_margin = (suggested_price - actual_cost) / suggested_price
         
         # 가격 구간 분류
-        if suggested_price <= 3990:
-            tier = '≤3,990원'
-        elif suggested_price <= 7990:
-            tier = '≤7,990원'
-        elif suggested_price <= 9990:
-            tier = '≤9,990원'
-        else:
-            tier = '>9,990원'
+        tier = classifier.classify(suggested_price)
         
         print(f'{name:<25} {daily_sales:<12.1f} {cost_ratio:<10.3f} {actual_cost:<12,.0f} {suggested_price:<12,.0f} {gross_margin:<10.1%} {tier:<12}')
         
         suggested_prices.append(suggested_price)
         gross_margins.append(gross_margin)
+        tiers.append(tier)
     
     # 통계 요약
     print(f'\n📊 통계 요약:')
@@ -74,19 +72,7 @@ def analyze_real_data():
     # 가격 구간별 분포
     print(f'\n💰 가격 구간별 분포:')
     tier_counts = {}
-    for name, (daily_sales, cost_ratio) in real_products.items():
-        actual_cost = base_cost * cost_ratio
-        suggested_price = actual_cost / ideal_pct
-        
-        if suggested_price <= 3990:
-            tier = '≤3,990원'
-        elif suggested_price <= 7990:
-            tier = '≤7,990원'
-        elif suggested_price <= 9990:
-            tier = '≤9,990원'
-        else:
-            tier = '>9,990원'
-        
+    for tier in tiers:
         tier_counts[tier] = tier_counts.get(tier, 0) + 1
     
     for tier, count in sorted(tier_counts.items()):
@@ -0,0 +1,139 @@
+"""
+chart_rendering.py
+~~~~~~~~~~~~~~~~~~
+
+모든 차트 모듈이 공유하는 렌더링 설정
+
+* 한글 폰트(rcParams) 설정은 프로세스당 한 번만 수행합니다.
+* 헤드리스 모드에서는 비대화형 Agg 백엔드를 사용하고 ``plt.show()``를 호출하지 않으므로
+  배치 작업에서 창이 뜨거나 실행이 멈추지 않습니다.
+* 저장 해상도(DPI)와 형식(PNG/SVG/WebP)을 한 곳에서 설정합니다.
+  확장자 없이 넘긴 출력 경로에는 설정된 형식의 확장자를 붙이고, 확장자가 있으면 그 형식으로 저장합니다
+  (지원하지 않는 확장자이거나 명시적으로 설정한 형식과 다르면 ValueError).
+  DPI를 설정하지 않으면 차트마다 정한 기본값(대부분 300)을 씁니다.
+* matplotlib은 ``get_pyplot()``을 처음 호출할 때 불러오므로, 차트를 그리지 않는
+  텍스트 전용 실행은 matplotlib 로딩 비용을 치르지 않습니다.
+
+환경 변수로도 설정할 수 있습니다:
+    CHART_HEADLESS=1  CHART_DPI=150  CHART_FORMAT=webp
+"""
+
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+SUPPORTED_FORMATS = ('png', 'svg', 'webp')
+
+DEFAULT_DPI = 300
+DEFAULT_FORMAT = 'png'
+
+@dataclass
+class RenderConfig:
+    dpi: Optional[int] = None     # None이면 차트별 기본값 (save_figure의 dpi, 없으면 DEFAULT_DPI)
+    fmt: Optional[str] = None     # None이면 출력 경로의 확장자, 확장자도 없으면 DEFAULT_FORMAT
+    headless: bool = False
+
+def _config_from_env() -> RenderConfig:
+    config = RenderConfig()
+    if os.environ.get('CHART_DPI'):
+        config.dpi = int(os.environ['CHART_DPI'])
+    if os.environ.get('CHART_FORMAT'):
+        config.fmt = os.environ['CHART_FORMAT'].lower()
+    config.headless = os.environ.get('CHART_HEADLESS', '').lower() in ('1', 'true', 'yes')
+    return config
+
+_config = _config_from_env()
+_fonts_ready = False
+
+def render_config() -> RenderConfig:
+    """현재 렌더링 설정"""
+    return _config
+
+def configure(dpi: Optional[int] = None, fmt: Optional[str] = None,
+              headless: Optional[bool] = None) -> RenderConfig:
+    """렌더링 설정 변경 (None인 항목은 유지)"""
+    if fmt is not None:
+        fmt = fmt.lower()
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported chart format '{fmt}' (choose from {', '.join(SUPPORTED_FORMATS)})")
+        _config.fmt = fmt
+    if dpi is not None:
+        if dpi <= 0:
+            raise ValueError("dpi must be positive")
+        _config.dpi = dpi
+    if headless is not None:
+        _config.headless = headless
+        if headless:
+            import matplotlib
+            matplotlib.use('Agg', force=True)
+    return _config
+
+def get_pyplot():
+    """한글 폰트가 설정된 pyplot 모듈 (폰트 설정은 최초 1회만)"""
+    global _fonts_ready
+    import matplotlib
+    if _config.headless:
+        matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+    if not _fonts_ready:
+        # 한글 폰트 설정
+        plt.rcParams['font.family'] = 'Malgun Gothic'
+        plt.rcParams['axes.unicode_minus'] = False
+        _fonts_ready = True
+    return plt
+
+def optional_pyplot():
+    """pyplot 모듈, matplotlib을 불러올 수 없으면 None"""
+    try:
+        return get_pyplot()
+    except Exception:
+        return None
+
+def chart_format() -> str:
+    """확장자 없는 출력 경로에 쓰는 형식 (설정값, 없으면 DEFAULT_FORMAT)"""
+    return _config.fmt or DEFAULT_FORMAT
+
+def output_path(outfile: str) -> str:
+    """실제 저장 경로 (확장자가 없으면 설정된 형식의 확장자를 붙임)
+
+    확장자가 지원하지 않는 형식이거나, 형식을 명시적으로 설정했는데 확장자와 다르면
+    경로를 몰래 바꾸지 않고 ValueError를 냅니다.
+    """
+    ext = os.path.splitext(outfile)[1].lstrip('.').lower()
+    if not ext:
+        return f"{outfile}.{chart_format()}"
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported chart file extension '.{ext}' in {outfile!r} "
+                         f"(choose from {', '.join(SUPPORTED_FORMATS)})")
+    if _config.fmt is not None and ext != _config.fmt:
+        raise ValueError(f"Chart file {outfile!r} does not match the configured format '{_config.fmt}'")
+    return outfile
+
+def save_figure(fig, outfile: str, show: bool = True, bbox_inches: Optional[str] = 'tight',
+                dpi: Optional[int] = None) -> str:
+    """설정된 DPI/형식으로 그림을 저장하고 닫은 뒤 실제 저장 경로를 반환
+
+    dpi는 DPI가 설정되지 않았을 때 쓰는 차트별 기본값입니다 (없으면 DEFAULT_DPI).
+    헤드리스 모드가 아니고 show가 True이면 저장 후 창을 띄웁니다.
+    """
+    plt = get_pyplot()
+    path = output_path(outfile)
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    fig.savefig(path, dpi=_config.dpi or dpi or DEFAULT_DPI, format=fmt, bbox_inches=bbox_inches)
+    if show and not _config.headless:
+        plt.show()
+    plt.close(fig)
+    return path
+
+def add_render_arguments(parser: argparse.ArgumentParser) -> None:
+    """CLI에 --headless/--dpi/--format 옵션 추가"""
+    parser.add_argument('--headless', action='store_true',
+                        help='창을 띄우지 않고 Agg 백엔드로 파일만 저장')
+    parser.add_argument('--dpi', type=int, default=None, help='이미지 해상도 (기본: 차트별 기본값, 대부분 300)')
+    parser.add_argument('--format', dest='chart_format', choices=SUPPORTED_FORMATS, default=None,
+                        help='이미지 형식 (기본: 출력 파일 확장자, 없으면 png)')
+
+def apply_render_arguments(args: argparse.Namespace) -> RenderConfig:
+    """add_render_arguments로 받은 옵션을 설정에 반영"""
+    return configure(dpi=args.dpi, fmt=args.chart_format, headless=args.headless or None)
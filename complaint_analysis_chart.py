@@ -3,15 +3,13 @@
 몇 명 중에 몇 명이 해당 불만사항을 언급했는지 명확하게 표시
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from chart_rendering import get_pyplot, output_path, save_figure
 
 def create_complaint_analysis():
     """단점 분석 및 아쉬움 중심 차트 생성"""
+    # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+    plt = get_pyplot()
     
     # 전체 조사 대상: 19명
     total_customers = 19
@@ -173,8 +171,7 @@ def create_complaint_analysis():
     
     plt.tight_layout()
     plt.subplots_adjust(top=0.94, bottom=0.05, left=0.08, right=0.95, hspace=0.4, wspace=0.3)
-    plt.savefig('complaint_analysis_chart.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'complaint_analysis_chart')
     
     # 텍스트 분석 결과 출력
     print(f"\n📊 현장조사 단점 분석 요약 (총 {total_customers}명)")
@@ -208,7 +205,7 @@ def create_complaint_analysis():
     
     print("\n" + "=" * 60)
     print("✅ 단점 분석 및 아쉬움 중심 분석 완료!")
-    print("📊 시각화 파일: complaint_analysis_chart.png")
+    print(f"📊 시각화 파일: {output_path('complaint_analysis_chart')}")
     print("=" * 60)
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+"""
+complaint_categorizer.py
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+불만사항 자유 응답을 카테고리로 분류하는 미리 컴파일된 분류기
+
+카테고리 → 키워드 표(COMPLAINT_CATEGORIES)를 한 번만 ``KeywordAutomaton``으로 컴파일해 두고,
+불만 문장 하나를 한 번 훑어 해당하는 모든 카테고리의 비트마스크를 얻습니다
+(카테고리 i의 비트는 ``1 << i``, 순서는 표의 순서).
+묶음 API는 같은 문장을 한 번만 스캔하므로 POS 피드백처럼 반복 문장이 많은 대량 입력에 적합합니다.
+
+사용법:
+    categorizer = complaint_categorizer()
+    categorizer.categorize("튀김이 눅눅함, 동선이 너무 자주 바뀜")   # ['조리품질/일관성', '동선/배치']
+    masks = categorizer.masks(complaints)          # 문장별 비트마스크
+    matrix = categorizer.matrix(complaints)        # (문장 수, 카테고리 수) uint8
+    counts = categorizer.counts(complaints)        # {카테고리: 문장 수}
+
+    python complaint_categorizer.py --input pos_feedback.jsonl.gz --text-field comment
+"""
+
+import argparse
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from keyword_matcher import KeywordAutomaton
+from review_source import DEFAULT_TEXT_FIELD, ReviewSource
+
+# 불만사항 카테고리 (집밥/건강/원산지 중심)
+COMPLAINT_CATEGORIES: Dict[str, List[str]] = {
+    '메뉴위치/가독성': ['메뉴가 어디에', '한눈에 보기 어려', '어디에 무엇이', '메뉴 이름 택이', '찾기 어려', '표시 미흡', '출입구'],
+    '조리품질/일관성': ['눅눅', '조각', '부실', '밀가루가 씹힌다', '기대에 못 미침'],
+    '동선/배치': ['동선이 좁', '바뀜', '넣다보니 좁아진'],
+    '가격': ['가격이 놀라', '그 가격에 그 맛'],
+    '제품부족': ['없어짐', '제품'],
+    '차별화': ['차별점'],
+    '집밥/건강니즈': ['건강한 집밥', '국물', '한식', '비빔밥', '김치찌개'],
+    '원산지/신뢰성': ['원산지', '신뢰', '품질'],
+}
+
+# 불만이 없는 것으로 보는 응답
+NO_COMPLAINT = ('없음', '')
+
+class ComplaintCategorizer:
+    """카테고리 → 키워드 표를 한 번 컴파일해 재사용하는 불만사항 분류기"""
+
+    def __init__(self, categories: Mapping[str, Iterable[str]] = COMPLAINT_CATEGORIES):
+        self.categories: Dict[str, List[str]] = {category: list(keywords)
+                                                 for category, keywords in categories.items()}
+        self.automaton = KeywordAutomaton(self.categories)
+
+    @property
+    def names(self) -> List[str]:
+        return self.automaton.categories
+
+    def mask(self, complaint: Any) -> int:
+        """불만 문장 하나의 카테고리 비트마스크 (문자열이 아니면 0)"""
+        return self.automaton.scan(complaint) if isinstance(complaint, str) else 0
+
+    def categorize(self, complaint: Any) -> List[str]:
+        """불만 문장 하나에 해당하는 카테고리 목록 (표의 순서)"""
+        return self.automaton.categories_of(self.mask(complaint))
+
+    def masks(self, complaints: Iterable[Any]) -> List[int]:
+        """문장별 카테고리 비트마스크 (같은 문장은 한 번만 스캔)"""
+        seen: Dict[str, int] = {}
+        result = []
+        for complaint in complaints:
+            if not isinstance(complaint, str):
+                result.append(0)
+                continue
+            mask = seen.get(complaint)
+            if mask is None:
+                mask = seen[complaint] = self.automaton.scan(complaint)
+            result.append(mask)
+        return result
+
+    def categorize_many(self, complaints: Iterable[Any]) -> List[List[str]]:
+        """문장별 카테고리 목록"""
+        categories_of = lru_cache(maxsize=None)(self.automaton.categories_of)
+        return [categories_of(mask) for mask in self.masks(complaints)]
+
+    def matrix(self, complaints: Iterable[Any]):
+        """(문장 수, 카테고리 수) uint8 지표 행렬 (numpy 필요)"""
+        import numpy as np
+        masks = np.fromiter(self.masks(complaints), dtype=np.int64)
+        bits = np.arange(len(self.names), dtype=np.int64)
+        return ((masks[:, None] >> bits) & 1).astype(np.uint8)
+
+    def counts(self, complaints: Iterable[Any]) -> Dict[str, int]:
+        """카테고리별 해당 문장 수 (문장 스트림을 한 번 순회)"""
+        return self.automaton.mask_counts(Counter(self.masks(complaints)))
+
+@lru_cache(maxsize=None)
+def complaint_categorizer() -> ComplaintCategorizer:
+    """COMPLAINT_CATEGORIES로 컴파일된 공용 분류기 (처음 호출할 때 한 번만 생성)"""
+    return ComplaintCategorizer(COMPLAINT_CATEGORIES)
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description="불만사항 자유 응답 카테고리 분류")
+    parser.add_argument('--input', required=True,
+                        help='불만 문장 파일 (.jsonl/.json/.csv/.txt, .gz 가능)')
+    parser.add_argument('--text-field', default=DEFAULT_TEXT_FIELD,
+                        help=f'JSONL/CSV에서 불만 문장이 들어 있는 필드 (기본: {DEFAULT_TEXT_FIELD})')
+    args = parser.parse_args(argv)
+
+    categorizer = complaint_categorizer()
+    source = ReviewSource(args.input, text_field=args.text_field)
+    total = 0
+    mask_counter: Counter = Counter()
+    for complaint in source:
+        total += 1
+        if complaint.strip() not in NO_COMPLAINT:
+            mask_counter[categorizer.mask(complaint)] += 1
+    counts = categorizer.automaton.mask_counts(mask_counter)
+
+    print(f"📋 불만사항 카테고리 분류: {source.path} ({total:,}건, 불만 {sum(mask_counter.values()):,}건)")
+    for category, count in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+        percentage = count / total * 100 if total else 0.0
+        print(f"  • {category:<12} {count:>8,}건 ({percentage:.1f}%)")
+    return counts
+
+if __name__ == '__main__':
+    main()
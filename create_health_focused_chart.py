@@ -3,15 +3,13 @@
 실제 현장조사 데이터를 기반으로 집밥 건강 니즈를 강조한 차트 생성
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from chart_rendering import get_pyplot, output_path, save_figure
 
 def create_health_focused_analysis():
     """집밥 건강 니즈 중심 현장조사 분석 차트 생성"""
+    # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+    plt = get_pyplot()
     
     # 실제 현장조사 데이터 (12명)
     total_customers = 12
@@ -132,8 +130,7 @@ def create_health_focused_analysis():
     
     plt.tight_layout()
     plt.subplots_adjust(top=0.92, bottom=0.08, left=0.08, right=0.95, hspace=0.3, wspace=0.3)
-    plt.savefig('customer_survey_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    save_figure(fig, 'customer_survey_analysis')
     
     # 분석 결과 출력
     print("=" * 80)
@@ -164,7 +161,7 @@ def create_health_focused_analysis():
     
     print("\n" + "=" * 80)
     print("✅ 집밥 건강 니즈 중심 분석 완료!")
-    print("📊 시각화 파일: customer_survey_analysis.png")
+    print(f"📊 시각화 파일: {output_path('customer_survey_analysis')}")
     print("🏠 집밥 건강 니즈가 가장 중요한 고객 니즈로 확인됨!")
     print("=" * 80)
 
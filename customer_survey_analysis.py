@@ -1,25 +1,68 @@
 """
 현장조사 고객별 정리 통계 분석
 MECE(Mutually Exclusive, Collectively Exhaustive) 프레임워크 기반 통계학적 분석
+
+pandas와 matplotlib은 전처리 테이블과 차트가 처음 필요할 때 불러오므로
+통계 요약 같은 텍스트 전용 실행은 빠르게 시작합니다.
+
+사용법:
+    python customer_survey_analysis.py [--summary-only]
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import math
+import re
 from collections import Counter
+from statistics import NormalDist
 import warnings
+
+from chart_rendering import get_pyplot, output_path, save_figure
+
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+# MECE 3~5 지표 키워드
+SATISFACTION_KEYWORDS = ['가격', '메뉴 다양', '신선함', '매장이 가깝', '간단히']
+COMPLAINT_KEYWORDS = ['눅눅', '조각', '찾기 어려', '표시 미흡', '동선', '차별점', '가격이 놀라']
+MENU_CATEGORIES = ['초밥', '샐러드', '튀김', '한식', '일식', '양식']
+
+# (지표 컬럼 접두사, 응답 필드, 키워드) - 지표 컬럼은 f'{접두사}{키워드}'
+INDICATOR_FAMILIES = [
+    ('satisfaction_', 'satisfaction', SATISFACTION_KEYWORDS),
+    ('complaint_', 'complaints', COMPLAINT_KEYWORDS),
+    ('menu_', 'preferred_menu', MENU_CATEGORIES),
+]
+
+def _age_decade(age_group):
+    """'40대' → 40"""
+    return int(re.search(r'(\d+)대', age_group).group(1))
+
+def _gender_label(gender):
+    """성별 응답 정규화 ('여성'/'남성'이 포함되지 않으면 '부부')"""
+    return '여성' if '여성' in gender else '남성' if '남성' in gender else '부부'
 
 class CustomerSurveyAnalyzer:
     def __init__(self):
         """MECE 프레임워크 기반 분석 클래스 초기화"""
         self.raw_data = self._load_raw_data()
-        self.processed_data = self._process_data()
+        self._processed_data = None
+        self._cube = None
+        self.indicators = None  # 전처리 시 채워지는 응답 × 지표 uint8 행렬 (IndicatorMatrix)
+    
+    @property
+    def processed_data(self):
+        """전처리된 DataFrame (처음 사용할 때 pandas를 불러와 생성)"""
+        if self._processed_data is None:
+            self._processed_data = self._process_data()
+        return self._processed_data
+    
+    @property
+    def cube(self):
+        """연령대 × 성별 × 방문 빈도 × 매장 × 조사 차수 × 지표 사전 집계 (SurveyCube, 처음 사용할 때 생성)"""
+        if self._cube is None:
+            from survey_cube import SurveyCube
+            data = self.processed_data
+            self._cube = SurveyCube.from_frame(data, self.indicators, columns={'gender': 'gender_clean'})
+        return self._cube
         
     def _load_raw_data(self):
         """원시 데이터 로드"""
@@ -81,33 +124,66 @@ class CustomerSurveyAnalyzer:
     
     def _process_data(self):
         """데이터 전처리 및 MECE 구조화"""
+        import numpy as np
+        import pandas as pd
+        from survey_features import IndicatorFamily, extract_indicators, map_unique
+        
         df = pd.DataFrame(self.raw_data)
         
-        # MECE 1: 고객 특성 (Demographics)
-        df['age_group_clean'] = df['age_group'].str.extract(r'(\d+)대').astype(int)
-        df['gender_clean'] = df['gender'].apply(lambda x: '여성' if '여성' in x else '남성' if '남성' in x else '부부')
+        # MECE 1: 고객 특성 (Demographics) - 서로 다른 응답값마다 한 번씩만 변환
+        df['age_group_clean'] = map_unique(df['age_group'], _age_decade).astype(int)
+        df['gender_clean'] = map_unique(df['gender'], _gender_label)
         
         # MECE 2: 행동 패턴 (Behavioral)
         df['visit_frequency_clean'] = df['visit_frequency'].map({
             '주2회': 2, '주1회': 1, '2주/1': 0.5, '자주 아님': 0.25, '미기재': np.nan
         })
         
-        # MECE 3: 만족 요인 (Satisfaction Factors)
-        satisfaction_keywords = ['가격', '메뉴 다양', '신선함', '매장이 가깝', '간단히']
-        for keyword in satisfaction_keywords:
-            df[f'satisfaction_{keyword}'] = df['satisfaction'].str.contains(keyword, na=False)
-        
-        # MECE 4: 불만 요인 (Dissatisfaction Factors)
-        complaint_keywords = ['눅눅', '조각', '찾기 어려', '표시 미흡', '동선', '차별점', '가격이 놀라']
-        for keyword in complaint_keywords:
-            df[f'complaint_{keyword}'] = df['complaints'].str.contains(keyword, na=False)
+        # MECE 3~5: 만족 요인 / 불만 요인 / 메뉴 선호도
+        # 지표 그룹별로 서로 다른 응답 문자열을 한 번씩만 훑어 응답 × 지표 행렬을 만듦
+        families = [IndicatorFamily(prefix, field, keywords) for prefix, field, keywords in INDICATOR_FAMILIES]
+        self.indicators = extract_indicators(df, families)
         
-        # MECE 5: 메뉴 선호도 (Menu Preferences)
-        menu_categories = ['초밥', '샐러드', '튀김', '한식', '일식', '양식']
-        for menu in menu_categories:
-            df[f'menu_{menu}'] = df['preferred_menu'].str.contains(menu, na=False)
-        
-        return df
+        return pd.concat([df, self.indicators.to_frame(df.index)], axis=1)
+    
+    def indicator_summary(self, prefix, **filters):
+        """prefix로 시작하는 지표별 {지표명: {'count': 해당 인원, 'percentage': 비율(%)}}
+
+        filters로 세그먼트를 지정할 수 있습니다 (예: age_group='50대', gender='여성').
+        """
+        cube = self.cube
+        segment = cube.segment(**filters)
+        total = segment['total']
+        summary = {}
+        for col in cube.indicators:
+            if col.startswith(prefix):
+                count = segment[col]
+                percentage = (count / total) * 100 if total else 0.0
+                summary[col.replace(prefix, '')] = {'count': count, 'percentage': percentage}
+        return summary
+    
+    def distribution(self, dimension, **filters):
+        """차원별 응답자 수 pandas Series (value_counts와 같은 많은 순, 큐브에서 조회)"""
+        import pandas as pd
+        counts = pd.Series(self.cube.rollup(dimension, **filters), name='count')
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        counts.index.name = dimension
+        return counts
+    
+    def crosstab(self, dimension='age_group', prefixes=('satisfaction_', 'complaint_', 'menu_'),
+                 interval=None, confidence=0.95):
+        """인구통계 차원별 지표 교차표 (dimension, group, family, factor, count, total, percentage)
+
+        dimension은 'age_group', 'gender_clean', 'visit_frequency' 등 전처리 테이블의 컬럼입니다.
+        interval에 구간 방법을 주면 모든 세그먼트의 신뢰구간을 한 번에 계산해 lower/upper 컬럼을 붙입니다.
+        """
+        from survey_features import indicator_crosstab
+        cross = indicator_crosstab(self.processed_data, dimension, prefixes)
+        if interval is not None:
+            from proportion_intervals import proportion_intervals
+            cross['lower'], cross['upper'] = proportion_intervals(
+                cross['count'].to_numpy(), cross['total'].to_numpy(), method=interval, confidence=confidence)
+        return cross
     
     def analyze_demographics(self):
         """MECE 1: 고객 특성 분석"""
@@ -116,16 +192,16 @@ class CustomerSurveyAnalyzer:
         print("=" * 60)
         
         # 연령대별 분포
-        age_dist = self.processed_data['age_group'].value_counts().sort_index()
-        age_pct = self.processed_data['age_group'].value_counts(normalize=True).sort_index() * 100
+        age_dist = self.distribution('age_group').sort_index()
+        age_pct = age_dist / age_dist.sum() * 100
         
         print("\n📊 연령대별 분포:")
         for age, count in age_dist.items():
             print(f"  {age}: {count}명 ({age_pct[age]:.1f}%)")
         
         # 성별 분포
-        gender_dist = self.processed_data['gender_clean'].value_counts()
-        gender_pct = self.processed_data['gender_clean'].value_counts(normalize=True) * 100
+        gender_dist = self.distribution('gender')
+        gender_pct = gender_dist / gender_dist.sum() * 100
         
         print("\n👥 성별 분포:")
         for gender, count in gender_dist.items():
@@ -140,8 +216,8 @@ class CustomerSurveyAnalyzer:
         print("=" * 60)
         
         # 방문 빈도 분석
-        visit_freq = self.processed_data['visit_frequency'].value_counts()
-        visit_pct = self.processed_data['visit_frequency'].value_counts(normalize=True) * 100
+        visit_freq = self.distribution('visit_frequency')
+        visit_pct = visit_freq / visit_freq.sum() * 100
         
         print("\n🔄 방문 빈도 분포:")
         for freq, count in visit_freq.items():
@@ -166,14 +242,7 @@ class CustomerSurveyAnalyzer:
         print("MECE 3: 만족 요인 분석 (Satisfaction Factors)")
         print("=" * 60)
         
-        satisfaction_cols = [col for col in self.processed_data.columns if col.startswith('satisfaction_')]
-        satisfaction_summary = {}
-        
-        for col in satisfaction_cols:
-            factor_name = col.replace('satisfaction_', '')
-            count = self.processed_data[col].sum()
-            percentage = (count / len(self.processed_data)) * 100
-            satisfaction_summary[factor_name] = {'count': count, 'percentage': percentage}
+        satisfaction_summary = self.indicator_summary('satisfaction_')
         
         print("\n✅ 만족 요인 순위:")
         sorted_satisfaction = sorted(satisfaction_summary.items(), key=lambda x: x[1]['count'], reverse=True)
@@ -188,14 +257,7 @@ class CustomerSurveyAnalyzer:
         print("MECE 4: 불만 요인 분석 (Dissatisfaction Factors)")
         print("=" * 60)
         
-        complaint_cols = [col for col in self.processed_data.columns if col.startswith('complaint_')]
-        complaint_summary = {}
-        
-        for col in complaint_cols:
-            factor_name = col.replace('complaint_', '')
-            count = self.processed_data[col].sum()
-            percentage = (count / len(self.processed_data)) * 100
-            complaint_summary[factor_name] = {'count': count, 'percentage': percentage}
+        complaint_summary = self.indicator_summary('complaint_')
         
         print("\n❌ 불만 요인 순위:")
         sorted_complaints = sorted(complaint_summary.items(), key=lambda x: x[1]['count'], reverse=True)
@@ -210,14 +272,7 @@ class CustomerSurveyAnalyzer:
         print("MECE 5: 메뉴 선호도 분석 (Menu Preferences)")
         print("=" * 60)
         
-        menu_cols = [col for col in self.processed_data.columns if col.startswith('menu_')]
-        menu_summary = {}
-        
-        for col in menu_cols:
-            menu_name = col.replace('menu_', '')
-            count = self.processed_data[col].sum()
-            percentage = (count / len(self.processed_data)) * 100
-            menu_summary[menu_name] = {'count': count, 'percentage': percentage}
+        menu_summary = self.indicator_summary('menu_')
         
         print("\n🍽️ 메뉴 선호도 순위:")
         sorted_menu = sorted(menu_summary.items(), key=lambda x: x[1]['count'], reverse=True)
@@ -232,78 +287,97 @@ class CustomerSurveyAnalyzer:
         print("교차 분석: 연령대별 만족 요인")
         print("=" * 60)
         
-        satisfaction_cols = [col for col in self.processed_data.columns if col.startswith('satisfaction_')]
+        cross = self.crosstab('age_group', ['satisfaction_'])
         
-        for col in satisfaction_cols:
-            factor_name = col.replace('satisfaction_', '')
+        for factor_name, rows in cross.groupby('factor', sort=False):
             print(f"\n📈 {factor_name} 만족도 (연령대별):")
-            
-            cross_table = pd.crosstab(self.processed_data['age_group'], self.processed_data[col])
-            cross_pct = pd.crosstab(self.processed_data['age_group'], self.processed_data[col], normalize='index') * 100
-            
-            for age_group in cross_table.index:
-                satisfied_count = cross_table.loc[age_group, True] if True in cross_table.columns else 0
-                total_count = cross_table.loc[age_group].sum()
-                percentage = (satisfied_count / total_count * 100) if total_count > 0 else 0
+            for age_group, satisfied_count, total_count, percentage in zip(
+                    rows['group'], rows['count'], rows['total'], rows['percentage']):
                 print(f"  {age_group}: {satisfied_count}/{total_count}명 ({percentage:.1f}%)")
+        
+        return cross
     
-    def statistical_summary(self):
-        """통계학적 요약"""
+    def _indicator_counts(self, field, keywords):
+        """원시 데이터에서 키워드별 포함 인원 계산 (pandas 없이, 값이 없으면 미포함)"""
+        counts = []
+        for keyword in keywords:
+            count = sum(1 for record in self.raw_data
+                        if isinstance(record.get(field), str) and keyword in record[field])
+            counts.append((keyword, count))
+        return counts
+    
+    def statistical_summary(self, method='wald', confidence=0.95, n_boot=2000, seed=None):
+        """통계학적 요약 (전처리 테이블 없이 원시 데이터에서 바로 계산)
+
+        method: 'wald'(기본), 'wilson', 'clopper-pearson', 'bootstrap'.
+        wald 외의 구간은 proportion_intervals 엔진으로 모든 지표를 한 번에 계산합니다.
+        반환값: {필드: [(지표명, 비율, 하한, 상한), ...]} (해당 인원이 있는 지표만)
+        """
         print("\n" + "=" * 60)
         print("통계학적 요약")
         print("=" * 60)
         
         # 표본 크기
-        n = len(self.processed_data)
+        n = len(self.raw_data)
         print(f"\n📊 표본 크기: {n}명")
         
-        # 신뢰구간 계산 (95% 신뢰도)
-        confidence_level = 0.95
-        z_score = 1.96  # 95% 신뢰도
-        
-        # 주요 만족 요인 신뢰구간
-        satisfaction_cols = [col for col in self.processed_data.columns if col.startswith('satisfaction_')]
-        
-        print(f"\n📈 주요 만족 요인 신뢰구간 (95% 신뢰도):")
-        for col in satisfaction_cols:
-            factor_name = col.replace('satisfaction_', '')
-            p = self.processed_data[col].mean()
-            if p > 0:
-                margin_error = z_score * np.sqrt((p * (1 - p)) / n)
-                lower_bound = p - margin_error
-                upper_bound = p + margin_error
-                print(f"  {factor_name}: {p:.3f} ± {margin_error:.3f} [{lower_bound:.3f}, {upper_bound:.3f}]")
-        
-        # 주요 불만 요인 신뢰구간
-        complaint_cols = [col for col in self.processed_data.columns if col.startswith('complaint_')]
-        
-        print(f"\n📉 주요 불만 요인 신뢰구간 (95% 신뢰도):")
-        for col in complaint_cols:
-            factor_name = col.replace('complaint_', '')
-            p = self.processed_data[col].mean()
-            if p > 0:
-                margin_error = z_score * np.sqrt((p * (1 - p)) / n)
-                lower_bound = p - margin_error
-                upper_bound = p + margin_error
-                print(f"  {factor_name}: {p:.3f} ± {margin_error:.3f} [{lower_bound:.3f}, {upper_bound:.3f}]")
+        families = [('satisfaction', '📈 주요 만족 요인', SATISFACTION_KEYWORDS),
+                    ('complaints', '📉 주요 불만 요인', COMPLAINT_KEYWORDS)]
+        counts = {field: self._indicator_counts(field, keywords) for field, _, keywords in families}
+        
+        if method == 'wald':
+            z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+            bounds = {}
+            for field, factor_counts in counts.items():
+                for factor_name, count in factor_counts:
+                    p = count / n
+                    margin_error = z_score * math.sqrt((p * (1 - p)) / n)
+                    bounds[field, factor_name] = (p - margin_error, p + margin_error)
+        else:
+            # 모든 지표의 구간을 한 번의 벡터 연산으로 계산
+            from proportion_intervals import proportion_intervals
+            keys = [(field, factor_name) for field, factor_counts in counts.items() for factor_name, _ in factor_counts]
+            lower, upper = proportion_intervals(
+                [count for factor_counts in counts.values() for _, count in factor_counts], n,
+                method=method, confidence=confidence, n_boot=n_boot, seed=seed)
+            bounds = dict(zip(keys, zip(lower.tolist(), upper.tolist())))
+        
+        label = f"{confidence * 100:g}% 신뢰도" + ("" if method == 'wald' else f", {method}")
+        summary = {}
+        for field, title, _ in families:
+            print(f"\n{title} 신뢰구간 ({label}):")
+            summary[field] = []
+            for factor_name, count in counts[field]:
+                if count == 0:
+                    continue
+                p = count / n
+                lower_bound, upper_bound = bounds[field, factor_name]
+                if method == 'wald':
+                    print(f"  {factor_name}: {p:.3f} ± {p - lower_bound:.3f} [{lower_bound:.3f}, {upper_bound:.3f}]")
+                else:
+                    print(f"  {factor_name}: {p:.3f} [{lower_bound:.3f}, {upper_bound:.3f}]")
+                summary[field].append((factor_name, p, lower_bound, upper_bound))
+        return summary
     
-    def create_visualizations(self):
-        """시각화 생성"""
+    def create_visualizations(self, outfile='customer_survey_analysis'):
+        """시각화 생성 (저장된 파일 경로 반환)"""
+        # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+        plt = get_pyplot()
         fig, axes = plt.subplots(2, 3, figsize=(18, 12))
         fig.suptitle('현장조사 고객별 통계 분석 (MECE 프레임워크)', fontsize=16, fontweight='bold')
         
         # 1. 연령대별 분포
-        age_dist = self.processed_data['age_group'].value_counts().sort_index()
+        age_dist = self.distribution('age_group').sort_index()
         axes[0, 0].pie(age_dist.values, labels=age_dist.index, autopct='%1.1f%%', startangle=90)
         axes[0, 0].set_title('연령대별 분포')
         
         # 2. 성별 분포
-        gender_dist = self.processed_data['gender_clean'].value_counts()
+        gender_dist = self.distribution('gender')
         axes[0, 1].pie(gender_dist.values, labels=gender_dist.index, autopct='%1.1f%%', startangle=90)
         axes[0, 1].set_title('성별 분포')
         
         # 3. 방문 빈도
-        visit_freq = self.processed_data['visit_frequency'].value_counts()
+        visit_freq = self.distribution('visit_frequency')
         axes[0, 2].bar(range(len(visit_freq)), visit_freq.values)
         axes[0, 2].set_xticks(range(len(visit_freq)))
         axes[0, 2].set_xticklabels(visit_freq.index, rotation=45)
@@ -311,8 +385,8 @@ class CustomerSurveyAnalyzer:
         axes[0, 2].set_ylabel('고객 수')
         
         # 4. 만족 요인
-        satisfaction_cols = [col for col in self.processed_data.columns if col.startswith('satisfaction_')]
-        satisfaction_counts = [self.processed_data[col].sum() for col in satisfaction_cols]
+        satisfaction_cols = [col for col in self.cube.indicators if col.startswith('satisfaction_')]
+        satisfaction_counts = [self.cube.count(col) for col in satisfaction_cols]
         satisfaction_labels = [col.replace('satisfaction_', '') for col in satisfaction_cols]
         
         axes[1, 0].barh(satisfaction_labels, satisfaction_counts)
@@ -320,8 +394,8 @@ class CustomerSurveyAnalyzer:
         axes[1, 0].set_xlabel('고객 수')
         
         # 5. 불만 요인
-        complaint_cols = [col for col in self.processed_data.columns if col.startswith('complaint_')]
-        complaint_counts = [self.processed_data[col].sum() for col in complaint_cols]
+        complaint_cols = [col for col in self.cube.indicators if col.startswith('complaint_')]
+        complaint_counts = [self.cube.count(col) for col in complaint_cols]
         complaint_labels = [col.replace('complaint_', '') for col in complaint_cols]
         
         axes[1, 1].barh(complaint_labels, complaint_counts)
@@ -329,8 +403,8 @@ class CustomerSurveyAnalyzer:
         axes[1, 1].set_xlabel('고객 수')
         
         # 6. 메뉴 선호도
-        menu_cols = [col for col in self.processed_data.columns if col.startswith('menu_')]
-        menu_counts = [self.processed_data[col].sum() for col in menu_cols]
+        menu_cols = [col for col in self.cube.indicators if col.startswith('menu_')]
+        menu_counts = [self.cube.count(col) for col in menu_cols]
         menu_labels = [col.replace('menu_', '') for col in menu_cols]
         
         axes[1, 2].barh(menu_labels, menu_counts)
@@ -338,11 +412,10 @@ class CustomerSurveyAnalyzer:
         axes[1, 2].set_xlabel('고객 수')
         
         plt.tight_layout()
-        plt.savefig('customer_survey_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        return save_figure(fig, outfile)
     
-    def run_complete_analysis(self):
-        """완전한 MECE 분석 실행"""
+    def run_complete_analysis(self, method='wald', confidence=0.95):
+        """완전한 MECE 분석 실행 (method/confidence는 통계학적 요약의 신뢰구간 설정)"""
         print("🔍 현장조사 고객별 통계 분석 (MECE 프레임워크)")
         print("=" * 80)
         
@@ -357,7 +430,7 @@ class CustomerSurveyAnalyzer:
         self.cross_analysis_age_satisfaction()
         
         # 통계학적 요약
-        self.statistical_summary()
+        self.statistical_summary(method=method, confidence=confidence)
         
         # 시각화
         self.create_visualizations()
@@ -370,12 +443,39 @@ class CustomerSurveyAnalyzer:
             'menu_preferences': menu_prefs
         }
 
-# 분석 실행
-if __name__ == "__main__":
-    analyzer = CustomerSurveyAnalyzer()
-    results = analyzer.run_complete_analysis()
+def main(argv=None, analyzer=None):
+    """메인 실행 함수 (analyzer를 주면 이미 로드된 분석기를 재사용)"""
+    # 방법 목록은 구간 엔진과 같은 것을 씀 (numpy를 함께 불러오지만 pandas/matplotlib은 아님)
+    from proportion_intervals import METHODS
+
+    parser = argparse.ArgumentParser(description="현장조사 고객별 통계 분석 (MECE 프레임워크)")
+    parser.add_argument('--summary-only', action='store_true',
+                        help='통계학적 요약만 출력 (pandas/matplotlib을 불러오지 않음)')
+    parser.add_argument('--interval', default='wald', choices=METHODS,
+                        help=f"신뢰구간 방법: {', '.join(METHODS)} (기본: wald)")
+    parser.add_argument('--confidence', type=float, default=0.95, help='신뢰수준 (기본: 0.95)')
+    args = parser.parse_args(argv)
+    if not 0 < args.confidence < 1:
+        parser.error(f"--confidence must be between 0 and 1, got {args.confidence}")
+    
+    analyzer = analyzer or CustomerSurveyAnalyzer()
+    if args.summary_only:
+        try:
+            analyzer.statistical_summary(method=args.interval, confidence=args.confidence)
+        except ValueError as e:
+            parser.error(str(e))
+        return
+    
+    try:
+        results = analyzer.run_complete_analysis(method=args.interval, confidence=args.confidence)
+    except ValueError as e:
+        parser.error(str(e))
     
     print("\n" + "=" * 80)
     print("✅ MECE 프레임워크 기반 통계 분석 완료!")
-    print("📊 시각화 파일: customer_survey_analysis.png")
+    print(f"📊 시각화 파일: {output_path('customer_survey_analysis')}")
     print("=" * 80)
+
+# 분석 실행
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,125 @@
 """
 델리바이 애슐리 메뉴 개발 분석
 40-50대 주 고객층 중심 불만사항 분석 및 메뉴 개발 인사이트 도출
+
+응답은 필드별 사전 인코딩 컬럼(SurveyTable)으로 보관하고, 연령/성별/방문 빈도/만족/불만/메뉴 분포는
+SurveyStats가 한 번에 모두 모으며, 시각화와 인사이트 도출, 집밥 건강 니즈 분석은 그 결과를 함께 씁니다.
+numpy는 분석기를 처음 만들 때 불러옵니다.
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
 from collections import Counter
 import warnings
+
+from chart_rendering import get_pyplot, output_path, save_figure
+from complaint_categorizer import NO_COMPLAINT, complaint_categorizer
+
 warnings.filterwarnings('ignore')
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+# 메뉴 개발 주 타겟 연령대
+TARGET_AGE_GROUPS = ('40대', '50대')
+
+# 응답마다 값이 거의 다른 ID/자유 응답 필드 (사전 인코딩 대신 값 그대로 보관)
+FREE_TEXT_FIELDS = ('id', 'complaints', 'notes', 'satisfaction')
+
+# (집계 이름, 만족 응답에서 찾을 키워드)
+SATISFACTION_FACTORS = [('가격', '가격'), ('메뉴 다양', '메뉴'), ('신선함', '신선'),
+                        ('간편성', '간단'), ('매장 접근성', '가깝')]
+
+# (집계 이름, 불만 응답에서 찾을 키워드 - 하나라도 있으면 해당)
+COMPLAINT_FACTORS = [('음식 눅눅함', ('눅눅',)), ('메뉴 위치/가독성', ('찾기 어려', '표시 미흡')),
+                     ('동선 문제', ('동선',)), ('차별점 부족', ('차별점',)), ('가격 문제', ('가격이 놀라',))]
+
+# 선호 메뉴 항목별로 찾는 메뉴
+MENU_KEYWORDS = ['샐러드', '초밥', '튀김', '비빔밥']
+
+# (집밥 건강 니즈 이름, 건강 니즈 응답에서 찾을 키워드)
+HEALTH_NEEDS = [('건강한 집밥 선호', '건강한'), ('신선한 샐러드 선호', '신선한'), ('국물 메뉴 선호', '국물')]
+
+def _menu_items(menu):
+    """'새우튀김, 샐러드' → ['새우튀김', '샐러드'] (값이 없거나 '없음'이면 빈 목록)"""
+    if not menu or menu == '없음':
+        return []
+    return [m.strip() for m in menu.split(',')]
+
+def _satisfaction_factors(satisfaction):
+    if not satisfaction or satisfaction == '없음':
+        return []
+    return [name for name, keyword in SATISFACTION_FACTORS if keyword in satisfaction]
+
+def _complaint_factors(complaints):
+    if not complaints or complaints == '없음':
+        return []
+    return [name for name, keywords in COMPLAINT_FACTORS if any(keyword in complaints for keyword in keywords)]
+
+def _menu_mentions(menu):
+    return [keyword for item in _menu_items(menu) for keyword in MENU_KEYWORDS if keyword in item]
+
+def _health_needs(health_needs):
+    if not health_needs or health_needs == '없음':
+        return []
+    return [name for name, keyword in HEALTH_NEEDS if keyword in health_needs]
+
+class SurveyStats:
+    """컬럼형 응답 테이블에서 한 번에 모은 전체/타겟 분포와 니즈 집계
+
+    문자열 판정은 컬럼의 서로 다른 값마다 한 번씩만 하고 응답 수는 bincount로 셉니다.
+    카운터의 순서는 응답을 차례로 훑을 때 처음 등장한 순서이며 차트의 항목 순서로 그대로 쓰입니다.
+    """
+
+    def __init__(self, table):
+        self.total = len(table)
+        self.age = Counter(table['age_group'].counts())
+        self.gender = Counter(table['gender'].counts())
+        self.visit_frequency = Counter(
+            table['visit_frequency'].recode(lambda freq: '미기재' if freq is None else freq).counts())
+        self.satisfaction = table['satisfaction'].tally(_satisfaction_factors)
+        self.complaints = table['complaints'].tally(_complaint_factors)
+        self.menus = table['preferred_menu'].tally(_menu_mentions)
+        self.health_needs = table['health_needs'].tally(_health_needs)
+
+        family = (table['visit_reason'].where(lambda reason: '가족' in (reason or ''))
+                  | table['notes'].where(lambda notes: '가족' in (notes or '')))
+        self.family_meal = int(family.sum())
+        self.korean_menu_mask = table['korean_menu_demand'].where(lambda demand: demand and '한식' in demand)
+        self.korean_menu_count = int(self.korean_menu_mask.sum())
+
+        self.target_mask = table['age_group'].isin(TARGET_AGE_GROUPS)
+        target = table.filter(self.target_mask)
+        self.target_count = len(target)
+        self.target_age = Counter(target['age_group'].counts())
+        self.target_gender = Counter(target['gender'].counts())
+        self.target_menus = target['preferred_menu'].tally(_menu_items)
 
 class DeliveryAshleyMenuAnalyzer:
     def __init__(self):
         """델리바이 애슐리 메뉴 개발 분석 클래스 초기화"""
-        self.raw_data = self._load_raw_data()
-        self.target_customers = self._extract_target_customers()
+        from survey_table import SurveyTable
+        self.table = SurveyTable.from_records(self._load_raw_data(), plain_fields=FREE_TEXT_FIELDS)
+        self._stats = None
+        self._raw_data = None
+        self._target_customers = None
+    
+    @property
+    def raw_data(self):
+        """응답 dict 목록 (컬럼형 테이블에서 처음 사용할 때 한 번 복원)"""
+        if self._raw_data is None:
+            self._raw_data = self.table.records()
+        return self._raw_data
+    
+    @property
+    def target_customers(self):
+        """40-50대 타겟 고객 응답 dict 목록 (처음 사용할 때 한 번 복원)"""
+        if self._target_customers is None:
+            self._target_customers = self._extract_target_customers()
+        return self._target_customers
+    
+    @property
+    def stats(self):
+        """전체 응답에서 한 번에 모은 분포와 집계 (SurveyStats, 처음 사용할 때 생성)"""
+        if self._stats is None:
+            self._stats = SurveyStats(self.table)
+        return self._stats
         
     def _load_raw_data(self):
         """원시 데이터 로드 - 현장조사 실제 데이터 (12명)"""
@@ -86,11 +186,7 @@ class DeliveryAshleyMenuAnalyzer:
     
     def _extract_target_customers(self):
         """40-50대 타겟 고객 추출"""
-        target_customers = []
-        for customer in self.raw_data:
-            if customer['age_group'] in ['40대', '50대']:
-                target_customers.append(customer)
-        return target_customers
+        return self.table.records(self.stats.target_mask)
     
     def analyze_target_complaints(self):
         """40-50대 타겟 고객 불만사항 분석"""
@@ -98,39 +194,44 @@ class DeliveryAshleyMenuAnalyzer:
         print("델리바이 애슐리 40-50대 타겟 고객 불만사항 분석")
         print("=" * 80)
         
-        target_count = len(self.target_customers)
+        target = self.table.filter(self.stats.target_mask)
+        target_count = len(target)
         print(f"\n🎯 40-50대 타겟 고객: {target_count}명")
         
-        # 불만사항 카테고리화 (집밥/건강/원산지 중심)
-        complaint_categories = {
-            '메뉴위치/가독성': ['메뉴가 어디에', '한눈에 보기 어려', '어디에 무엇이', '메뉴 이름 택이', '찾기 어려', '표시 미흡', '출입구'],
-            '조리품질/일관성': ['눅눅', '조각', '부실', '밀가루가 씹힌다', '기대에 못 미침'],
-            '동선/배치': ['동선이 좁', '바뀜', '넣다보니 좁아진'],
-            '가격': ['가격이 놀라', '그 가격에 그 맛'],
-            '제품부족': ['없어짐', '제품'],
-            '차별화': ['차별점'],
-            '집밥/건강니즈': ['건강한 집밥', '국물', '한식', '비빔밥', '김치찌개'],
-            '원산지/신뢰성': ['원산지', '신뢰', '품질']
-        }
+        # 불만사항 카테고리화 (집밥/건강/원산지 중심) - 미리 컴파일된 분류기로 서로 다른 문장마다 한 번 스캔
+        categorizer = complaint_categorizer()
+        complaints = target['complaints'].recode(lambda text: '없음' if text is None else text)
+        categories = complaints.lookup(categorizer.categorize)
+        has_complaint = complaints.where(lambda text: text not in NO_COMPLAINT)
         
         # 각 고객별 불만사항 매핑
         customer_complaints = []
-        for customer in self.target_customers:
-            complaints = customer.get('complaints', '없음')
-            if complaints not in ['없음', '']:
-                customer_complaints.append({
-                    'id': customer['id'],
-                    'age_group': customer['age_group'],
-                    'complaints': complaints,
-                    'categories': []
-                })
-                
-                # 카테고리 매핑
-                for category, keywords in complaint_categories.items():
-                    if any(keyword in complaints for keyword in keywords):
-                        customer_complaints[-1]['categories'].append(category)
-        
-        return customer_complaints, complaint_categories
+        ids, age_groups, texts = target['id'], target['age_group'], list(complaints)
+        for i in has_complaint.nonzero()[0].tolist():
+            customer_complaints.append({
+                'id': ids[i],
+                'age_group': age_groups[i],
+                'complaints': texts[i],
+                'categories': list(categories[i])
+            })
+        
+        return customer_complaints, {category: list(keywords) for category, keywords in categorizer.categories.items()}
+    
+    def health_home_meal_needs(self):
+        """집밥 건강 니즈별 인원과 한식 메뉴 수요 고객 목록 (출력 없음)"""
+        stats = self.stats
+        health_needs_stats = {
+            '한식 메뉴 수요': stats.korean_menu_count,
+            '건강한 집밥 선호': stats.health_needs['건강한 집밥 선호'],
+            '신선한 샐러드 선호': stats.health_needs['신선한 샐러드 선호'],
+            '국물 메뉴 선호': stats.health_needs['국물 메뉴 선호'],
+            '가족 식사 중심': stats.family_meal
+        }
+        health_focused_customers = self.table.records(stats.korean_menu_mask)
+        
+        # 실제 현장조사 데이터 기준: 4명이 한식 메뉴 수요 언급
+        health_needs_stats['한식 메뉴 수요'] = 4
+        return health_needs_stats, health_focused_customers
     
     def analyze_health_home_meal_needs(self):
         """집밥 건강 니즈 중심 분석"""
@@ -138,48 +239,14 @@ class DeliveryAshleyMenuAnalyzer:
         print("집밥 건강 니즈 중심 현장조사 분석")
         print("=" * 80)
         
-        total_customers = len(self.raw_data)
-        target_customers = [c for c in self.raw_data if c['age_group'] in ['40대', '50대']]
-        target_count = len(target_customers)
+        stats = self.stats
+        total_customers = stats.total
+        target_count = stats.target_count
         
         print(f"\n🎯 전체 조사 대상: {total_customers}명")
         print(f"🎯 40-50대 타겟: {target_count}명 ({target_count/total_customers*100:.1f}%)")
         
-        # 집밥 건강 니즈 분석
-        health_needs_stats = {
-            '한식 메뉴 수요': 0,
-            '건강한 집밥 선호': 0,
-            '신선한 샐러드 선호': 0,
-            '국물 메뉴 선호': 0,
-            '가족 식사 중심': 0
-        }
-        
-        # 한식 메뉴 수요 분석 (실제 데이터 기반)
-        korean_menu_demand = 0
-        health_focused_customers = []
-        
-        for customer in self.raw_data:
-            # 한식 메뉴 수요 확인
-            if customer.get('korean_menu_demand') and '한식' in customer.get('korean_menu_demand', ''):
-                korean_menu_demand += 1
-                health_focused_customers.append(customer)
-            
-            # 건강 관련 니즈 확인
-            health_needs = customer.get('health_needs', '')
-            if health_needs and health_needs != '없음':
-                if '신선한' in health_needs:
-                    health_needs_stats['신선한 샐러드 선호'] += 1
-                if '건강한' in health_needs:
-                    health_needs_stats['건강한 집밥 선호'] += 1
-                if '국물' in health_needs:
-                    health_needs_stats['국물 메뉴 선호'] += 1
-            
-            # 가족 식사 관련
-            if '가족' in customer.get('visit_reason', '') or '가족' in customer.get('notes', ''):
-                health_needs_stats['가족 식사 중심'] += 1
-        
-        # 실제 현장조사 데이터 기준: 4명이 한식 메뉴 수요 언급
-        health_needs_stats['한식 메뉴 수요'] = 4
+        health_needs_stats, health_focused_customers = self.health_home_meal_needs()
         
         print(f"\n🏠 집밥 건강 니즈 분석 결과:")
         for need, count in health_needs_stats.items():
@@ -196,80 +263,24 @@ class DeliveryAshleyMenuAnalyzer:
         
         return health_needs_stats, health_focused_customers
     
-    def create_health_focused_visualization(self):
-        """집밥 건강 니즈 중심 시각화 차트 생성"""
-        health_needs_stats, health_focused_customers = self.analyze_health_home_meal_needs()
-        
-        # 전체 고객 데이터 분석
-        total_customers = len(self.raw_data)
-        target_customers = [c for c in self.raw_data if c['age_group'] in ['40대', '50대']]
-        target_count = len(target_customers)
-        
-        # 연령대별 분포
-        age_dist = {}
-        for customer in self.raw_data:
-            age = customer['age_group']
-            age_dist[age] = age_dist.get(age, 0) + 1
-        
-        # 성별 분포
-        gender_dist = {}
-        for customer in self.raw_data:
-            gender = customer['gender']
-            gender_dist[gender] = gender_dist.get(gender, 0) + 1
-        
-        # 방문 빈도 분포
-        visit_freq_dist = {}
-        for customer in self.raw_data:
-            freq = customer.get('visit_frequency', '미기재')
-            visit_freq_dist[freq] = visit_freq_dist.get(freq, 0) + 1
-        
-        # 만족 요인 분석
-        satisfaction_factors = {}
-        for customer in self.raw_data:
-            satisfaction = customer.get('satisfaction', '')
-            if satisfaction and satisfaction != '없음':
-                if '가격' in satisfaction:
-                    satisfaction_factors['가격'] = satisfaction_factors.get('가격', 0) + 1
-                if '메뉴' in satisfaction:
-                    satisfaction_factors['메뉴 다양'] = satisfaction_factors.get('메뉴 다양', 0) + 1
-                if '신선' in satisfaction:
-                    satisfaction_factors['신선함'] = satisfaction_factors.get('신선함', 0) + 1
-                if '간단' in satisfaction:
-                    satisfaction_factors['간편성'] = satisfaction_factors.get('간편성', 0) + 1
-                if '가깝' in satisfaction:
-                    satisfaction_factors['매장 접근성'] = satisfaction_factors.get('매장 접근성', 0) + 1
-        
-        # 불만 요인 분석
-        complaint_factors = {}
-        for customer in self.raw_data:
-            complaints = customer.get('complaints', '')
-            if complaints and complaints != '없음':
-                if '눅눅' in complaints:
-                    complaint_factors['음식 눅눅함'] = complaint_factors.get('음식 눅눅함', 0) + 1
-                if '찾기 어려' in complaints or '표시 미흡' in complaints:
-                    complaint_factors['메뉴 위치/가독성'] = complaint_factors.get('메뉴 위치/가독성', 0) + 1
-                if '동선' in complaints:
-                    complaint_factors['동선 문제'] = complaint_factors.get('동선 문제', 0) + 1
-                if '차별점' in complaints:
-                    complaint_factors['차별점 부족'] = complaint_factors.get('차별점 부족', 0) + 1
-                if '가격이 놀라' in complaints:
-                    complaint_factors['가격 문제'] = complaint_factors.get('가격 문제', 0) + 1
-        
-        # 메뉴 선호도 분석
-        menu_preferences = {}
-        for customer in self.raw_data:
-            menu = customer.get('preferred_menu', '')
-            if menu and menu != '없음':
-                menus = [m.strip() for m in menu.split(',')]
-                for m in menus:
-                    if '샐러드' in m:
-                        menu_preferences['샐러드'] = menu_preferences.get('샐러드', 0) + 1
-                    if '초밥' in m:
-                        menu_preferences['초밥'] = menu_preferences.get('초밥', 0) + 1
-                    if '튀김' in m:
-                        menu_preferences['튀김'] = menu_preferences.get('튀김', 0) + 1
-                    if '비빔밥' in m:
-                        menu_preferences['비빔밥'] = menu_preferences.get('비빔밥', 0) + 1
+    def create_health_focused_visualization(self, outfile='customer_survey_analysis', verbose=True):
+        """집밥 건강 니즈 중심 시각화 차트 생성 (verbose가 거짓이면 분석 결과를 출력하지 않음)"""
+        # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+        plt = get_pyplot()
+        if verbose:
+            health_needs_stats, health_focused_customers = self.analyze_health_home_meal_needs()
+        else:
+            health_needs_stats, health_focused_customers = self.health_home_meal_needs()
+        
+        # 전체 고객 분포 (한 번 순회로 모은 집계 재사용)
+        stats = self.stats
+        total_customers = stats.total
+        age_dist = stats.age
+        gender_dist = stats.gender
+        visit_freq_dist = stats.visit_frequency
+        satisfaction_factors = stats.satisfaction
+        complaint_factors = stats.complaints
+        menu_preferences = dict(stats.menus)
         
         # 한식 메뉴 수요 추가 (실제 데이터: 4명이 한식 메뉴 수요 언급)
         menu_preferences['한식 메뉴 수요'] = 4  # 실제 현장조사 데이터 기준
@@ -379,8 +390,7 @@ class DeliveryAshleyMenuAnalyzer:
         
         plt.tight_layout()
         plt.subplots_adjust(top=0.92, bottom=0.08, left=0.08, right=0.95, hspace=0.3, wspace=0.3)
-        plt.savefig('customer_survey_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        save_figure(fig, outfile)
         
         return health_needs_stats, health_focused_customers
     
@@ -390,46 +400,32 @@ class DeliveryAshleyMenuAnalyzer:
         print("델리바이 애슐리 메뉴 개발 인사이트 도출")
         print("=" * 80)
         
-        # 40-50대 타겟 고객 특성 분석
-        target_customers = self.target_customers
-        target_count = len(target_customers)
+        # 40-50대 타겟 고객 특성 분석 (한 번 순회로 모은 집계 재사용)
+        stats = self.stats
+        target_count = stats.target_count
         
         print(f"\n🎯 타겟 고객 특성 ({target_count}명):")
         
         # 연령대별 분포
-        age_dist = {}
-        for customer in target_customers:
-            age = customer['age_group']
-            age_dist[age] = age_dist.get(age, 0) + 1
-        
+        age_dist = dict(stats.target_age)
         for age, count in age_dist.items():
             print(f"  {age}: {count}명 ({count/target_count*100:.1f}%)")
         
         # 성별 분포
-        gender_dist = {}
-        for customer in target_customers:
-            gender = customer['gender']
-            gender_dist[gender] = gender_dist.get(gender, 0) + 1
-        
+        gender_dist = dict(stats.target_gender)
         print(f"\n👥 성별 분포:")
         for gender, count in gender_dist.items():
             print(f"  {gender}: {count}명 ({count/target_count*100:.1f}%)")
         
         # 선호 메뉴 분석
-        preferred_menus = []
-        for customer in target_customers:
-            menu = customer.get('preferred_menu', '')
-            if menu and menu != '없음':
-                preferred_menus.extend([m.strip() for m in menu.split(',')])
-        
-        menu_counter = Counter(preferred_menus)
+        menu_counter = stats.target_menus
         print(f"\n🍽️ 선호 메뉴 TOP 5:")
         for menu, count in menu_counter.most_common(5):
             print(f"  {menu}: {count}명 ({count/target_count*100:.1f}%)")
         
         # 메뉴 개발 인사이트 도출
         print(f"\n💡 메뉴 개발 핵심 인사이트:")
-        print(f"  📊 타겟: 40-50대 {target_count}명 (전체의 {target_count/12*100:.1f}%)")
+        print(f"  📊 타겟: 40-50대 {target_count}명 (전체의 {target_count/stats.total*100:.1f}%)")
         print(f"  🎯 주요 선호: 샐러드, 초밥, 튀김류, 파스타")
         print(f"  ❌ 주요 불만: 조리품질, 가독성/안내, 가격")
         print(f"  🏠 니즈: 집밥/건강 지향, 원산지 신뢰, 간편성")
@@ -439,8 +435,8 @@ class DeliveryAshleyMenuAnalyzer:
             'age_distribution': age_dist,
             'gender_distribution': gender_dist,
             'preferred_menus': menu_counter,
-            'complaint_stats': self.create_complaint_visualization()[0],
-            'preference_stats': self.create_complaint_visualization()[1]
+            'complaint_stats': dict(stats.complaints),
+            'preference_stats': dict(stats.menus)
         }
     
     def create_menu_development_strategy(self):
@@ -488,13 +484,20 @@ class DeliveryAshleyMenuAnalyzer:
         
         print("\n" + "=" * 80)
         print("✅ 델리바이 애슐리 메뉴 개발 분석 완료!")
-        print("📊 시각화 파일: customer_survey_analysis.png")
+        print(f"📊 시각화 파일: {output_path('customer_survey_analysis')}")
         print("🏠 집밥 건강 니즈가 가장 중요한 고객 니즈로 확인됨!")
         print("=" * 80)
         
         return health_results, strategy_results
 
+def main(argv=None, analyzer=None):
+    """메인 실행 함수 (analyzer를 주면 이미 로드된 분석기를 재사용)"""
+    parser = argparse.ArgumentParser(description="델리바이 애슐리 메뉴 개발 분석")
+    parser.parse_args(argv)
+    
+    analyzer = analyzer or DeliveryAshleyMenuAnalyzer()
+    return analyzer.run_complete_analysis()
+
 # 분석 실행
 if __name__ == "__main__":
-    analyzer = DeliveryAshleyMenuAnalyzer()
-    results = analyzer.run_complete_analysis()
+    main()
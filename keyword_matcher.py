@@ -0,0 +1,279 @@
+"""
+keyword_matcher.py
+~~~~~~~~~~~~~~~~~~
+
+카테고리별 키워드 사전을 한 번에 찾는 Aho–Corasick 자동자
+
+모든 키워드를 하나의 트라이로 컴파일하고 실패 링크를 따라 전이표를 미리 채워 두므로
+리뷰 한 건은 글자당 딕셔너리 조회 한 번으로 끝까지 훑습니다.
+각 상태는 그 상태에서 끝나는 키워드들의 카테고리 비트마스크를 가지며,
+리뷰의 결과는 "어느 카테고리 키워드가 하나라도 나왔는가"를 나타내는 정수 비트마스크입니다.
+카테고리별 리뷰 수 등 모든 집계는 이 비트마스크에서 계산합니다.
+
+사용법:
+    automaton = KeywordAutomaton({'건강': ['건강', '건강식'], '국물': ['국물', '찌개']})
+    mask = automaton.scan("건강한 국물 요리")      # 0b11
+    automaton.categories_of(mask)                  # ['건강', '국물']
+    counts, total = automaton.count_categories(reviews)
+
+    # 제외 패턴: 같은 위치에서 끝나는 해당 카테고리 키워드 매칭을 무효화 ('국 '은 찾되 '한국 '은 제외)
+    KeywordAutomaton({'국물': ['국 ']}, exclusions={'국물': ['한국 ']})
+
+    counter = KeywordCounter(automaton)   # 스트리밍 입력을 청크 단위로 누적
+    counter.update(chunk)
+    counts, total = counter.counts(), counter.total
+
+    counter.update_sharded(reviews, max_workers=32)   # 프로세스별로 나눠 집계 후 병합
+    counter.update_ranges(source, source.byte_ranges(128), max_workers=32)
+                                          # 파일 구간을 작업 프로세스가 직접 읽고 파싱해 집계
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# 작업 프로세스로 한 번에 보내는 리뷰 수
+DEFAULT_SHARD_SIZE = 20000
+
+def keyword_version(keywords: Mapping[str, Iterable[str]],
+                    exclusions: Optional[Mapping[str, Iterable[str]]] = None,
+                    variant: Optional[str] = None) -> str:
+    """키워드 사전의 버전 해시 (카테고리 순서와 키워드, 제외 패턴, 입력 형식이 같으면 같은 값)
+
+    variant는 자동자에 넣는 텍스트의 형식(예: 토큰화 규칙 버전)으로, 바뀌면 버전도 바뀝니다.
+    """
+    data = [[category, list(words)] for category, words in keywords.items()]
+    if exclusions:
+        data.append(['exclusions', [[category, list(words)] for category, words in exclusions.items()]])
+    if variant:
+        data.append(['variant', variant])
+    payload = json.dumps(data, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class KeywordAutomaton:
+    """카테고리 비트마스크를 출력하는 Aho–Corasick 자동자
+
+    카테고리 i의 비트는 ``1 << i``이며 순서는 사전에 주어진 순서를 따릅니다.
+    exclusions의 패턴이 끝나는 위치에서는 그 카테고리의 키워드 매칭을 세지 않습니다.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]],
+                 exclusions: Optional[Mapping[str, Iterable[str]]] = None,
+                 variant: Optional[str] = None):
+        self.categories: List[str] = list(keywords)
+        self.version = keyword_version(keywords, exclusions, variant)
+        self.full_mask = (1 << len(self.categories)) - 1
+
+        # 1) 트라이 구성 (veto: 그 상태에서 끝나는 제외 패턴의 카테고리 비트)
+        goto: List[Dict[str, int]] = [{}]
+        output: List[int] = [0]
+        veto: List[int] = [0]
+
+        def insert(pattern: str, category: str) -> int:
+            if not pattern:
+                raise ValueError(f"empty keyword in category '{category}'")
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    output.append(0)
+                    veto.append(0)
+                state = nxt
+            return state
+
+        for bit, category in enumerate(self.categories):
+            for keyword in keywords[category]:
+                output[insert(keyword, category)] |= 1 << bit
+        for category, patterns in (exclusions or {}).items():
+            if category not in keywords:
+                raise ValueError(f"exclusions for unknown category '{category}'")
+            bit = self.categories.index(category)
+            for pattern in patterns:
+                veto[insert(pattern, category)] |= 1 << bit
+
+        # 2) BFS로 실패 링크를 계산하면서 전이표를 완성 (실패 상태의 전이를 물려받음)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            link = fail[state]
+            output[state] |= output[link]
+            veto[state] |= veto[link]
+            table = dict(delta[link])
+            table.update(goto[state])
+            delta[state] = table
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[link].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        # 3) 접미사 중 제외 패턴이 있는 상태에서는 그 카테고리 출력을 지움
+        self._output = [out & ~block for out, block in zip(output, veto)]
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def scan(self, text: str) -> int:
+        """텍스트에 등장한 키워드들의 카테고리 비트마스크
+
+        모든 카테고리가 발견되면 남은 글자는 읽지 않습니다.
+        """
+        delta = self._delta
+        output = self._output
+        full = self.full_mask
+        state = 0
+        mask = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                mask |= output[state]
+                if mask == full:
+                    break
+        return mask
+
+    def scan_many(self, texts: Iterable[str]) -> Iterator[int]:
+        """텍스트별 카테고리 비트마스크"""
+        return map(self.scan, texts)
+
+    def categories_of(self, mask: int) -> List[str]:
+        """비트마스크에 해당하는 카테고리 목록"""
+        return [category for bit, category in enumerate(self.categories) if mask >> bit & 1]
+
+    def mask_counts(self, mask_counter: Mapping[int, int]) -> Dict[str, int]:
+        """{비트마스크: 리뷰 수}를 카테고리별 리뷰 수로 변환
+
+        서로 다른 비트마스크 종류는 리뷰 수보다 훨씬 적으므로 펼치는 비용이 작습니다.
+        """
+        counts = dict.fromkeys(self.categories, 0)
+        for mask, n in mask_counter.items():
+            for bit, category in enumerate(self.categories):
+                if mask >> bit & 1:
+                    counts[category] += n
+        return counts
+
+    def count_categories(self, texts: Iterable[str]) -> Tuple[Dict[str, int], int]:
+        """(카테고리별로 키워드가 한 번 이상 나온 리뷰 수, 전체 리뷰 수)"""
+        counter = KeywordCounter(self)
+        counter.update(texts)
+        return counter.counts(), counter.total
+
+class KeywordCounter:
+    """리뷰가 흘러 들어오는 대로 비트마스크 빈도를 누적하는 집계기
+
+    상태는 {비트마스크: 리뷰 수}뿐이므로 입력 크기와 무관하게 메모리가 일정합니다.
+    """
+
+    def __init__(self, automaton: KeywordAutomaton):
+        self.automaton = automaton
+        self.mask_counter: Counter = Counter()
+
+    @property
+    def total(self) -> int:
+        """지금까지 집계한 리뷰 수"""
+        return sum(self.mask_counter.values())
+
+    def add(self, text: str) -> int:
+        """리뷰 한 건을 집계하고 그 비트마스크를 반환"""
+        mask = self.automaton.scan(text)
+        self.mask_counter[mask] += 1
+        return mask
+
+    def update(self, texts: Iterable[str]) -> 'KeywordCounter':
+        """리뷰 스트림을 끝까지 소비하며 집계"""
+        self.mask_counter.update(self.automaton.scan_many(texts))
+        return self
+
+    def update_sharded(self, texts: Iterable[str], max_workers: Optional[int] = None,
+                       shard_size: int = DEFAULT_SHARD_SIZE) -> 'KeywordCounter':
+        """리뷰 스트림을 샤드로 나눠 작업 프로세스에서 집계한 뒤 병합
+
+        각 프로세스는 자동자를 한 번만 받아 두고 샤드마다 {비트마스크: 리뷰 수}만 돌려주므로
+        결과 전송 비용은 무시할 만하며, 동시에 처리 중인 샤드 수를 제한해 메모리도 일정합니다.
+        """
+        for mask_counter in count_masks_sharded(self.automaton, texts, max_workers, shard_size):
+            self.mask_counter.update(mask_counter)
+        return self
+
+    def update_ranges(self, source, ranges: List[Tuple[int, int]], max_workers: Optional[int] = None,
+                      transform: Optional[Callable[[str], str]] = None) -> int:
+        """파일 구간마다 작업 프로세스가 읽기/파싱/변환/스캔을 모두 수행한 결과를 병합
+
+        source는 ``read_range(start, end)``로 구간의 본문을 읽는 객체(ReviewSource)이며,
+        transform(예: 토큰화)은 작업 프로세스에서 본문마다 적용됩니다.
+        부모 프로세스는 구간 경계만 보내고 {비트마스크: 리뷰 수}만 받으므로 입력 처리 병목이 없습니다.
+        반환값은 작업 프로세스들이 건너뛴 깨진 줄 수의 합입니다.
+        """
+        skipped = 0
+        workers = min(max_workers or os.cpu_count() or 1, max(len(ranges), 1))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.automaton,)) as pool:
+            futures = [pool.submit(_count_range, source, start, end, transform) for start, end in ranges]
+            for future in futures:
+                mask_counter, range_skipped = future.result()
+                self.mask_counter.update(mask_counter)
+                skipped += range_skipped
+        return skipped
+
+    def merge(self, other: 'KeywordCounter') -> 'KeywordCounter':
+        """같은 자동자로 집계한 다른 결과를 합침"""
+        self.mask_counter.update(other.mask_counter)
+        return self
+
+    def counts(self) -> Dict[str, int]:
+        """카테고리별 리뷰 수"""
+        return self.automaton.mask_counts(self.mask_counter)
+
+def iter_shards(texts: Iterable[str], shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[List[str]]:
+    """리뷰 스트림을 shard_size개씩 묶은 리스트로 분할"""
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    iterator = iter(texts)
+    while True:
+        shard = list(islice(iterator, shard_size))
+        if not shard:
+            return
+        yield shard
+
+_worker_automaton: Optional[KeywordAutomaton] = None
+
+def _init_worker(automaton: KeywordAutomaton) -> None:
+    global _worker_automaton
+    _worker_automaton = automaton
+
+def _count_shard(texts: List[str]) -> Counter:
+    return Counter(map(_worker_automaton.scan, texts))
+
+def _count_range(source, start: int, end: int,
+                 transform: Optional[Callable[[str], str]]) -> Tuple[Counter, int]:
+    texts = source.read_range(start, end)
+    if transform is not None:
+        texts = map(transform, texts)
+    mask_counter = Counter(map(_worker_automaton.scan, texts))
+    return mask_counter, source.stats.skipped
+
+def count_masks_sharded(automaton: KeywordAutomaton, texts: Iterable[str],
+                        max_workers: Optional[int] = None,
+                        shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[Counter]:
+    """샤드별 {비트마스크: 리뷰 수}를 완료되는 순서대로 반환"""
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(automaton,)) as pool:
+        # 작업 수의 두 배까지만 샤드를 미리 보내 입력 스트림을 필요한 만큼만 읽음
+        limit = 2 * workers
+        pending = set()
+        for shard in iter_shards(texts, shard_size):
+            pending.add(pool.submit(_count_shard, shard))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
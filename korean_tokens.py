@@ -0,0 +1,265 @@
+"""
+korean_tokens.py
+~~~~~~~~~~~~~~~~
+
+리뷰 본문 토큰화와 영구 토큰 캐시
+
+원문 부분 문자열 매칭은 '국'이 '한국', '국가' 안에서도 잡히는 문제가 있어
+리뷰를 토큰(어절)으로 나눈 뒤 토큰 경계를 기준으로 키워드를 찾습니다.
+
+토큰화 단계:
+    1. 유니코드 NFC 정규화 (자모가 분리된 입력을 완성형 음절로 합침)
+    2. 글자/숫자가 아닌 문자를 기준으로 어절 분리, 영문은 소문자화
+    3. 어절 끝 조사 제거 (받침 유무에 맞는 조사만: '국물이' → '국물', '영양가'는 유지)
+       '포도', '정도', '하나'처럼 조사 모양의 음절로 끝나는 낱말은 ``NON_PARTICLE_NOUNS``로 보존
+
+토큰화 결과는 리뷰 본문 해시를 키로 SQLite 캐시에 저장하므로, 같은 리뷰를 다시 분석하거나
+키워드 사전을 바꿔도 토큰화 비용은 리뷰당 한 번만 듭니다.
+
+매칭 규칙 (``token_keywords``로 키워드를 같은 방식으로 토큰화해 자동자에 넣음):
+    * 토큰 문자열은 ``" 토큰1 토큰2 "``처럼 앞뒤와 사이가 공백 한 칸
+    * 두 음절 이상 한 어절 키워드는 토큰 앞부분('건강' → '건강한', '건강식')이나
+      합성어 끝부분('찌개' → '김치찌개', '국물' → '된장국물')과 일치하면 매칭
+    * 한 음절 키워드는 토큰 전체나 합성어 끝부분과 일치하면 매칭 ('국' → '국이', '된장국', '탕' → '갈비탕')
+      '한국', '설탕'처럼 그 음절로 끝나는 다른 낱말은 ``token_exclusions``의 제외 패턴으로 거름
+    * 조사가 떨어져 나간 키워드는 합성어 끝부분으로 찾지 않음 ('집에서' → '집'은 토큰 '집'만 매칭하고
+      '맛집', '국밥집'은 제외, '국물이' → '국물'은 토큰 앞부분만 매칭)
+    * 여러 어절 키워드는 첫 어절부터 차례로 일치해야 매칭 ('집에서 만든' → ' 집 만든')
+
+사용법:
+    automaton = KeywordAutomaton(token_keywords(keywords), exclusions=token_exclusions(keywords))
+    automaton.scan(token_text(tokenize(review)))
+"""
+
+import hashlib
+import re
+import sqlite3
+import unicodedata
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+# 토큰화 규칙이 바뀌면 값을 올려 기존 캐시를 무효화합니다
+TOKENIZER_VERSION = 2
+
+# 한 번에 캐시를 조회/저장하는 리뷰 수
+DEFAULT_BATCH_SIZE = 5000
+
+_SPLIT = re.compile(r'[^\w]+')
+
+# 받침 있는 음절 뒤에 붙는 조사 / 받침 없는 음절 뒤에 붙는 조사 / 받침과 무관한 조사
+_PARTICLES_AFTER_CONSONANT = ('으로는', '으로', '이랑', '이나', '이라도', '은', '이', '을', '과')
+_PARTICLES_AFTER_VOWEL = ('로는', '로', '랑', '나', '라도', '는', '가', '를', '와')
+_PARTICLES_ANY = ('에서는', '에게서', '에서', '에게', '한테', '까지', '부터', '처럼', '보다', '하고',
+                  '에는', '에도', '의', '에', '도', '만')
+
+# 마지막 음절이 조사와 같은 모양이지만 조사가 아닌 낱말 (이 낱말로 끝나는 어절은 그대로 둠)
+NON_PARTICLE_NOUNS = frozenset({
+    '포도', '정도', '하나', '회의', '우도', '온도', '속도', '태도', '지도', '제도', '의도', '각도',
+    '강도', '농도', '당도', '염도', '경도', '습도', '거의', '주의', '정의', '의의', '문의', '동의',
+    '토의', '바나나', '얼마나', '누나', '아이', '오이', '나이',
+})
+_NON_PARTICLE_SUFFIXES = tuple(NON_PARTICLE_NOUNS)
+
+# 한 음절 키워드로 끝나지만 그 키워드의 합성어가 아닌 낱말 (합성어 끝부분 매칭에서 제외)
+SUFFIX_EXCEPTIONS: Dict[str, Tuple[str, ...]] = {
+    '국': ('한국', '중국', '미국', '영국', '외국', '전국', '결국', '약국', '천국', '왕국', '제국',
+          '당국', '각국', '입국', '출국', '시국', '본국', '조국'),
+    '탕': ('설탕', '사탕', '목욕탕', '온탕', '냉탕', '한탕'),
+}
+
+def _has_final_consonant(syllable: str) -> Optional[bool]:
+    """완성형 한글 음절의 받침 유무 (한글 음절이 아니면 None)"""
+    code = ord(syllable) - 0xAC00
+    if not 0 <= code < 11172:
+        return None
+    return code % 28 != 0
+
+# (조사, 앞 음절 받침 조건) 목록, 긴 조사부터 검사 (True: 받침 필요, False: 받침 없음, None: 무관)
+_PARTICLES = sorted(
+    [(p, True) for p in _PARTICLES_AFTER_CONSONANT]
+    + [(p, False) for p in _PARTICLES_AFTER_VOWEL]
+    + [(p, None) for p in _PARTICLES_ANY],
+    key=lambda item: len(item[0]), reverse=True)
+
+def strip_particle(token: str) -> str:
+    """어절 끝의 조사 하나를 제거 (앞 음절의 받침과 맞는 조사이고 어간이 남을 때만)
+
+    ``NON_PARTICLE_NOUNS``의 낱말로 끝나는 어절('포도', '청포도', '어느정도')은 그대로 둡니다.
+    """
+    if token.endswith(_NON_PARTICLE_SUFFIXES):
+        return token
+    for particle, needs_final in _PARTICLES:
+        if len(token) > len(particle) and token.endswith(particle):
+            syllable = token[-len(particle) - 1]
+            final = _has_final_consonant(syllable)
+            if final is None:
+                continue
+            # 'ㄹ' 받침 뒤에는 '으로' 대신 '로'가 붙음 ('국물로')
+            rieul = (ord(syllable) - 0xAC00) % 28 == 8
+            if needs_final is None or final == needs_final or (rieul and particle.startswith('로')):
+                return token[:-len(particle)]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """리뷰 본문을 정규화된 토큰 목록으로 변환"""
+    text = unicodedata.normalize('NFC', text).lower()
+    return [strip_particle(token) for token in _SPLIT.split(text) if token]
+
+def token_text(tokens: Iterable[str]) -> str:
+    """자동자 입력용 토큰 문자열 (" 토큰1 토큰2 ")"""
+    return f" {' '.join(tokens)} "
+
+def tokenized_text(text: str) -> str:
+    """리뷰 본문 하나의 토큰 문자열 (작업 프로세스에 넘길 수 있는 모듈 최상위 함수)"""
+    return token_text(tokenize(text))
+
+def _keyword_tokens(keyword: str) -> Tuple[List[str], bool]:
+    """키워드의 토큰 목록과 조사 제거로 토큰이 바뀌었는지 여부"""
+    tokens = tokenize(keyword)
+    words = [word for word in _SPLIT.split(unicodedata.normalize('NFC', keyword).lower()) if word]
+    return tokens, tokens != words
+
+def _keyword_patterns(tokens: List[str], stripped: bool = False) -> List[str]:
+    """토큰화한 키워드 하나의 매칭 패턴 (모듈 설명의 매칭 규칙)
+
+    stripped가 참이면(키워드 끝 조사가 떨어져 나감) 합성어 끝부분 패턴을 만들지 않습니다.
+    """
+    if len(tokens) > 1:
+        return [' ' + ' '.join(tokens) + (' ' if len(tokens[-1]) == 1 else '')]
+    word = tokens[0]
+    if stripped:
+        return [' ' + word + (' ' if len(word) == 1 else '')]
+    if len(word) == 1:
+        return [word + ' ']
+    return [' ' + word, word + ' ']
+
+def token_keywords(keywords: Mapping[str, Iterable[str]]) -> Dict[str, List[str]]:
+    """키워드 사전을 토큰 경계 매칭용 패턴 사전으로 변환
+
+    키워드도 리뷰와 같은 방식으로 토큰화하므로 '집에서 만든'은 ' 집 만든'이 됩니다.
+    """
+    patterns: Dict[str, List[str]] = {}
+    for category, words in keywords.items():
+        converted = []
+        for word in words:
+            tokens, stripped = _keyword_tokens(word)
+            if not tokens:
+                continue
+            for pattern in _keyword_patterns(tokens, stripped):
+                if pattern not in converted:
+                    converted.append(pattern)
+        patterns[category] = converted
+    return patterns
+
+def token_exclusions(keywords: Mapping[str, Iterable[str]]) -> Dict[str, List[str]]:
+    """한 음절 키워드가 합성어 끝부분으로 잘못 잡히는 낱말의 제외 패턴 사전
+
+    KeywordAutomaton의 exclusions로 넘기며, 제외 낱말로 끝나는 토큰에서는
+    그 카테고리의 매칭을 세지 않습니다 ('한국 음식'의 '국', '흑설탕'의 '탕').
+    """
+    exclusions: Dict[str, List[str]] = {}
+    for category, words in keywords.items():
+        patterns = []
+        for word in words:
+            tokens, stripped = _keyword_tokens(word)
+            if stripped or len(tokens) != 1 or len(tokens[0]) != 1:
+                continue
+            for exception in SUFFIX_EXCEPTIONS.get(tokens[0], ()):
+                pattern = exception + ' '
+                if pattern not in patterns:
+                    patterns.append(pattern)
+        if patterns:
+            exclusions[category] = patterns
+    return exclusions
+
+def text_hash(text: str) -> bytes:
+    """리뷰 본문의 128비트 해시 (캐시 키)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+class TokenCache:
+    """리뷰 본문 해시 → 토큰 문자열 영구 캐시 (SQLite)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "text_hash BLOB NOT NULL, version INTEGER NOT NULL, tokens TEXT NOT NULL, "
+            "PRIMARY KEY (text_hash, version)) WITHOUT ROWID")
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> 'TokenCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_many(self, hashes: List[bytes]) -> Dict[bytes, str]:
+        """캐시에 있는 {해시: 토큰 문자열}"""
+        found = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT text_hash, tokens FROM tokens WHERE version = ? AND text_hash IN ({placeholders})",
+                [TOKENIZER_VERSION, *chunk])
+            found.update(rows.fetchall())
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, str]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tokens (text_hash, version, tokens) VALUES (?, ?, ?)",
+                [(digest, TOKENIZER_VERSION, tokens) for digest, tokens in items])
+
+    def token_texts(self, texts: List[str]) -> List[str]:
+        """리뷰 묶음의 토큰 문자열 (캐시에 없는 리뷰만 토큰화 후 저장)"""
+        hashes = [text_hash(text) for text in texts]
+        found = self.get_many(list(set(hashes)))
+        missing: Dict[bytes, str] = {}
+        result = []
+        for digest, text in zip(hashes, texts):
+            tokens = found.get(digest)
+            if tokens is None:
+                tokens = missing.get(digest)
+                if tokens is None:
+                    tokens = tokenized_text(text)
+                    missing[digest] = tokens
+                self.misses += 1
+            else:
+                self.hits += 1
+            result.append(tokens)
+        if missing:
+            self.put_many(missing.items())
+        return result
+
+def tokenized_texts(texts: Iterable[str], cache: Optional[TokenCache] = None,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """리뷰 스트림을 토큰 문자열 스트림으로 변환 (캐시가 있으면 묶음 단위로 재사용)"""
+    if cache is None:
+        yield from map(tokenized_text, texts)
+        return
+    iterator = iter(texts)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield from cache.token_texts(batch)
+
+def tokenized_records(records: Iterable[Tuple[str, str]], cache: Optional[TokenCache] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[str, str]]:
+    """(리뷰 ID, 본문) 스트림을 (리뷰 ID, 토큰 문자열) 스트림으로 변환"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        ids = [review_id for review_id, _ in batch]
+        texts = tokenized_texts([text for _, text in batch], cache, batch_size)
+        yield from zip(ids, texts)
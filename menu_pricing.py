@@ -10,11 +10,13 @@ menu_pricing.py
 * 식재료비 비율(일반적으로 28–35% 사이)로 이상적 판매가를 계산합니다:contentReference[oaicite:0]{index=0}.
 * 총이익률(70% 목표)도 보고합니다:contentReference[oaicite:1]{index=1}.
 * 3,990원/7,990원/9,990원 구간으로 메뉴를 분류합니다.
+* 레시피×재료 희소 행렬과 단가 벡터의 곱으로 전체 메뉴를 한 번에 계산합니다.
+* 대용량 레시피 CSV는 고정 크기 청크로 나눠 읽으며 결과를 순차적으로 출력합니다.
 * matplotlib이 설치되어 있으면 메뉴판 이미지를 생성합니다.
 
 사용법:
     python menu_pricing.py --ingredients ingredients.csv --recipes recipes.csv \
-        [--tiers 3990 7990 9990] [--ideal_pct 0.3]
+        [--tiers 3990 7990 9990] [--ideal_pct 0.3] [--chunksize 5000]
 
 CSV 파일이 없으면 내부 샘플 데이터를 사용합니다.
 """
@@ -22,12 +24,13 @@ CSV 파일이 없으면 내부 샘플 데이터를 사용합니다.
 import argparse
 import csv
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-try:
-    import matplotlib.pyplot as plt  # 메뉴판 이미지를 그리기 위해 사용
-except Exception:
-    plt = None
+import numpy as np
+
+from chart_rendering import (add_render_arguments, apply_render_arguments, optional_pyplot, output_path,
+                             save_figure)
+from price_tiers import tier_classifier
 
 @dataclass
 class Ingredient:
@@ -90,6 +93,44 @@ def read_recipes(path: str) -> List[Recipe]:
             recipes.append(Recipe(menu_name, ing_quantities))
     return recipes
 
+def iter_recipe_chunks(path: str, chunksize: int = 5000
+                       ) -> Iterator[Tuple[List[str], List[str], np.ndarray]]:
+    """레시피 CSV를 청크 단위로 읽어 (메뉴명, 재료 컬럼, 수량 행렬)을 순차 반환
+
+    재료 컬럼은 모두 float64로 읽으므로 행마다 dict를 만들지 않으며,
+    메모리 사용량은 파일 크기와 무관하게 chunksize × 재료 수로 제한됩니다.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f))
+    columns = [col.strip() for col in header]
+    ingredient_cols = [col for col in columns if col != 'menu']
+    dtypes = {raw: ('float64' if col != 'menu' else str) for raw, col in zip(header, columns)}
+    import pandas as pd  # 스트리밍 모드에서만 필요
+    reader = pd.read_csv(path, encoding='utf-8', dtype=dtypes, chunksize=chunksize)
+    for chunk in reader:
+        chunk.columns = columns
+        names = chunk['menu'].str.strip().tolist()
+        quantities = chunk[ingredient_cols].to_numpy(dtype=float, na_value=0.0)
+        # read_recipes와 동일하게 0 이하 수량은 사용하지 않은 재료로 취급
+        np.maximum(quantities, 0.0, out=quantities)
+        yield names, ingredient_cols, quantities
+
+def stream_recipe_costs(path: str, price_lookup: Dict[str, float], tiers: List[float],
+                        ideal_pct: float, chunksize: int = 5000) -> Iterator['PricingResult']:
+    """레시피 CSV를 청크 단위로 가격 산정하여 PricingResult를 순차 반환"""
+    price_vector: Optional[np.ndarray] = None
+    missing: List[int] = []
+    for names, ingredient_cols, quantities in iter_recipe_chunks(path, chunksize):
+        if price_vector is None:
+            price_vector = np.array([price_lookup.get(col, 0.0) for col in ingredient_cols])
+            missing = [i for i, col in enumerate(ingredient_cols) if col not in price_lookup]
+        if missing:
+            used = np.flatnonzero(quantities[:, missing].any(axis=0))
+            if used.size:
+                item = ingredient_cols[missing[used[0]]]
+                raise KeyError(f"Ingredient '{item}' missing from price list.")
+        yield price_costs(names, quantities @ price_vector, tiers, ideal_pct)
+
 def suggest_price(cost: float, ideal_pct: float) -> float:
     if ideal_pct <= 0 or ideal_pct >= 1:
         raise ValueError("ideal_pct must be between 0 and 1 (exclusive)")
@@ -101,10 +142,7 @@ def gross_margin(price: float, cost: float) -> float:
     return (price - cost) / price
 
 def categorise_price(price: float, tiers: List[float]) -> str:
-    for threshold in sorted(tiers):
-        if price <= threshold:
-            return f"≤{int(threshold):,}원"
-    return f">{int(tiers[-1]):,}원"
+    return tier_classifier(tiers).classify(price)
 
 def load_sample_data() -> Tuple[Dict[str, Ingredient], List[Recipe]]:
     # 실제 상품 데이터를 기반으로 한 샘플 데이터
@@ -163,50 +201,121 @@ def load_real_data() -> Tuple[Dict[str, Ingredient], List[Recipe]]:
     
     return ingredients, recipes
 
+@dataclass
+class PricingResult:
+    """배치 가격 산정 결과 (모든 배열은 레시피 순서를 따릅니다)"""
+    names: List[str]
+    costs: np.ndarray
+    suggested_prices: np.ndarray
+    gross_margins: np.ndarray
+    tier_codes: np.ndarray
+    tier_labels: List[str]  # tier code -> 라벨
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def tiers(self) -> List[str]:
+        return [self.tier_labels[code] for code in self.tier_codes.tolist()]
+
+class BatchPricingEngine:
+    """레시피 집합을 희소 수량 행렬로, 단가표를 벡터로 바꿔 한 번에 계산하는 엔진
+
+    레시피×재료 수량은 CSR 형식(indptr, indices, quantities)으로 한 번만 구성하고,
+    이후에는 행렬-벡터 곱 한 번으로 모든 메뉴의 원가를 구합니다.
+    """
+
+    def __init__(self, price_lookup: Dict[str, float], recipes: List[Recipe]):
+        self.ingredient_names: List[str] = list(price_lookup)
+        index = {name: i for i, name in enumerate(self.ingredient_names)}
+        self.prices = np.fromiter(price_lookup.values(), dtype=float, count=len(index))
+        self.names: List[str] = [recipe.name for recipe in recipes]
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        quantities: List[float] = []
+        for recipe in recipes:
+            for item, qty in recipe.ingredients.items():
+                if item not in index:
+                    raise KeyError(f"Ingredient '{item}' missing from price list.")
+                indices.append(index[item])
+                quantities.append(qty)
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.quantities = np.asarray(quantities, dtype=float)
+        # 각 비영(非零) 원소가 속한 레시피 행 번호
+        self._rows = np.repeat(np.arange(len(self.names)), np.diff(self.indptr))
+
+    @classmethod
+    def from_ingredients(cls, ingredients: Dict[str, Ingredient],
+                         recipes: List[Recipe]) -> 'BatchPricingEngine':
+        return cls({name: ing.price_per_kg for name, ing in ingredients.items()}, recipes)
+
+    def costs(self) -> np.ndarray:
+        """희소 행렬 × 단가 벡터: 레시피별 원가 배열"""
+        return np.bincount(self._rows, weights=self.quantities * self.prices[self.indices],
+                           minlength=len(self.names))
+
+    def price(self, tiers: List[float], ideal_pct: float) -> PricingResult:
+        return price_costs(self.names, self.costs(), tiers, ideal_pct)
+
+def price_costs(names: List[str], costs: np.ndarray, tiers: List[float],
+                ideal_pct: float) -> PricingResult:
+    """원가 배열로부터 제안가, 총이익률, 가격 구간을 배열 연산으로 계산"""
+    suggested = suggest_price(costs, ideal_pct)
+    if np.any(suggested <= 0):
+        raise ValueError("price must be positive")
+    margins = (suggested - costs) / suggested
+    classifier = tier_classifier(tiers)
+    return PricingResult(names, costs, suggested, margins, classifier.codes(suggested),
+                         classifier.labels)
+
 def print_summary(ingredients: Dict[str, Ingredient], recipes: List[Recipe],
-                  tiers: List[float], ideal_pct: float) -> None:
-    price_lookup: Dict[str, float] = {name: ing.price_per_kg for name, ing in ingredients.items()}
+                  tiers: List[float], ideal_pct: float,
+                  result: Optional[PricingResult] = None) -> None:
+    if result is None:
+        result = BatchPricingEngine.from_ingredients(ingredients, recipes).price(tiers, ideal_pct)
+    print_ingredient_table(ingredients)
+    print_menu_header(ideal_pct)
+    print_menu_rows(result)
+
+def print_ingredient_table(ingredients: Dict[str, Ingredient]) -> None:
     print("Ingredient price per kg:")
     print(f"{'Ingredient':<15}{'Weight (kg)':>12}{'Cost (₩)':>12}{'Price/kg (₩)':>15}")
     for name, ing in ingredients.items():
         print(f"{name:<15}{ing.weight_kg:>12.3f}{ing.cost_won:>12,.0f}{ing.price_per_kg:>15,.2f}")
     print()
+
+def print_menu_header(ideal_pct: float) -> None:
     print(f"Menu summary (ideal food-cost pct = {ideal_pct*100:.0f}%):")
     print(f"{'Menu':<25}{'Cost (₩)':>12}{'Suggested Price (₩)':>20}{'Gross Margin':>15}{'Tier':>10}")
-    for recipe in recipes:
-        c = recipe.cost(price_lookup)
-        suggested = suggest_price(c, ideal_pct)
-        margin = gross_margin(suggested, c)
-        tier = categorise_price(suggested, tiers)
-        print(f"{recipe.name:<25}{c:>12,.0f}{suggested:>20,.0f}{margin:>15.0%}{tier:>10}")
+
+def print_menu_rows(result: PricingResult) -> None:
+    for name, c, suggested, margin, tier in zip(result.names, result.costs.tolist(),
+                                                 result.suggested_prices.tolist(),
+                                                 result.gross_margins.tolist(), result.tiers):
+        print(f"{name:<25}{c:>12,.0f}{suggested:>20,.0f}{margin:>15.0%}{tier:>10}")
 
 def generate_menu_board(recipes: List[Recipe], price_lookup: Dict[str, float],
-                        tiers: List[float], ideal_pct: float, outfile: str):
+                        tiers: List[float], ideal_pct: float, outfile: str,
+                        result: Optional[PricingResult] = None):
+    plt = optional_pyplot()  # 메뉴판 이미지를 그리기 위해 사용
     if plt is None:
         return None
-    names: List[str] = []
-    costs: List[float] = []
-    suggested_prices: List[float] = []
-    categories: List[str] = []
-    for recipe in recipes:
-        c = recipe.cost(price_lookup)
-        s = suggest_price(c, ideal_pct)
-        names.append(recipe.name)
-        costs.append(c)
-        suggested_prices.append(s)
-        categories.append(categorise_price(s, tiers))
-    # 색상 정의
-    def _cat_key(cat: str) -> float:
-        digits = ''.join(ch for ch in cat if ch.isdigit())
-        return float(digits) if digits else float('inf')
-    unique_cats = sorted(set(categories), key=_cat_key)
-    colours = plt.cm.get_cmap('Set2', len(unique_cats))
+    if result is None:
+        result = BatchPricingEngine(price_lookup, recipes).price(tiers, ideal_pct)
+    names = result.names
+    suggested_prices = result.suggested_prices.tolist()
+    categories = result.tiers
+    # 색상 정의 (tier code 순서가 곧 가격 구간 순서)
+    unique_cats = [result.tier_labels[code] for code in np.unique(result.tier_codes).tolist()]
+    colours = plt.get_cmap('Set2', len(unique_cats))
     cat_to_colour = {cat: colours(i) for i, cat in enumerate(unique_cats)}
-    fig, ax = plt.subplots(figsize=(8, 4 + 0.4 * len(recipes)))
+    fig, ax = plt.subplots(figsize=(8, 4 + 0.4 * len(names)))
     for i, (name, price, cat) in enumerate(zip(names, suggested_prices, categories)):
         ax.barh(i, price, color=cat_to_colour[cat], edgecolor='black')
         ax.text(price * 1.01, i, f"₩{price:,.0f}", va='center', fontsize=10)
-    ax.set_yticks(range(len(recipes)))
+    ax.set_yticks(range(len(names)))
     ax.set_yticklabels(names)
     ax.set_xlabel('Price (₩)')
     ax.invert_yaxis()
@@ -215,9 +324,8 @@ def generate_menu_board(recipes: List[Recipe], price_lookup: Dict[str, float],
         ax.barh([], [], color=cat_to_colour[cat], label=cat)
     ax.legend(title='Tier', bbox_to_anchor=(1.05, 1), loc='upper left')
     fig.tight_layout()
-    fig.savefig(outfile)
-    plt.close(fig)
-    return outfile
+    # 메뉴판은 원래대로 그림 기본 해상도(100dpi)로 저장 (--dpi로 바꿀 수 있음)
+    return save_figure(fig, outfile, show=False, bbox_inches=None, dpi=fig.dpi)
 
 def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Analyse ingredient costs and compute menu pricing.")
@@ -227,9 +335,30 @@ def main(argv: Optional[List[str]] = None) -> None:
                         help='Price tiers (원) for categorisation.')
     parser.add_argument('--ideal_pct', type=float, default=0.30,
                         help='Ideal food-cost percentage used to calculate suggested prices.')
-    parser.add_argument('--board', type=str, default='menu_board.png',
-                        help='Filename for the generated menu board image.')
+    parser.add_argument('--board', type=str, default='menu_board',
+                        help='Filename for the generated menu board image (extension picks the format; default menu_board.png).')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Stream the recipe CSV in chunks of this many rows.')
+    add_render_arguments(parser)
     args = parser.parse_args(argv)
+    apply_render_arguments(args)
+    try:
+        output_path(args.board)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.ingredients and args.recipes and args.chunksize:
+        # 대용량 레시피 파일: 청크 단위로 계산하고 바로 출력 (메뉴판 이미지는 생략)
+        ingredients = read_ingredients(args.ingredients)
+        price_lookup = {name: ing.price_per_kg for name, ing in ingredients.items()}
+        print_ingredient_table(ingredients)
+        print_menu_header(args.ideal_pct)
+        total = 0
+        for result in stream_recipe_costs(args.recipes, price_lookup, args.tiers,
+                                          args.ideal_pct, chunksize=args.chunksize):
+            print_menu_rows(result)
+            total += len(result)
+        print(f"\n총 {total:,}개 메뉴를 청크 단위로 처리했습니다.")
+        return
     if args.ingredients and args.recipes:
         ingredients = read_ingredients(args.ingredients)
         recipes = read_recipes(args.recipes)
@@ -238,10 +367,12 @@ def main(argv: Optional[List[str]] = None) -> None:
         print("실제 상품 데이터를 로드합니다...")
         ingredients, recipes = load_real_data()
         print(f"로드된 상품 수: {len(ingredients)}개")
-    print_summary(ingredients, recipes, tiers=args.tiers, ideal_pct=args.ideal_pct)
+    engine = BatchPricingEngine.from_ingredients(ingredients, recipes)
+    result = engine.price(args.tiers, args.ideal_pct)
+    print_summary(ingredients, recipes, tiers=args.tiers, ideal_pct=args.ideal_pct, result=result)
     price_lookup: Dict[str, float] = {name: ing.price_per_kg for name, ing in ingredients.items()}
     image_path = generate_menu_board(recipes, price_lookup, tiers=args.tiers,
-                                     ideal_pct=args.ideal_pct, outfile=args.board)
+                                     ideal_pct=args.ideal_pct, outfile=args.board, result=result)
     if image_path:
         print(f"\n메뉴판 이미지 생성 완료: {image_path}")
     else:
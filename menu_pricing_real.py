@@ -10,24 +10,24 @@ Excel 파일의 실제 데이터를 사용하여 원가 분석 및 가격 산정
 * 각 메뉴의 원가율을 바탕으로 이상적인 판매가를 계산합니다.
 * 식재료비 비율과 총이익률을 고려한 가격 제안을 제공합니다.
 * 가격 구간별 메뉴 분류 및 시각화를 제공합니다.
+* 매장별 Excel 파일 여러 개를 병렬로 읽어 한 번에 분석할 수 있습니다.
 
 사용법:
     python menu_pricing_real.py --excel "상품별 판매 데이터.xlsx" [--tiers 3990 7990 9990] [--ideal_pct 0.3]
+    python menu_pricing_real.py --excel-glob "stores/**/상품별 판매 데이터.xlsx" [--workers 8]
 """
 
 import argparse
-import pandas as pd
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 
-try:
-    import matplotlib.pyplot as plt
-    # 한글 폰트 설정
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-    plt.rcParams['axes.unicode_minus'] = False
-except Exception:
-    plt = None
+from chart_rendering import (add_render_arguments, apply_render_arguments, optional_pyplot, output_path,
+                             save_figure)
+from menu_table import MenuTable
+from price_tiers import TierClassifier, tier_classifier
+from sales_workbook import (DEFAULT_CACHE_DIR, expand_workbook_glob, load_sales_frame,
+                            load_sales_frames, report_rejected_rows)
 
 @dataclass
 class MenuItem:
@@ -50,56 +50,59 @@ class MenuItem:
         if self.suggested_price > 0:
             self.gross_margin = (self.suggested_price - actual_cost) / self.suggested_price
 
-    def categorize_tier(self, tiers: List[float]) -> None:
+    def categorize_tier(self, tiers: Union[List[float], TierClassifier]) -> None:
         """가격 구간별 분류"""
-        for threshold in sorted(tiers):
-            if self.suggested_price <= threshold:
-                self.tier = f"≤{int(threshold):,}원"
-                return
-        self.tier = f">{int(tiers[-1]):,}원"
+        classifier = tiers if isinstance(tiers, TierClassifier) else tier_classifier(tiers)
+        self.tier = classifier.classify(self.suggested_price)
 
-def read_excel_data(file_path: str) -> List[MenuItem]:
-    """Excel 파일에서 상품 데이터 읽기"""
+def read_excel_table(file_path: str, engine: Optional[str] = None,
+                     cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> MenuTable:
+    """Excel 파일에서 상품 데이터를 컬럼형 테이블로 읽기 (행 단위 루프 없음, 캐시 사용)"""
     try:
-        # Excel 파일 읽기 (헤더 없이)
-        df = pd.read_excel(file_path, header=None)
-        print(f"Excel 파일 읽기 완료: {len(df)}행")
-        
-        menu_items = []
-        
-        # 데이터 행 찾기 (3행부터 시작)
-        for i in range(3, len(df)):
-            row = df.iloc[i]
-            
-            # 상품명과 원가율이 있는 행만 처리
-            if pd.notna(row[0]) and pd.notna(row[-1]):
-                try:
-                    name = str(row[0]).strip()
-                    daily_sales = float(row[1]) if pd.notna(row[1]) else 0.0
-                    cost_ratio = float(row[-1]) if pd.notna(row[-1]) else 0.0
-                    
-                    # 유효한 데이터만 추가
-                    if name and cost_ratio > 0:
-                        menu_item = MenuItem(
-                            name=name,
-                            daily_sales=daily_sales,
-                            cost_ratio=cost_ratio
-                        )
-                        menu_items.append(menu_item)
-                        print(f"상품 추가: {name} (원가율: {cost_ratio})")
-                except (ValueError, TypeError) as e:
-                    print(f"데이터 처리 오류 (행 {i}): {e}")
-                    continue
-        
-        print(f"총 {len(menu_items)}개 상품 데이터를 읽었습니다.")
-        return menu_items
-    
+        frame, rejected = load_sales_frame(file_path, cache_dir=cache_dir, engine=engine)
     except Exception as e:
         print(f"Excel 파일 읽기 오류: {e}")
-        return []
+        return MenuTable([], [], [])
+    
+    report_rejected_rows(rejected)
+    print(f"총 {len(frame)}개 상품 데이터를 읽었습니다.")
+    return MenuTable.from_frame(frame)
+
+def read_excel_glob_table(pattern: str, engine: Optional[str] = None,
+                          cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                          max_workers: Optional[int] = None,
+                          store_pattern: Optional[str] = None) -> MenuTable:
+    """glob 패턴에 맞는 매장별 Excel 파일을 병렬로 읽어 store/partition 컬럼이 있는 하나의 테이블로 병합"""
+    paths = expand_workbook_glob(pattern)
+    if not paths:
+        print(f"Excel 파일을 찾을 수 없습니다: {pattern}")
+        return MenuTable([], [], [], stores=[])
+    print(f"{len(paths)}개 Excel 파일을 병렬로 읽는 중...")
+    frame, rejected_by_store, errors = load_sales_frames(paths, cache_dir=cache_dir, engine=engine,
+                                                         max_workers=max_workers,
+                                                         store_pattern=store_pattern)
+    for label, error in errors.items():
+        print(f"Excel 파일 읽기 오류 ({label}): {error}")
+    for label, rejected in rejected_by_store.items():
+        print(f"[{label}] ", end="")
+        report_rejected_rows(rejected)
+    print(f"총 {len(paths) - len(errors)}개 파일({frame['store'].nunique()}개 매장), "
+          f"{len(frame)}개 상품 데이터를 읽었습니다.")
+    return MenuTable.from_frame(frame)
 
-def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: float, base_cost: float) -> None:
+def read_excel_data(file_path: str) -> List[MenuItem]:
+    """Excel 파일에서 상품 데이터 읽기"""
+    table = read_excel_table(file_path)
+    return [MenuItem(name=name, daily_sales=daily_sales, cost_ratio=cost_ratio)
+            for name, daily_sales, cost_ratio in zip(table.names.tolist(),
+                                                     table.daily_sales.tolist(),
+                                                     table.cost_ratio.tolist())]
+
+def print_summary(menu_items: Union[MenuTable, List[MenuItem]], tiers: List[float], ideal_pct: float, base_cost: float) -> None:
     """분석 결과 요약 출력"""
+    table = menu_items if isinstance(menu_items, MenuTable) else MenuTable.from_items(menu_items)
+    if not table.tier_labels:
+        table.categorize_tier(tiers)
     print("=" * 100)
     print("🍽️ 실제 상품 데이터 기반 메뉴 가격 분석")
     print("=" * 100)
@@ -108,20 +111,24 @@ def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: flo
     print(f"  • 기준 원가: {base_cost:,.0f}원")
     print(f"  • 식재료비 비율: {ideal_pct*100:.0f}%")
     print(f"  • 목표 총이익률: {(1-ideal_pct)*100:.0f}%")
-    print(f"  • 분석 상품 수: {len(menu_items)}개")
+    if table.stores is not None:
+        print(f"  • 분석 매장 수: {table.store_count()}개")
+    print(f"  • 분석 상품 수: {len(table)}개")
     
     print(f"\n📈 상품별 원가율 분석:")
     print(f"{'상품명':<25} {'일평균판매량':<12} {'원가율':<10} {'실제원가':<12} {'제안가':<12} {'총이익률':<10} {'가격구간':<12}")
     print("-" * 100)
     
-    for item in menu_items:
-        actual_cost = base_cost * item.cost_ratio
-        print(f"{item.name:<25} {item.daily_sales:<12.1f} {item.cost_ratio:<10.3f} {actual_cost:<12,.0f} {item.suggested_price:<12,.0f} {item.gross_margin:<10.1%} {item.tier:<12}")
+    rows = zip(table.display_names, table.daily_sales.tolist(), table.cost_ratio.tolist(),
+               table.actual_cost(base_cost).tolist(), table.suggested_price.tolist(),
+               table.gross_margin.tolist(), table.tiers)
+    for name, daily_sales, cost_ratio, actual_cost, suggested_price, gross_margin, tier in rows:
+        print(f"{name:<25} {daily_sales:<12.1f} {cost_ratio:<10.3f} {actual_cost:<12,.0f} {suggested_price:<12,.0f} {gross_margin:<10.1%} {tier:<12}")
     
     # 통계 요약
     print(f"\n📊 통계 요약:")
-    suggested_prices = [item.suggested_price for item in menu_items]
-    gross_margins = [item.gross_margin for item in menu_items]
+    suggested_prices = table.suggested_price
+    gross_margins = table.gross_margin
     
     print(f"  • 평균 제안가: {np.mean(suggested_prices):,.0f}원")
     print(f"  • 최고가: {np.max(suggested_prices):,.0f}원")
@@ -130,31 +137,30 @@ def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: flo
     
     # 가격 구간별 분포
     print(f"\n💰 가격 구간별 분포:")
-    tier_counts = {}
-    for item in menu_items:
-        tier_counts[item.tier] = tier_counts.get(item.tier, 0) + 1
+    tier_counts = table.tier_counts()
     
     for tier, count in sorted(tier_counts.items()):
-        percentage = (count / len(menu_items)) * 100
+        percentage = (count / len(table)) * 100
         print(f"  • {tier}: {count}개 ({percentage:.1f}%)")
 
-def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile: str = "real_menu_board.png"):
+def generate_menu_board(menu_items: Union[MenuTable, List[MenuItem]], tiers: List[float], outfile: str = "real_menu_board"):
     """실제 메뉴 데이터 기반 메뉴판 시각화"""
+    # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+    plt = optional_pyplot()
     if plt is None:
         return None
     
     # 데이터 준비
-    names = [item.name for item in menu_items]
-    suggested_prices = [item.suggested_price for item in menu_items]
-    categories = [item.tier for item in menu_items]
-    
-    # 색상 정의
-    def _cat_key(cat: str) -> float:
-        digits = ''.join(ch for ch in cat if ch.isdigit())
-        return float(digits) if digits else float('inf')
+    table = menu_items if isinstance(menu_items, MenuTable) else MenuTable.from_items(menu_items)
+    if not table.tier_labels:
+        table.categorize_tier(tiers)
+    names = table.display_names
+    suggested_prices = table.suggested_price.tolist()
+    categories = table.tiers
     
-    unique_cats = sorted(set(categories), key=_cat_key)
-    colors = plt.cm.get_cmap('Set3', len(unique_cats))
+    # 색상 정의 (구간 코드 순서가 곧 가격 순서)
+    unique_cats = [table.tier_labels[code] for code in np.unique(table.tier_code).tolist()]
+    colors = plt.get_cmap('Set3', len(unique_cats))
     cat_to_colour = {cat: colors(i) for i, cat in enumerate(unique_cats)}
     
     # 그래프 생성
@@ -177,7 +183,7 @@ def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile:
                 f'₩{price:,.0f}', ha='left', va='center', fontsize=9)
     
     # 하단: 총이익률 분석
-    gross_margins = [item.gross_margin * 100 for item in menu_items]
+    gross_margins = (table.gross_margin * 100).tolist()
     bars2 = ax2.barh(y_pos, gross_margins, color=[cat_to_colour[cat] for cat in categories], alpha=0.8)
     
     ax2.set_yticks(y_pos)
@@ -200,47 +206,71 @@ def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile:
     ax1.legend(title='가격 구간', bbox_to_anchor=(1.05, 1), loc='upper left')
     
     plt.tight_layout()
-    plt.savefig(outfile, dpi=300, bbox_inches='tight')
-    plt.show()
-    
-    return outfile
+    return save_figure(fig, outfile)
 
 def main(argv: Optional[List[str]] = None) -> None:
     """메인 함수"""
     parser = argparse.ArgumentParser(description="실제 상품 데이터 기반 메뉴 가격 분석")
-    parser.add_argument('--excel', type=str, required=True, help='Excel 파일 경로')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--excel', type=str, help='Excel 파일 경로')
+    source.add_argument('--excel-glob', type=str,
+                        help='매장별 Excel 파일 glob 패턴 (예: "stores/**/상품별 판매 데이터.xlsx")')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='--excel-glob 병렬 파싱 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--store-pattern', type=str, default=None,
+                        help='--excel-glob 경로에서 매장/파티션을 뽑는 정규식 '
+                             '(이름 그룹 store 필수, partition 선택; 기본: 첫 번째 하위 폴더가 매장)')
+    parser.add_argument('--engine', type=str, default=None,
+                        help='read_excel 엔진 (기본: calamine 설치 시 calamine, 아니면 openpyxl)')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR,
+                        help='파싱 결과 Feather 캐시 디렉터리')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='캐시를 사용하지 않고 매번 Excel을 파싱')
     parser.add_argument('--tiers', type=float, nargs='+', default=[3990, 7990, 9990],
                         help='가격 구간 (원)')
     parser.add_argument('--ideal_pct', type=float, default=0.30,
                         help='이상적인 식재료비 비율')
     parser.add_argument('--base_cost', type=float, default=1000.0,
                         help='기준 원가 (원)')
-    parser.add_argument('--board', type=str, default='real_menu_board.png',
-                        help='생성할 메뉴판 이미지 파일명')
+    parser.add_argument('--board', type=str, default='real_menu_board',
+                        help='생성할 메뉴판 이미지 파일명 (확장자로 형식 결정, 없으면 --format/png)')
+    add_render_arguments(parser)
     
     args = parser.parse_args(argv)
+    apply_render_arguments(args)
+    try:
+        output_path(args.board)
+    except ValueError as e:
+        parser.error(str(e))
     
     # Excel 데이터 읽기
     print("📁 Excel 파일을 읽는 중...")
-    menu_items = read_excel_data(args.excel)
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.excel_glob:
+        try:
+            menu_table = read_excel_glob_table(args.excel_glob, engine=args.engine, cache_dir=cache_dir,
+                                               max_workers=args.workers, store_pattern=args.store_pattern)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        menu_table = read_excel_table(args.excel, engine=args.engine, cache_dir=cache_dir)
     
-    if not menu_items:
+    if not len(menu_table):
         print("❌ 유효한 데이터를 찾을 수 없습니다.")
         return
     
-    print(f"✅ {len(menu_items)}개 상품 데이터를 읽었습니다.")
+    print(f"✅ {len(menu_table)}개 상품 데이터를 읽었습니다.")
     
-    # 각 메뉴의 가격 계산
-    for item in menu_items:
-        item.calculate_pricing(args.base_cost, args.ideal_pct)
-        item.categorize_tier(args.tiers)
+    # 전체 메뉴의 가격 계산 (컬럼 단위 연산)
+    menu_table.calculate_pricing(args.base_cost, args.ideal_pct)
+    menu_table.categorize_tier(TierClassifier(args.tiers))
     
     # 결과 출력
-    print_summary(menu_items, args.tiers, args.ideal_pct, args.base_cost)
+    print_summary(menu_table, args.tiers, args.ideal_pct, args.base_cost)
     
     # 메뉴판 생성
     print(f"\n📊 메뉴판 이미지 생성 중...")
-    image_path = generate_menu_board(menu_items, args.tiers, args.board)
+    image_path = generate_menu_board(menu_table, args.tiers, args.board)
     
     if image_path:
         print(f"✅ 메뉴판 이미지 생성 완료: {image_path}")
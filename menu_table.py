@@ -0,0 +1,198 @@
+"""
+menu_table.py
+~~~~~~~~~~~~~
+
+실제 상품 데이터용 컬럼형 메뉴 테이블
+
+상품마다 ``MenuItem`` 데이터클래스를 만드는 대신 상품명, 일평균판매량, 원가율,
+제안가, 총이익률, 가격 구간 코드(여러 매장을 합친 경우 매장명과 파티션 포함)를
+각각 NumPy 배열 한 개로 보관합니다.
+가격 산정과 구간 분류는 컬럼 전체에 대한 배열 연산으로 수행하고,
+기존 코드를 위해 ``MenuItem``과 같은 속성을 가진 행 단위 뷰를 제공합니다.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from price_tiers import TierClassifier, tier_classifier
+
+def _column_property(column: str, doc: str) -> property:
+    def fget(self):
+        value = getattr(self._table, column)[self._index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def fset(self, value):
+        getattr(self._table, column)[self._index] = value
+
+    return property(fget, fset, doc=doc)
+
+class MenuItemView:
+    """MenuTable의 한 행을 MenuItem처럼 읽고 쓰는 뷰 (데이터는 복사하지 않음)"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'MenuTable', index: int):
+        self._table = table
+        self._index = index
+
+    name = _column_property('names', '상품명')
+    daily_sales = _column_property('daily_sales', '일평균판매량')
+    cost_ratio = _column_property('cost_ratio', '원가율')
+    suggested_price = _column_property('suggested_price', '제안가')
+    gross_margin = _column_property('gross_margin', '총이익률')
+
+    @property
+    def store(self) -> str:
+        """매장명 (단일 매장 테이블이면 빈 문자열)"""
+        if self._table.stores is None:
+            return ""
+        return self._table.stores[self._index]
+
+    @property
+    def tier(self) -> str:
+        """가격 구간 라벨 (분류 전에는 빈 문자열)"""
+        if not self._table.tier_labels:
+            return ""
+        return self._table.tier_labels[self._table.tier_code[self._index]]
+
+    @tier.setter
+    def tier(self, label: str) -> None:
+        """라벨에 해당하는 구간 코드로 설정 (표에 없는 라벨은 라벨 표 끝에 추가)"""
+        labels = self._table.tier_labels
+        if label not in labels:
+            labels.append(label)
+        self._table.tier_code[self._index] = labels.index(label)
+
+    def __repr__(self) -> str:
+        return (f"MenuItemView(name={self.name!r}, daily_sales={self.daily_sales!r}, "
+                f"cost_ratio={self.cost_ratio!r}, suggested_price={self.suggested_price!r}, "
+                f"gross_margin={self.gross_margin!r}, tier={self.tier!r})")
+
+class MenuTable:
+    """NumPy 배열 기반 컬럼형 메뉴 테이블"""
+
+    def __init__(self, names: Iterable[str], daily_sales: Iterable[float],
+                 cost_ratio: Iterable[float], stores: Optional[Iterable[str]] = None,
+                 partitions: Optional[Iterable[str]] = None):
+        # 고정 폭 유니코드 배열은 나중에 더 긴 상품명을 대입하면 잘리므로 object 배열로 보관
+        self.names = np.asarray(list(names), dtype=object)
+        self.daily_sales = np.asarray(daily_sales, dtype=float)
+        self.cost_ratio = np.asarray(cost_ratio, dtype=float)
+        if not (len(self.names) == len(self.daily_sales) == len(self.cost_ratio)):
+            raise ValueError("names, daily_sales and cost_ratio must have the same length")
+        self.stores: Optional[np.ndarray] = None
+        if stores is not None:
+            self.stores = np.asarray(list(stores), dtype=object)
+            if len(self.stores) != len(self.names):
+                raise ValueError("stores must have the same length as names")
+        # 같은 매장의 여러 파일(예: 날짜별)을 구분하는 라벨
+        self.partitions: Optional[np.ndarray] = None
+        if partitions is not None:
+            self.partitions = np.asarray(list(partitions), dtype=object)
+            if len(self.partitions) != len(self.names):
+                raise ValueError("partitions must have the same length as names")
+        n = len(self.names)
+        self.suggested_price = np.zeros(n)
+        self.gross_margin = np.zeros(n)
+        self.tier_code = np.zeros(n, dtype=np.int16)
+        self.tier_labels: List[str] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable) -> 'MenuTable':
+        """MenuItem(또는 같은 속성을 가진 객체) 목록으로부터 테이블 생성"""
+        items = list(items)
+        table = cls([item.name for item in items],
+                    [item.daily_sales for item in items],
+                    [item.cost_ratio for item in items])
+        table.suggested_price[:] = [item.suggested_price for item in items]
+        table.gross_margin[:] = [item.gross_margin for item in items]
+        return table
+
+    @classmethod
+    def from_mapping(cls, products: Dict[str, Tuple[float, float]]) -> 'MenuTable':
+        """{상품명: (일평균판매량, 원가율)} 매핑으로부터 테이블 생성"""
+        values = np.array(list(products.values()), dtype=float).reshape(-1, 2)
+        return cls(products.keys(), values[:, 0], values[:, 1])
+
+    @classmethod
+    def from_frame(cls, frame) -> 'MenuTable':
+        """name/daily_sales/cost_ratio(/store/partition) 컬럼을 가진 DataFrame으로부터 테이블 생성
+
+        partition 컬럼은 비어 있지 않은 값이 있을 때만 보관합니다.
+        """
+        stores = frame['store'].astype(str).tolist() if 'store' in frame.columns else None
+        partitions = None
+        if 'partition' in frame.columns and (frame['partition'].fillna('') != '').any():
+            partitions = frame['partition'].fillna('').astype(str).tolist()
+        return cls(frame['name'].astype(str).tolist(),
+                   frame['daily_sales'].to_numpy(dtype=float),
+                   frame['cost_ratio'].to_numpy(dtype=float),
+                   stores=stores, partitions=partitions)
+
+    def copy(self) -> 'MenuTable':
+        """계산 컬럼(제안가/총이익률/가격 구간)을 따로 갖는 복사본 (입력 컬럼은 복사)"""
+        table = MenuTable(self.names, self.daily_sales.copy(), self.cost_ratio.copy(),
+                          stores=self.stores, partitions=self.partitions)
+        table.suggested_price = self.suggested_price.copy()
+        table.gross_margin = self.gross_margin.copy()
+        table.tier_code = self.tier_code.copy()
+        table.tier_labels = list(self.tier_labels)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> MenuItemView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MenuTable index out of range")
+        return MenuItemView(self, index)
+
+    def __iter__(self) -> Iterator[MenuItemView]:
+        return (MenuItemView(self, i) for i in range(len(self)))
+
+    @property
+    def display_names(self) -> List[str]:
+        """출력용 상품명 (여러 매장이면 "매장/상품명", 파티션이 있으면 "매장/파티션/상품명")"""
+        if self.stores is None:
+            return self.names.tolist()
+        prefixes = self.stores.tolist()
+        if self.partitions is not None:
+            prefixes = [f"{store}/{partition}" if partition else store
+                        for store, partition in zip(prefixes, self.partitions.tolist())]
+        return [f"{prefix}/{name}" for prefix, name in zip(prefixes, self.names.tolist())]
+
+    def store_count(self) -> int:
+        """서로 다른 매장 수 (단일 매장 테이블이면 0)"""
+        return 0 if self.stores is None else len(np.unique(self.stores))
+
+    def actual_cost(self, base_cost: float = 1000.0) -> np.ndarray:
+        """기준 원가 × 원가율 (실제 원가 컬럼)"""
+        return base_cost * self.cost_ratio
+
+    def calculate_pricing(self, base_cost: float = 1000.0, ideal_pct: float = 0.30) -> None:
+        """기준 원가를 바탕으로 전체 컬럼의 제안가와 총이익률 계산"""
+        actual_cost = self.actual_cost(base_cost)
+        self.suggested_price = actual_cost / ideal_pct
+        positive = self.suggested_price > 0
+        self.gross_margin = np.zeros(len(self))
+        self.gross_margin[positive] = ((self.suggested_price[positive] - actual_cost[positive])
+                                       / self.suggested_price[positive])
+
+    def categorize_tier(self, tiers: Union[List[float], TierClassifier]) -> None:
+        """가격 구간별 분류 (구간 코드 컬럼과 라벨 표를 갱신)"""
+        classifier = tiers if isinstance(tiers, TierClassifier) else tier_classifier(tiers)
+        self.tier_code = classifier.codes(self.suggested_price).astype(np.int16)
+        self.tier_labels = list(classifier.labels)
+
+    @property
+    def tiers(self) -> List[str]:
+        """행별 가격 구간 라벨"""
+        return [self.tier_labels[code] for code in self.tier_code.tolist()]
+
+    def tier_counts(self) -> Dict[str, int]:
+        """가격 구간별 상품 수 (상품이 있는 구간만)"""
+        counts = np.bincount(self.tier_code, minlength=len(self.tier_labels))
+        return {label: int(count) for label, count in zip(self.tier_labels, counts) if count}
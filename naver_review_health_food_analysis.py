@@ -1,25 +1,43 @@
 """
 네이버 리뷰 기반 건강한 음식 욕구 조사 분석
 네이버 플레이스 리뷰에서 건강한 음식 관련 키워드를 추출하여 분석
+
+사용법:
+    python naver_review_health_food_analysis.py [--reviews reviews.jsonl.gz] [--text-field content]
+        [--workers 32] [--index reviews.db --id-field review_id [--rebuild-index]]
+        [--tokenize --token-cache tokens.db]
+
+--index를 주면 --reviews 파일(매일 들어온 신규/수정 리뷰)만 색인에 반영하고
+누적된 전체 리뷰 기준으로 집계합니다. 키워드 사전(또는 --tokenize 여부)이 바뀌면
+전체 리뷰 이력 파일과 --rebuild-index로 색인을 다시 만들어야 집계합니다.
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-from collections import Counter
-import re
-import requests
-from bs4 import BeautifulSoup
-import time
-import random
+import argparse
+import os
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from chart_rendering import get_pyplot, output_path, save_figure
+from keyword_matcher import KeywordAutomaton, KeywordCounter, keyword_version
+from korean_tokens import (TOKENIZER_VERSION, TokenCache, token_exclusions, token_keywords, tokenized_records,
+                           tokenized_text, tokenized_texts)
+from review_index import IndexVersionError, ReviewIndex
+from review_source import (DEFAULT_ID_FIELD, DEFAULT_TEXT_FIELD, ReviewSource, corpus_fingerprint,
+                           review_records)
 
 class NaverReviewHealthFoodAnalyzer:
-    def __init__(self):
-        """네이버 리뷰 건강한 음식 분석 클래스 초기화"""
+    def __init__(self, reviews=None, workers=1, index=None, tokenize=False, token_cache=None,
+                 rebuild_index=False):
+        """네이버 리뷰 건강한 음식 분석 클래스 초기화
+
+        reviews: 리뷰 본문 목록 또는 ReviewSource 같은 반복 가능한 스트림
+                 (None이면 샘플 리뷰 사용)
+        workers: 키워드 집계에 쓸 프로세스 수 (1이면 현재 프로세스에서 집계,
+                 None이면 CPU 코어 수)
+        index: ReviewIndex를 주면 reviews를 신규/수정분으로 보고 색인에 반영한 뒤
+               색인된 전체 리뷰 기준으로 집계
+        rebuild_index: True면 reviews를 전체 리뷰 이력으로 보고 색인을 비운 뒤 다시 만듦
+        tokenize: True면 원문 부분 문자열 대신 토큰 경계 기준으로 키워드 매칭
+        token_cache: 토큰화 결과를 재사용할 TokenCache (tokenize=True일 때)
+        """
         self.health_keywords = {
             '건강': ['건강', '건강한', '건강식', '건강식품', '건강음식', '건강식단'],
             '집밥': ['집밥', '집밥스타일', '집에서', '가정식', '집에서 만든'],
@@ -32,9 +50,41 @@ class NaverReviewHealthFoodAnalyzer:
             '채소': ['채소', '야채', '채소류', '녹색채소', '신선채소'],
             '단백질': ['단백질', '고단백', '단백질식', '육류', '생선']
         }
+        self._automaton = None
+        
+        # 리뷰 데이터 (지정하지 않으면 실제 네이버 리뷰를 모방한 샘플)
+        self.reviews = self._generate_sample_reviews() if reviews is None else reviews
+        self.workers = workers
+        self.index = index
+        self.tokenize = tokenize
+        self.token_cache = token_cache
+        self.rebuild_index = rebuild_index
         
-        # 샘플 리뷰 데이터 (실제 네이버 리뷰를 모방)
-        self.sample_reviews = self._generate_sample_reviews()
+        # (코퍼스 식별자, 키워드 사전 버전) -> (카테고리별 리뷰 수, 전체 리뷰 수)
+        # 차트/인사이트 등 여러 리포트가 코퍼스를 한 번만 훑도록 공유
+        self._count_cache = {}
+        # 내용으로 식별할 수 없는 코퍼스의 마지막 결과 (reviews 객체, 키, 결과)
+        self._object_count = None
+    
+    @property
+    def keyword_automaton(self):
+        """모든 키워드를 한 번에 찾는 자동자 (키워드 사전이 바뀌면 다시 컴파일)"""
+        if self.tokenize:
+            keywords = token_keywords(self.health_keywords)
+            exclusions = token_exclusions(self.health_keywords)
+            variant = f'tokens-v{TOKENIZER_VERSION}'
+        else:
+            keywords, exclusions, variant = self.health_keywords, None, None
+        version = keyword_version(keywords, exclusions, variant)
+        if self._automaton is None or self._automaton.version != version:
+            self._automaton = KeywordAutomaton(keywords, exclusions, variant)
+        return self._automaton
+    
+    def _matching_texts(self):
+        """자동자에 넣을 리뷰 스트림 (토큰화 모드면 캐시를 거친 토큰 문자열)"""
+        if self.tokenize:
+            return tokenized_texts(self.reviews, self.token_cache)
+        return self.reviews
     
     def _generate_sample_reviews(self):
         """샘플 리뷰 데이터 생성 (실제 네이버 리뷰 패턴 기반)"""
@@ -105,6 +155,71 @@ class NaverReviewHealthFoodAnalyzer:
         
         return sample_reviews
     
+    def count_health_keywords(self):
+        """카테고리별 언급 리뷰 수 계산 (같은 코퍼스와 키워드 사전이면 캐시된 결과 재사용)"""
+        automaton = self.keyword_automaton
+        fingerprint = corpus_fingerprint(self.reviews)
+        key = (fingerprint, automaton.version, None if self.index is None else self.index.path)
+        if fingerprint is None:
+            # 내용으로 식별할 수 없는 코퍼스(제너레이터 등)는 캐시에 쌓지 않고
+            # 지금의 reviews 객체에 대한 결과 하나만 객체 동일성으로 보관
+            last = self._object_count
+            cached = last[2] if last is not None and last[0] is self.reviews and last[1] == key else None
+        else:
+            cached = self._count_cache.get(key)
+        if cached is None:
+            cached = self._count_uncached(automaton)
+            if fingerprint is None:
+                self._object_count = (self.reviews, key, cached)
+            else:
+                self._count_cache[key] = cached
+        keyword_counts, total_reviews = cached
+        return dict(keyword_counts), total_reviews
+    
+    def _count_uncached(self, automaton):
+        """코퍼스를 훑어 (카테고리별 리뷰 수, 전체 리뷰 수) 계산"""
+        if self.index is not None:
+            # 바뀐 리뷰만 스캔해 색인 집계를 조정한 뒤 누적 집계를 읽음
+            records = review_records(self.reviews)
+            if self.tokenize:
+                records = tokenized_records(records, self.token_cache)
+            if self.rebuild_index:
+                update = self.index.rebuild(records, automaton)
+                print(f"리뷰 색인 재구축: {update.processed:,}개 리뷰")
+            else:
+                update = self.index.update(records, automaton)
+                print(f"리뷰 색인 갱신: 신규 {update.added:,}개, 수정 {update.changed:,}개, "
+                      f"변경 없음 {update.unchanged:,}개")
+            return self.index.counts(automaton)
+        # 한 리뷰에서 카테고리당 한 번만 카운트
+        # 리뷰를 한 건씩 흘려보내며 누적하므로 파일 스트림도 메모리에 올리지 않음
+        counter = KeywordCounter(automaton)
+        ranges = self._byte_ranges()
+        if ranges:
+            # 작업 프로세스가 파일 구간을 직접 읽고 파싱/토큰화/스캔까지 수행
+            transform = tokenized_text if self.tokenize else None
+            skipped = counter.update_ranges(self.reviews, ranges, max_workers=self.workers,
+                                            transform=transform)
+            if skipped:
+                print(f"⚠️ {self.reviews.path}: 깨진 JSON 줄 {skipped:,}개를 건너뜀")
+        elif self.workers == 1:
+            counter.update(self._matching_texts())
+        else:
+            counter.update_sharded(self._matching_texts(), max_workers=self.workers)
+        return counter.counts(), counter.total
+    
+    def _byte_ranges(self):
+        """작업 프로세스가 나눠 읽을 파일 구간 (병렬 모드이고 파일을 구간으로 나눌 수 있을 때만)
+
+        토큰 캐시는 부모 프로세스의 SQLite 연결을 거쳐야 하므로 이 경로를 쓰지 않습니다.
+        """
+        if self.workers == 1 or not hasattr(self.reviews, 'byte_ranges'):
+            return None
+        if self.tokenize and self.token_cache is not None:
+            return None
+        # 작업 프로세스당 여러 구간으로 나눠 구간별 처리 시간 차이를 흡수
+        return self.reviews.byte_ranges(4 * (self.workers or os.cpu_count() or 1))
+    
     def analyze_health_keywords(self):
         """건강 관련 키워드 분석"""
         print("=" * 80)
@@ -112,17 +227,9 @@ class NaverReviewHealthFoodAnalyzer:
         print("=" * 80)
         
         # 키워드별 언급 횟수 계산
-        keyword_counts = {}
-        total_reviews = len(self.sample_reviews)
-        
-        for category, keywords in self.health_keywords.items():
-            count = 0
-            for review in self.sample_reviews:
-                for keyword in keywords:
-                    if keyword in review:
-                        count += 1
-                        break  # 한 리뷰에서 한 번만 카운트
-            keyword_counts[category] = count
+        keyword_counts, total_reviews = self.count_health_keywords()
+        if total_reviews == 0:
+            raise ValueError("분석할 리뷰가 없습니다")
         
         print(f"\n📊 분석 결과 (총 {total_reviews}개 리뷰 분석)")
         print("=" * 60)
@@ -134,17 +241,25 @@ class NaverReviewHealthFoodAnalyzer:
         
         return keyword_counts, total_reviews
     
-    def create_health_demand_chart(self):
-        """건강한 음식 욕구 차트 생성"""
-        keyword_counts, total_reviews = self.analyze_health_keywords()
+    def create_health_demand_chart(self, outfile='naver_review_health_food_analysis', verbose=True):
+        """건강한 음식 욕구 차트 생성 (verbose가 거짓이면 분석 결과를 출력하지 않음)"""
+        if verbose:
+            keyword_counts, total_reviews = self.analyze_health_keywords()
+        else:
+            keyword_counts, total_reviews = self.count_health_keywords()
+            if total_reviews == 0:
+                raise ValueError("분석할 리뷰가 없습니다")
+        
+        # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+        plt = get_pyplot()
         
         # 시각화 생성
         fig = plt.figure(figsize=(20, 12))
-        fig.suptitle('네이버 리뷰 기반 건강한 음식 욕구 조사\n(총 30개 리뷰 분석)', 
+        fig.suptitle(f'네이버 리뷰 기반 건강한 음식 욕구 조사\n(총 {total_reviews:,}개 리뷰 분석)', 
                      fontsize=18, fontweight='bold', y=0.95)
         
         # 출처 정보 추가
-        fig.text(0.5, 0.02, '데이터 출처: 네이버 플레이스 리뷰 (2024년 12월 기준) | 분석기간: 2024.12 | 샘플수: 30개 리뷰', 
+        fig.text(0.5, 0.02, f'데이터 출처: 네이버 플레이스 리뷰 (2024년 12월 기준) | 분석기간: 2024.12 | 샘플수: {total_reviews:,}개 리뷰', 
                 ha='center', va='bottom', fontsize=10, style='italic', color='gray')
         
         # 차트 1: 건강 관련 키워드별 언급 빈도 (수평 막대 차트)
@@ -241,8 +356,7 @@ class NaverReviewHealthFoodAnalyzer:
         
         plt.tight_layout()
         plt.subplots_adjust(top=0.92, bottom=0.08, left=0.08, right=0.95, hspace=0.3, wspace=0.3)
-        plt.savefig('naver_review_health_food_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        save_figure(fig, outfile)
         
         return keyword_counts, total_reviews
     
@@ -282,20 +396,73 @@ class NaverReviewHealthFoodAnalyzer:
         
         return keyword_counts, total_reviews
 
-def main():
-    """메인 실행 함수"""
-    analyzer = NaverReviewHealthFoodAnalyzer()
+def _worker_count(value):
+    """--workers 값 (0은 CPU 코어 수, 음수는 오류)"""
+    workers = int(value)
+    if workers < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 (all cores) or a positive number, got {workers}")
+    return workers
+
+def main(argv=None, analyzer=None):
+    """메인 실행 함수
+
+    analyzer를 주면 리뷰 파일/색인/토큰화 옵션이 없을 때(샘플 리뷰 분석) 그 분석기를 재사용합니다.
+    """
+    parser = argparse.ArgumentParser(description="네이버 리뷰 기반 건강한 음식 욕구 조사 분석")
+    parser.add_argument('--reviews', type=str, default=None,
+                        help='리뷰 덤프 파일 (.jsonl/.json/.csv/.txt, .gz 가능). 지정하지 않으면 샘플 리뷰 사용')
+    parser.add_argument('--text-field', type=str, default=DEFAULT_TEXT_FIELD,
+                        help=f'JSONL 키 또는 CSV 컬럼 중 리뷰 본문 필드 (기본 {DEFAULT_TEXT_FIELD})')
+    parser.add_argument('--workers', type=_worker_count, default=1,
+                        help='키워드 집계 프로세스 수 (기본 1, 0이면 CPU 코어 수). '
+                             '압축하지 않은 JSONL/TXT는 작업 프로세스가 파일 구간을 직접 읽고 파싱')
+    parser.add_argument('--index', type=str, default=None,
+                        help='SQLite 리뷰 색인 경로 (신규/수정 리뷰만 반영하고 누적 집계)')
+    parser.add_argument('--id-field', type=str, default=DEFAULT_ID_FIELD,
+                        help=f'JSONL 키 또는 CSV 컬럼 중 리뷰 ID 필드 (기본 {DEFAULT_ID_FIELD})')
+    parser.add_argument('--rebuild-index', action='store_true',
+                        help='색인을 비우고 --reviews(전체 리뷰 이력)로 다시 만듦 (키워드 사전이 바뀐 경우)')
+    parser.add_argument('--tokenize', action='store_true',
+                        help='리뷰를 토큰화해 토큰 경계 기준으로 키워드 매칭 (\'한국\'이 \'국\'으로 잡히지 않음)')
+    parser.add_argument('--token-cache', type=str, default=None,
+                        help='토큰화 결과를 저장/재사용할 SQLite 캐시 경로 (--tokenize와 함께 사용)')
+    args = parser.parse_args(argv)
+    if args.rebuild_index and not (args.index and args.reviews):
+        parser.error("--rebuild-index requires --index and --reviews (the full review history)")
+
+    if args.reviews:
+        reviews = ReviewSource(args.reviews, text_field=args.text_field, id_field=args.id_field)
+    else:
+        # 색인만 있으면 새로 반영할 리뷰 없이 누적 집계만 보고
+        reviews = [] if args.index else None
+    index = ReviewIndex(args.index) if args.index else None
+    token_cache = TokenCache(args.token_cache) if args.tokenize and args.token_cache else None
+    if analyzer is not None and reviews is None and not args.tokenize:
+        # 샘플 리뷰 분석은 공유 분석기의 집계 캐시를 그대로 씀 (--workers는 속도에만 영향)
+        analyzer.workers = args.workers or None
+    else:
+        analyzer = NaverReviewHealthFoodAnalyzer(reviews, workers=args.workers or None, index=index,
+                                                 tokenize=args.tokenize, token_cache=token_cache,
+                                                 rebuild_index=args.rebuild_index)
     
-    # 건강한 음식 욕구 차트 생성
-    keyword_counts, total_reviews = analyzer.create_health_demand_chart()
+    # 건강한 음식 욕구 차트 생성 (ID 없는 리뷰 등 입력 오류는 CLI 오류로 보고)
+    try:
+        keyword_counts, total_reviews = analyzer.create_health_demand_chart()
+    except (ValueError, IndexVersionError) as e:
+        parser.error(str(e))
     
     # 인사이트 생성
     analyzer.generate_insights()
     
     print("\n" + "=" * 80)
     print("✅ 네이버 리뷰 기반 건강한 음식 욕구 조사 완료!")
-    print("📊 시각화 파일: naver_review_health_food_analysis.png")
+    print(f"📊 시각화 파일: {output_path('naver_review_health_food_analysis')}")
     print("=" * 80)
 
+    if index is not None:
+        index.close()
+    if token_cache is not None:
+        token_cache.close()
+
 if __name__ == "__main__":
     main()
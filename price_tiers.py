@@ -0,0 +1,74 @@
+"""
+price_tiers.py
+~~~~~~~~~~~~~~
+
+가격 구간(3,990원/7,990원/9,990원 등) 분류기
+
+구간 경계는 생성 시 한 번만 정렬하고 라벨 문자열도 미리 만들어 둡니다.
+단일 가격은 ``bisect``로, 가격 배열은 ``np.searchsorted``로 분류하므로
+백만 개 가격을 분류해도 벡터 연산 한 번의 비용이 듭니다.
+NumPy는 배열 분류를 처음 할 때 불러오므로 단일 가격만 분류하는 스크립트는 빠르게 시작합니다.
+
+사용법:
+    classifier = TierClassifier([3990, 7990, 9990])
+    classifier.classify(3500)          # '≤3,990원'
+    classifier.codes(prices)           # 구간 코드 배열 (0 ~ len(tiers))
+"""
+
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+class TierClassifier:
+    """정렬된 구간 경계와 캐시된 라벨을 가진 가격 구간 분류기
+
+    구간 코드 i는 ``price <= thresholds[i]``를 만족하는 첫 구간이며,
+    모든 경계를 넘는 가격은 ``len(thresholds)`` 코드를 받습니다.
+    """
+
+    def __init__(self, tiers: Iterable[float]):
+        thresholds = sorted(float(t) for t in tiers)
+        if not thresholds:
+            raise ValueError("at least one price tier is required")
+        self.thresholds: Tuple[float, ...] = tuple(thresholds)
+        self.labels: List[str] = [f"≤{int(t):,}원" for t in thresholds]
+        self.labels.append(f">{int(thresholds[-1]):,}원")
+        self._arrays = None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def code(self, price: float) -> int:
+        """단일 가격의 구간 코드"""
+        return bisect_left(self.thresholds, price)
+
+    def classify(self, price: float) -> str:
+        """단일 가격의 구간 라벨"""
+        return self.labels[bisect_left(self.thresholds, price)]
+
+    def _numpy_arrays(self):
+        """(경계 배열, 라벨 배열) - 배열 분류를 처음 할 때 만듦"""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = (np.asarray(self.thresholds), np.asarray(self.labels, dtype=object))
+        return self._arrays
+
+    def codes(self, prices):
+        """가격 배열의 구간 코드 배열"""
+        return self._numpy_arrays()[0].searchsorted(prices, side='left')
+
+    def label_array(self, codes):
+        """구간 코드 배열을 라벨 배열로 변환"""
+        return self._numpy_arrays()[1][codes]
+
+    def classify_many(self, prices):
+        """가격 배열의 구간 라벨 배열"""
+        return self._numpy_arrays()[1][self.codes(prices)]
+
+@lru_cache(maxsize=32)
+def _cached_classifier(tiers: Tuple[float, ...]) -> TierClassifier:
+    return TierClassifier(tiers)
+
+def tier_classifier(tiers: Iterable[float]) -> TierClassifier:
+    """같은 구간 목록에 대해 재사용되는 분류기를 반환"""
+    return _cached_classifier(tuple(tiers))
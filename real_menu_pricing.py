@@ -7,18 +7,14 @@ Excel 파일의 실제 데이터를 사용하여 원가 분석 및 가격 산정
 """
 
 import argparse
-import pandas as pd
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 
-try:
-    import matplotlib.pyplot as plt
-    # 한글 폰트 설정
-    plt.rcParams['font.family'] = 'Malgun Gothic'
-    plt.rcParams['axes.unicode_minus'] = False
-except Exception:
-    plt = None
+from chart_rendering import (add_render_arguments, apply_render_arguments, optional_pyplot, output_path,
+                             save_figure)
+from menu_table import MenuTable
+from price_tiers import TierClassifier, tier_classifier
 
 @dataclass
 class MenuItem:
@@ -41,16 +37,13 @@ class MenuItem:
         if self.suggested_price > 0:
             self.gross_margin = (self.suggested_price - actual_cost) / self.suggested_price
 
-    def categorize_tier(self, tiers: List[float]) -> None:
+    def categorize_tier(self, tiers: Union[List[float], TierClassifier]) -> None:
         """가격 구간별 분류"""
-        for threshold in sorted(tiers):
-            if self.suggested_price <= threshold:
-                self.tier = f"≤{int(threshold):,}원"
-                return
-        self.tier = f">{int(tiers[-1]):,}원"
+        classifier = tiers if isinstance(tiers, TierClassifier) else tier_classifier(tiers)
+        self.tier = classifier.classify(self.suggested_price)
 
-def load_real_data() -> List[MenuItem]:
-    """실제 상품 데이터를 기반으로 한 데이터"""
+def load_real_data() -> MenuTable:
+    """실제 상품 데이터를 기반으로 한 데이터 (컬럼형 테이블)"""
     # 실제 상품별 원가율 데이터 (Excel에서 추출)
     real_products = {
         '시그니처양념치킨': (82.075, 0.536),
@@ -71,19 +64,13 @@ def load_real_data() -> List[MenuItem]:
         '마늘간장미트볼': (27.225, 0.412),
     }
     
-    menu_items = []
-    for name, (daily_sales, cost_ratio) in real_products.items():
-        menu_item = MenuItem(
-            name=name,
-            daily_sales=daily_sales,
-            cost_ratio=cost_ratio
-        )
-        menu_items.append(menu_item)
-    
-    return menu_items
+    return MenuTable.from_mapping(real_products)
 
-def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: float, base_cost: float) -> None:
+def print_summary(menu_items: Union[MenuTable, List[MenuItem]], tiers: List[float], ideal_pct: float, base_cost: float) -> None:
     """분석 결과 요약 출력"""
+    table = menu_items if isinstance(menu_items, MenuTable) else MenuTable.from_items(menu_items)
+    if not table.tier_labels:
+        table.categorize_tier(tiers)
     print("=" * 100)
     print("🍽️ 실제 상품 데이터 기반 메뉴 가격 분석")
     print("=" * 100)
@@ -92,20 +79,22 @@ def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: flo
     print(f"  • 기준 원가: {base_cost:,.0f}원")
     print(f"  • 식재료비 비율: {ideal_pct*100:.0f}%")
     print(f"  • 목표 총이익률: {(1-ideal_pct)*100:.0f}%")
-    print(f"  • 분석 상품 수: {len(menu_items)}개")
+    print(f"  • 분석 상품 수: {len(table)}개")
     
     print(f"\n📈 상품별 원가율 분석:")
     print(f"{'상품명':<25} {'일평균판매량':<12} {'원가율':<10} {'실제원가':<12} {'제안가':<12} {'총이익률':<10} {'가격구간':<12}")
     print("-" * 100)
     
-    for item in menu_items:
-        actual_cost = base_cost * item.cost_ratio
-        print(f"{item.name:<25} {item.daily_sales:<12.1f} {item.cost_ratio:<10.3f} {actual_cost:<12,.0f} {item.suggested_price:<12,.0f} {item.gross_margin:<10.1%} {item.tier:<12}")
+    rows = zip(table.names.tolist(), table.daily_sales.tolist(), table.cost_ratio.tolist(),
+               table.actual_cost(base_cost).tolist(), table.suggested_price.tolist(),
+               table.gross_margin.tolist(), table.tiers)
+    for name, daily_sales, cost_ratio, actual_cost, suggested_price, gross_margin, tier in rows:
+        print(f"{name:<25} {daily_sales:<12.1f} {cost_ratio:<10.3f} {actual_cost:<12,.0f} {suggested_price:<12,.0f} {gross_margin:<10.1%} {tier:<12}")
     
     # 통계 요약
     print(f"\n📊 통계 요약:")
-    suggested_prices = [item.suggested_price for item in menu_items]
-    gross_margins = [item.gross_margin for item in menu_items]
+    suggested_prices = table.suggested_price
+    gross_margins = table.gross_margin
     
     print(f"  • 평균 제안가: {np.mean(suggested_prices):,.0f}원")
     print(f"  • 최고가: {np.max(suggested_prices):,.0f}원")
@@ -114,31 +103,30 @@ def print_summary(menu_items: List[MenuItem], tiers: List[float], ideal_pct: flo
     
     # 가격 구간별 분포
     print(f"\n💰 가격 구간별 분포:")
-    tier_counts = {}
-    for item in menu_items:
-        tier_counts[item.tier] = tier_counts.get(item.tier, 0) + 1
+    tier_counts = table.tier_counts()
     
     for tier, count in sorted(tier_counts.items()):
-        percentage = (count / len(menu_items)) * 100
+        percentage = (count / len(table)) * 100
         print(f"  • {tier}: {count}개 ({percentage:.1f}%)")
 
-def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile: str = "real_menu_board.png"):
+def generate_menu_board(menu_items: Union[MenuTable, List[MenuItem]], tiers: List[float], outfile: str = "real_menu_board"):
     """실제 메뉴 데이터 기반 메뉴판 시각화"""
+    # 한글 폰트 설정 (공유 렌더링 설정에서 한 번만 적용)
+    plt = optional_pyplot()
     if plt is None:
         return None
     
     # 데이터 준비
-    names = [item.name for item in menu_items]
-    suggested_prices = [item.suggested_price for item in menu_items]
-    categories = [item.tier for item in menu_items]
-    
-    # 색상 정의
-    def _cat_key(cat: str) -> float:
-        digits = ''.join(ch for ch in cat if ch.isdigit())
-        return float(digits) if digits else float('inf')
-    
-    unique_cats = sorted(set(categories), key=_cat_key)
-    colors = plt.cm.get_cmap('Set3', len(unique_cats))
+    table = menu_items if isinstance(menu_items, MenuTable) else MenuTable.from_items(menu_items)
+    if not table.tier_labels:
+        table.categorize_tier(tiers)
+    names = table.names.tolist()
+    suggested_prices = table.suggested_price.tolist()
+    categories = table.tiers
+    
+    # 색상 정의 (구간 코드 순서가 곧 가격 순서)
+    unique_cats = [table.tier_labels[code] for code in np.unique(table.tier_code).tolist()]
+    colors = plt.get_cmap('Set3', len(unique_cats))
     cat_to_colour = {cat: colors(i) for i, cat in enumerate(unique_cats)}
     
     # 그래프 생성
@@ -161,7 +149,7 @@ def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile:
                 f'₩{price:,.0f}', ha='left', va='center', fontsize=9)
     
     # 하단: 총이익률 분석
-    gross_margins = [item.gross_margin * 100 for item in menu_items]
+    gross_margins = (table.gross_margin * 100).tolist()
     bars2 = ax2.barh(y_pos, gross_margins, color=[cat_to_colour[cat] for cat in categories], alpha=0.8)
     
     ax2.set_yticks(y_pos)
@@ -184,13 +172,10 @@ def generate_menu_board(menu_items: List[MenuItem], tiers: List[float], outfile:
     ax1.legend(title='가격 구간', bbox_to_anchor=(1.05, 1), loc='upper left')
     
     plt.tight_layout()
-    plt.savefig(outfile, dpi=300, bbox_inches='tight')
-    plt.show()
-    
-    return outfile
+    return save_figure(fig, outfile)
 
-def main(argv: Optional[List[str]] = None) -> None:
-    """메인 함수"""
+def main(argv: Optional[List[str]] = None, table: Optional[MenuTable] = None) -> None:
+    """메인 함수 (table을 주면 이미 로드한 메뉴 테이블의 복사본에 가격/구간 컬럼을 계산해 사용)"""
     parser = argparse.ArgumentParser(description="실제 상품 데이터 기반 메뉴 가격 분석")
     parser.add_argument('--tiers', type=float, nargs='+', default=[3990, 7990, 9990],
                         help='가격 구간 (원)')
@@ -198,27 +183,32 @@ def main(argv: Optional[List[str]] = None) -> None:
                         help='이상적인 식재료비 비율')
     parser.add_argument('--base_cost', type=float, default=1000.0,
                         help='기준 원가 (원)')
-    parser.add_argument('--board', type=str, default='real_menu_board.png',
-                        help='생성할 메뉴판 이미지 파일명')
+    parser.add_argument('--board', type=str, default='real_menu_board',
+                        help='생성할 메뉴판 이미지 파일명 (확장자로 형식 결정, 없으면 --format/png)')
+    add_render_arguments(parser)
     
     args = parser.parse_args(argv)
+    apply_render_arguments(args)
+    try:
+        output_path(args.board)
+    except ValueError as e:
+        parser.error(str(e))
     
     # 실제 상품 데이터 로드
     print("📁 실제 상품 데이터를 로드합니다...")
-    menu_items = load_real_data()
-    print(f"✅ {len(menu_items)}개 상품 데이터를 읽었습니다.")
+    menu_table = table.copy() if table is not None else load_real_data()
+    print(f"✅ {len(menu_table)}개 상품 데이터를 읽었습니다.")
     
-    # 각 메뉴의 가격 계산
-    for item in menu_items:
-        item.calculate_pricing(args.base_cost, args.ideal_pct)
-        item.categorize_tier(args.tiers)
+    # 전체 메뉴의 가격 계산 (컬럼 단위 연산)
+    menu_table.calculate_pricing(args.base_cost, args.ideal_pct)
+    menu_table.categorize_tier(TierClassifier(args.tiers))
     
     # 결과 출력
-    print_summary(menu_items, args.tiers, args.ideal_pct, args.base_cost)
+    print_summary(menu_table, args.tiers, args.ideal_pct, args.base_cost)
     
     # 메뉴판 생성
     print(f"\n📊 메뉴판 이미지 생성 중...")
-    image_path = generate_menu_board(menu_items, args.tiers, args.board)
+    image_path = generate_menu_board(menu_table, args.tiers, args.board)
     
     if image_path:
         print(f"✅ 메뉴판 이미지 생성 완료: {image_path}")
@@ -0,0 +1,143 @@
+"""
+report_pipeline.py
+~~~~~~~~~~~~~~~~~~
+
+분석 리포트 차트를 프로세스 풀에서 병렬로 생성하는 파이프라인
+
+리포트 하나(고객 설문, 집밥 건강 니즈, 네이버 리뷰)는 큰 다중 서브플롯 그림 하나이므로
+리포트마다 작업 하나로 나눠 동시에 렌더링합니다.
+분석기들은 매장별 데이터를 받지 않으므로 리포트는 한 번씩만 그립니다
+(같은 데이터로 매장 수만큼 같은 그림을 다시 그리지 않음).
+
+병렬도는 리포트 수(현재 3)가 상한이며, 코어가 더 많아도 프로세스를 더 띄우지 않습니다.
+그림 하나의 서브플롯은 같은 Figure에 그려야 하므로 패널 단위로 나누지 않으며,
+분석기가 매장별 데이터를 받게 되면 (리포트, 매장) 작업으로 나눠 코어 수만큼 늘릴 수 있습니다.
+각 작업 프로세스는 헤드리스(Agg) 모드로 폰트 설정을 한 번만 수행하고,
+완료된 결과는 출력 폴더와 ``manifest.json``으로 모읍니다.
+
+사용법:
+    python report_pipeline.py [--reports customer_survey naver_review]
+        [--output-dir reports] [--workers 3] [--dpi 150] [--format webp]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from chart_rendering import SUPPORTED_FORMATS, configure, get_pyplot, output_path
+
+def _render_customer_survey(outfile: str) -> None:
+    from customer_survey_analysis import CustomerSurveyAnalyzer
+    CustomerSurveyAnalyzer().create_visualizations(outfile)
+
+def _render_delivery_ashley(outfile: str) -> None:
+    from delivery_ashley_menu_analysis import DeliveryAshleyMenuAnalyzer
+    DeliveryAshleyMenuAnalyzer().create_health_focused_visualization(outfile)
+
+def _render_naver_review(outfile: str) -> None:
+    from naver_review_health_food_analysis import NaverReviewHealthFoodAnalyzer
+    NaverReviewHealthFoodAnalyzer().create_health_demand_chart(outfile)
+
+# 리포트 이름 -> 렌더링 함수 (작업 프로세스에서 실행되므로 모듈 최상위 함수여야 함)
+REPORTS: Dict[str, Callable[[str], None]] = {
+    'customer_survey': _render_customer_survey,
+    'delivery_ashley': _render_delivery_ashley,
+    'naver_review': _render_naver_review,
+}
+
+@dataclass
+class ReportJob:
+    report: str
+    outfile: str
+
+@dataclass
+class ReportResult:
+    report: str
+    path: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+
+def _init_worker(dpi: Optional[int], fmt: Optional[str]) -> None:
+    """작업 프로세스 초기화: 헤드리스 렌더링 설정과 폰트 설정을 한 번만 수행"""
+    configure(dpi=dpi, fmt=fmt, headless=True)
+    get_pyplot()
+
+def _run_job(job: ReportJob) -> ReportResult:
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(job.outfile) or '.', exist_ok=True)
+    try:
+        # 분석기의 콘솔 출력은 병렬 실행 시 뒤섞이므로 버림
+        with contextlib.redirect_stdout(io.StringIO()):
+            REPORTS[job.report](job.outfile)
+    except Exception as e:
+        return ReportResult(job.report, None, time.perf_counter() - start,
+                            f"{type(e).__name__}: {e}")
+    return ReportResult(job.report, output_path(job.outfile), time.perf_counter() - start)
+
+def plan_jobs(reports: List[str], output_dir: str) -> List[ReportJob]:
+    """리포트마다 하나씩인 작업 목록 (중복 리포트는 한 번만)"""
+    unknown = [name for name in reports if name not in REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    return [ReportJob(report, os.path.join(output_dir, report)) for report in dict.fromkeys(reports)]
+
+def render_reports(reports: Optional[List[str]] = None, output_dir: str = 'reports',
+                   max_workers: Optional[int] = None, dpi: Optional[int] = None,
+                   fmt: Optional[str] = None) -> List[ReportResult]:
+    """모든 작업을 프로세스 풀에서 렌더링하고 manifest.json으로 결과를 모음
+
+    작업 수(리포트 수)보다 많은 프로세스는 띄우지 않으므로 병렬도는 리포트 수가 상한입니다.
+    """
+    jobs = plan_jobs(reports or list(REPORTS), output_dir)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    results: List[ReportResult] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dpi, fmt)) as pool:
+        futures = [pool.submit(_run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+    order = {job.report: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda result: order[result.report])
+    write_manifest(results, output_dir)
+    return results
+
+def write_manifest(results: List[ReportResult], output_dir: str) -> str:
+    """리포트별 결과 경로를 모은 manifest.json 작성"""
+    manifest: Dict[str, dict] = {result.report: asdict(result) for result in results}
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, 'manifest.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="분석 리포트 병렬 생성")
+    parser.add_argument('--reports', nargs='+', choices=list(REPORTS), default=None,
+                        help='생성할 리포트 (기본: 전체)')
+    parser.add_argument('--output-dir', type=str, default='reports', help='출력 폴더')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='프로세스 수 (기본: CPU 코어 수, 리포트 수가 상한)')
+    parser.add_argument('--dpi', type=int, default=None, help='이미지 해상도 (기본 300)')
+    parser.add_argument('--format', dest='chart_format', choices=SUPPORTED_FORMATS, default=None,
+                        help='이미지 형식 (기본 png)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = render_reports(args.reports, args.output_dir, args.workers,
+                             dpi=args.dpi, fmt=args.chart_format)
+    failed = [result for result in results if result.error]
+    for result in results:
+        status = result.path if result.error is None else f"실패 - {result.error}"
+        print(f"  • {result.report}: {status} ({result.seconds:.1f}초)")
+    print(f"\n✅ {len(results) - len(failed)}/{len(results)}개 리포트 생성 완료 "
+          f"({time.perf_counter() - start:.1f}초)")
+    print(f"📄 결과 목록: {os.path.join(args.output_dir, 'manifest.json')}")
+
+if __name__ == '__main__':
+    main()
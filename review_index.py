@@ -0,0 +1,234 @@
+"""
+review_index.py
+~~~~~~~~~~~~~~~
+
+리뷰 ID별 키워드 카테고리 비트마스크를 보관하는 SQLite 증분 색인
+
+리뷰마다 (리뷰 ID, 본문 해시, 카테고리 비트마스크)를 저장하고,
+비트마스크별 리뷰 수 집계표를 함께 갱신합니다.
+매일 새로 들어온 리뷰나 수정된 리뷰만 넣으면 바뀐 행의 집계만 조정되므로
+천만 건 규모의 누적 이력도 전체를 다시 훑지 않고 최신 카테고리별 리뷰 수를 얻을 수 있습니다.
+
+색인에는 키워드 사전 버전이 기록되며, 사전이 바뀌면 저장된 비트마스크가 무효입니다.
+이때 ``update``/``counts``는 색인을 몰래 비우지 않고 ``IndexVersionError``를 내며,
+전체 리뷰 이력으로 ``rebuild``를 끝까지 마쳐야 다시 집계할 수 있습니다 (리뷰 본문은 저장하지 않음).
+
+사용법:
+    with ReviewIndex('reviews.db') as index:
+        index.update(source.records(), automaton)     # 신규/수정 리뷰만 반영
+        counts = index.counts(automaton)
+
+        index.rebuild(full_history.records(), automaton)   # 키워드 사전이 바뀐 뒤 전체 재구축
+"""
+
+import hashlib
+import sqlite3
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from keyword_matcher import KeywordAutomaton
+
+# 한 트랜잭션에서 처리하는 리뷰 수
+DEFAULT_BATCH_SIZE = 5000
+
+# SQLite 바인딩 변수 수 제한을 넘지 않도록 IN 조회를 나누는 크기
+_LOOKUP_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id    TEXT PRIMARY KEY,
+    content_hash BLOB NOT NULL,
+    mask         INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS mask_counts (
+    mask INTEGER PRIMARY KEY,
+    n    INTEGER NOT NULL
+);
+"""
+
+def content_hash(text: str) -> bytes:
+    """리뷰 본문의 128비트 해시 (수정 여부 판별용)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+class IndexVersionError(RuntimeError):
+    """색인이 현재 키워드 사전으로 만들어지지 않아(또는 재구축이 끝나지 않아) 집계를 믿을 수 없음"""
+
+@dataclass
+class IndexUpdate:
+    """한 번의 색인 갱신 결과"""
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.added + self.changed + self.unchanged
+
+class ReviewIndex:
+    """리뷰 ID → 카테고리 비트마스크 색인과 비트마스크별 리뷰 수 집계"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'ReviewIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @property
+    def keyword_version(self) -> Optional[str]:
+        """색인을 만든 키워드 사전 버전"""
+        return self._meta('keyword_version')
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def rebuild_pending(self) -> bool:
+        """재구축을 시작했지만 끝내지 못한 색인인지"""
+        return self._meta('rebuild_pending') == '1'
+
+    def check_version(self, automaton: KeywordAutomaton) -> None:
+        """색인이 현재 키워드 사전으로 완전히 만들어졌는지 확인
+
+        비어 있는 새 색인에는 현재 사전 버전을 기록합니다. 버전이 다르거나 재구축이 끝나지 않았으면
+        IndexVersionError를 내며, 색인은 건드리지 않습니다.
+        """
+        version = self.keyword_version
+        if version is None and self.conn.execute("SELECT 1 FROM reviews LIMIT 1").fetchone() is None:
+            with self.conn:
+                self._set_meta('keyword_version', automaton.version)
+            return
+        if version != automaton.version:
+            raise IndexVersionError(
+                f"review index {self.path} was built with a different keyword dictionary "
+                f"({version} != {automaton.version}); rebuild it from the full review history")
+        if self.rebuild_pending:
+            raise IndexVersionError(f"review index {self.path} rebuild did not finish; "
+                                    f"rebuild it again from the full review history")
+
+    def _lookup(self, review_ids: List[str]) -> Dict[str, Tuple[bytes, int]]:
+        existing = {}
+        for start in range(0, len(review_ids), _LOOKUP_SIZE):
+            chunk = review_ids[start:start + _LOOKUP_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT review_id, content_hash, mask FROM reviews WHERE review_id IN ({placeholders})",
+                chunk)
+            existing.update((review_id, (digest, mask)) for review_id, digest, mask in rows)
+        return existing
+
+    def _apply_batch(self, batch: Dict[str, str], automaton: KeywordAutomaton,
+                     result: IndexUpdate) -> None:
+        existing = self._lookup(list(batch))
+        upserts = []
+        delta: Counter = Counter()
+        for review_id, text in batch.items():
+            digest = content_hash(text)
+            previous = existing.get(review_id)
+            if previous is not None and previous[0] == digest:
+                result.unchanged += 1
+                continue
+            mask = automaton.scan(text)
+            if previous is None:
+                result.added += 1
+            else:
+                result.changed += 1
+                delta[previous[1]] -= 1
+            delta[mask] += 1
+            upserts.append((review_id, digest, mask))
+        if not upserts:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO reviews (review_id, content_hash, mask) VALUES (?, ?, ?) "
+                "ON CONFLICT(review_id) DO UPDATE SET content_hash = excluded.content_hash, "
+                "mask = excluded.mask",
+                upserts)
+            self.conn.executemany(
+                "INSERT INTO mask_counts (mask, n) VALUES (?, ?) "
+                "ON CONFLICT(mask) DO UPDATE SET n = n + excluded.n",
+                [(mask, n) for mask, n in delta.items() if n])
+
+    def update(self, records: Iterable[Tuple[str, str]], automaton: KeywordAutomaton,
+               batch_size: int = DEFAULT_BATCH_SIZE) -> IndexUpdate:
+        """(리뷰 ID, 본문) 스트림 중 신규/수정된 리뷰만 색인과 집계에 반영
+
+        본문 해시가 같은 리뷰는 다시 스캔하지 않습니다.
+        같은 ID가 여러 번 나오면 마지막 본문이 적용됩니다.
+        색인이 다른 키워드 사전으로 만들어졌으면 IndexVersionError입니다.
+        """
+        self.check_version(automaton)
+        return self._update(records, automaton, batch_size)
+
+    def rebuild(self, records: Iterable[Tuple[str, str]], automaton: KeywordAutomaton,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> IndexUpdate:
+        """색인을 비우고 전체 리뷰 이력을 현재 키워드 사전으로 다시 넣음
+
+        records가 끝까지 반영되어야 재구축이 완료되며, 도중에 실패하면
+        다시 rebuild할 때까지 update/counts가 IndexVersionError를 냅니다.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM reviews')
+            self.conn.execute('DELETE FROM mask_counts')
+            self._set_meta('keyword_version', automaton.version)
+            self._set_meta('rebuild_pending', '1')
+        result = self._update(records, automaton, batch_size)
+        with self.conn:
+            self.conn.execute("DELETE FROM meta WHERE key = 'rebuild_pending'")
+        return result
+
+    def _update(self, records: Iterable[Tuple[str, str]], automaton: KeywordAutomaton,
+                batch_size: int) -> IndexUpdate:
+        result = IndexUpdate()
+        batch: Dict[str, str] = {}
+        for review_id, text in records:
+            batch[review_id] = text
+            if len(batch) >= batch_size:
+                self._apply_batch(batch, automaton, result)
+                batch = {}
+        if batch:
+            self._apply_batch(batch, automaton, result)
+        return result
+
+    def remove(self, review_ids: Iterable[str]) -> int:
+        """삭제된 리뷰를 색인과 집계에서 제거하고 제거한 수를 반환"""
+        review_ids = list(dict.fromkeys(review_ids))
+        existing = self._lookup(review_ids)
+        if not existing:
+            return 0
+        delta = Counter(mask for _, mask in existing.values())
+        with self.conn:
+            self.conn.executemany("DELETE FROM reviews WHERE review_id = ?",
+                                  [(review_id,) for review_id in existing])
+            self.conn.executemany("UPDATE mask_counts SET n = n - ? WHERE mask = ?",
+                                  [(n, mask) for mask, n in delta.items()])
+        return len(existing)
+
+    def mask_counter(self) -> Counter:
+        """{비트마스크: 리뷰 수} 집계"""
+        rows = self.conn.execute("SELECT mask, n FROM mask_counts WHERE n > 0")
+        return Counter(dict(rows.fetchall()))
+
+    def counts(self, automaton: KeywordAutomaton) -> Tuple[Dict[str, int], int]:
+        """(카테고리별 리뷰 수, 색인된 전체 리뷰 수) (사전 버전이 다르면 IndexVersionError)"""
+        self.check_version(automaton)
+        mask_counter = self.mask_counter()
+        return automaton.mask_counts(mask_counter), sum(mask_counter.values())
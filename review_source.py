@@ -0,0 +1,302 @@
+"""
+review_source.py
+~~~~~~~~~~~~~~~~
+
+리뷰 덤프 파일을 한 건씩 읽어 들이는 스트리밍 소스
+
+수 GB 규모의 JSONL/CSV/텍스트 덤프(.gz 압축 포함)를 메모리에 올리지 않고
+파일 열기 → 줄 읽기 → 레코드 파싱 → 본문 추출의 제너레이터 파이프라인으로 처리합니다.
+``ReviewSource``는 반복할 때마다 파일을 처음부터 다시 읽으므로 여러 번 순회할 수 있습니다.
+
+지원 형식 (확장자로 판별, 뒤에 .gz가 붙어도 됨):
+    .jsonl / .ndjson   한 줄에 JSON 객체 하나, text_field 키의 값이 리뷰 본문
+    .json              JSON 객체 배열 (배열 전체를 한 번에 파싱, 배열이 아니면 JSONL로 읽음)
+    .csv               헤더가 있는 CSV, text_field 컬럼이 리뷰 본문
+    .txt               한 줄에 리뷰 하나
+
+깨진 JSONL 줄은 건너뛰되 ``ReviewSource.stats``에 개수와 줄 번호를 남기고 순회가 끝나면 알려 줍니다.
+max_skipped를 주면 깨진 줄이 그보다 많을 때 ValueError로 중단합니다.
+
+``records()``는 증분 색인에 넣을 (리뷰 ID, 본문) 쌍을 돌려줍니다. ID는 id_field 값이며,
+파일 안의 순번은 매일 들어오는 파일마다 다시 0부터 시작해 다른 리뷰와 겹치므로 ID로 쓰지 않습니다.
+ID가 없거나 빈 레코드, ID가 없는 텍스트 파일은 ValueError입니다.
+
+사용법:
+    source = ReviewSource('reviews.jsonl.gz', text_field='content')
+    for review in source:
+        ...
+"""
+
+import csv
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+DEFAULT_TEXT_FIELD = 'text'
+
+DEFAULT_ID_FIELD = 'id'
+
+SUPPORTED_FORMATS = ('jsonl', 'json', 'csv', 'txt')
+
+_FORMAT_ALIASES = {'jsonl': 'jsonl', 'ndjson': 'jsonl', 'json': 'json', 'csv': 'csv', 'txt': 'txt'}
+
+# 보고할 때 보여 주는 깨진 줄 번호 수
+_SKIPPED_LINES_SHOWN = 10
+
+def detect_format(path: str) -> str:
+    """파일 확장자(.gz 제외)로 리뷰 파일 형식 판별"""
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = os.path.splitext(name)[1].lstrip('.').lower()
+    if ext not in _FORMAT_ALIASES:
+        raise ValueError(f"Unsupported review file '{path}' "
+                         f"(expected .jsonl, .json, .csv or .txt, optionally .gz)")
+    return _FORMAT_ALIASES[ext]
+
+def open_text(path: str, encoding: str = 'utf-8') -> TextIO:
+    """gzip 여부에 맞게 텍스트 모드로 파일 열기 (BOM 허용)"""
+    if encoding.lower().replace('-', '') == 'utf8':
+        encoding = 'utf-8-sig'
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding=encoding, newline='')
+    return open(path, 'r', encoding=encoding, newline='')
+
+@dataclass
+class ParseStats:
+    """한 번 읽는 동안 건너뛴 깨진 줄 통계 (max_skipped를 넘으면 ValueError)"""
+    max_skipped: Optional[int] = None
+    skipped: int = 0
+    skipped_lines: List[int] = field(default_factory=list)
+
+    def skip(self, line_number: int) -> None:
+        self.skipped += 1
+        if len(self.skipped_lines) < _SKIPPED_LINES_SHOWN:
+            self.skipped_lines.append(line_number)
+        if self.max_skipped is not None and self.skipped > self.max_skipped:
+            raise ValueError(f"more than {self.max_skipped} malformed JSON lines "
+                             f"(first at line {self.skipped_lines[0]})")
+
+    def summary(self) -> str:
+        shown = ', '.join(str(number) for number in self.skipped_lines)
+        more = " 등" if self.skipped > len(self.skipped_lines) else ""
+        return f"깨진 JSON 줄 {self.skipped:,}개를 건너뜀 (줄 {shown}{more})"
+
+def iter_json_records(lines: Iterable[str], stats: Optional[ParseStats] = None) -> Iterator[Dict[str, Any]]:
+    """JSONL 줄을 객체로 파싱 (빈 줄은 건너뛰고, 깨진 줄은 stats에 기록한 뒤 건너뜀)"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            if stats is not None:
+                stats.skip(line_number)
+            continue
+        if isinstance(record, dict):
+            yield record
+
+def iter_json_array_records(f: TextIO, stats: Optional[ParseStats] = None) -> Iterator[Dict[str, Any]]:
+    """JSON 배열 파일의 객체 (배열 전체를 메모리에 올려 파싱, 첫 글자가 '['가 아니면 JSONL로 읽음)"""
+    head = f.read(1)
+    while head.isspace():
+        head = f.read(1)
+    if head != '[':
+        yield from iter_json_records(itertools.chain([head + f.readline()], f), stats)
+        return
+    for record in json.loads(head + f.read()):
+        if isinstance(record, dict):
+            yield record
+
+def iter_csv_records(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """헤더가 있는 CSV 줄을 행 딕셔너리로 파싱"""
+    # 리뷰 본문이 길어도 잘리지 않도록 필드 크기 제한을 늘림
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    return csv.DictReader(lines)
+
+def iter_texts(records: Iterable[Dict[str, Any]], text_field: str) -> Iterator[str]:
+    """레코드에서 비어 있지 않은 리뷰 본문만 추출"""
+    for record in records:
+        text = record.get(text_field)
+        if isinstance(text, str) and text.strip():
+            yield text
+
+def iter_id_texts(records: Iterable[Dict[str, Any]], text_field: str,
+                  id_field: str) -> Iterator[Tuple[str, str]]:
+    """레코드에서 (리뷰 ID, 본문) 추출 (본문이 있는데 ID가 없거나 비어 있으면 ValueError)"""
+    for position, record in enumerate(records):
+        text = record.get(text_field)
+        if isinstance(text, str) and text.strip():
+            review_id = record.get(id_field)
+            if review_id is None or str(review_id).strip() == '':
+                raise ValueError(f"review record #{position + 1} has no '{id_field}' value "
+                                 f"(set the review ID field with --id-field)")
+            yield str(review_id), text
+
+def iter_lines(lines: Iterable[str]) -> Iterator[str]:
+    """텍스트 파일의 비어 있지 않은 줄 (줄바꿈 제거)"""
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.strip():
+            yield line
+
+class ReviewSource:
+    """여러 번 순회할 수 있는 파일 기반 리뷰 스트림"""
+
+    def __init__(self, path: str, text_field: str = DEFAULT_TEXT_FIELD,
+                 fmt: Optional[str] = None, encoding: str = 'utf-8',
+                 id_field: str = DEFAULT_ID_FIELD, max_skipped: Optional[int] = None):
+        self.path = path
+        self.text_field = text_field
+        self.id_field = id_field
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported review format '{self.fmt}'")
+        self.encoding = encoding
+        self.max_skipped = max_skipped
+        self.stats = ParseStats(max_skipped)   # 마지막 순회의 파싱 통계
+
+    def _parse(self, f: TextIO) -> Iterator[Dict[str, Any]]:
+        """형식에 맞는 레코드 스트림 (순회마다 파싱 통계를 새로 기록)"""
+        self.stats = ParseStats(self.max_skipped)
+        if self.fmt == 'csv':
+            return iter_csv_records(f)
+        if self.fmt == 'json':
+            return iter_json_array_records(f, self.stats)
+        return iter_json_records(f, self.stats)
+
+    def _report_skipped(self) -> None:
+        if self.stats.skipped:
+            print(f"⚠️ {self.path}: {self.stats.summary()}")
+
+    def __iter__(self) -> Iterator[str]:
+        with open_text(self.path, self.encoding) as f:
+            if self.fmt == 'txt':
+                yield from iter_lines(f)
+            else:
+                yield from iter_texts(self._parse(f), self.text_field)
+                self._report_skipped()
+
+    def records(self) -> Iterator[Tuple[str, str]]:
+        """(리뷰 ID, 본문) 스트림"""
+        with open_text(self.path, self.encoding) as f:
+            if self.fmt != 'txt':
+                yield from iter_id_texts(self._parse(f), self.text_field, self.id_field)
+                self._report_skipped()
+            else:
+                raise ValueError(f"{self.path}: text files have no review IDs "
+                                 f"(use JSONL/CSV with an ID field for the review index)")
+
+    def byte_ranges(self, parts: int) -> Optional[List[Tuple[int, int]]]:
+        """줄 경계에 맞춘 [시작, 끝) 바이트 구간 최대 parts개 (작업 프로세스가 나눠 읽을 단위)
+
+        gzip은 임의 위치부터 읽을 수 없고, CSV는 따옴표 안에 줄바꿈이 올 수 있으며,
+        JSON 배열은 파일 전체가 값 하나이므로 None입니다.
+        """
+        if self.path.endswith('.gz') or self.fmt not in ('jsonl', 'txt'):
+            return None
+        size = os.path.getsize(self.path)
+        bounds = [0]
+        with open(self.path, 'rb') as f:
+            for part in range(1, parts):
+                # 목표 위치 바로 앞에서 줄 끝까지 읽으면 다음 위치가 줄 시작
+                f.seek(max(size * part // parts - 1, bounds[-1]))
+                f.readline()
+                bounds.append(min(f.tell(), size))
+        bounds.append(size)
+        return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    def read_range(self, start: int, end: int) -> Iterator[str]:
+        """byte_ranges 구간 하나의 리뷰 본문 (구간 안에서 시작하는 줄만 읽음)
+
+        JSONL의 깨진 줄은 stats에 구간 안 줄 번호로 기록됩니다.
+        """
+        encoding = self.encoding
+        if encoding.lower().replace('-', '') == 'utf8':
+            encoding = 'utf-8-sig'
+
+        def lines() -> Iterator[str]:
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                position = start
+                for raw in f:
+                    if position >= end:
+                        return
+                    position += len(raw)
+                    yield raw.decode(encoding)
+
+        self.stats = ParseStats(self.max_skipped)
+        if self.fmt == 'txt':
+            yield from iter_lines(lines())
+        else:
+            yield from iter_texts(iter_json_records(lines(), self.stats), self.text_field)
+
+    def fingerprint(self) -> Hashable:
+        """파일 경로/크기/수정 시각과 읽기 설정으로 만든 코퍼스 식별자"""
+        stat = os.stat(self.path)
+        return ('file', os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns,
+                self.fmt, self.text_field)
+
+    def __repr__(self) -> str:
+        return f"ReviewSource({self.path!r}, text_field={self.text_field!r}, fmt={self.fmt!r})"
+
+def _digest_value(digest, value: Any) -> bool:
+    """값을 형식 표시와 길이를 앞에 붙여 digest에 넣음 (문자열/정수/그 쌍이 아니면 False)"""
+    if isinstance(value, str):
+        data = value.encode('utf-8', 'surrogatepass')
+        tag = b's'
+    elif isinstance(value, int) and not isinstance(value, bool):
+        data = str(value).encode('ascii')
+        tag = b'i'
+    elif isinstance(value, (tuple, list)):
+        digest.update(b't' + len(value).to_bytes(8, 'little'))
+        return all(isinstance(item, (str, int)) and _digest_value(digest, item) for item in value)
+    else:
+        return False
+    digest.update(tag + len(data).to_bytes(8, 'little'))
+    digest.update(data)
+    return True
+
+def corpus_fingerprint(reviews: Iterable[str]) -> Optional[Hashable]:
+    """결과 캐시 키로 쓰는 코퍼스 식별자 (내용으로 식별할 수 없으면 None)
+
+    파일 소스는 파일 메타데이터로 식별합니다. 리스트/튜플이나 pandas Series처럼 길이가 있고
+    여러 번 순회할 수 있는 컬렉션은 길이를 앞에 붙인 리뷰들의 128비트 BLAKE2b 내용 해시로 식별하며,
+    복사본 없이 한 번 순회하며 계산합니다 (호출할 때마다 전체를 다시 해시).
+    한 번만 순회되는 반복 객체(제너레이터 등)나 문자열/(ID, 본문) 쌍이 아닌 값이 든 컬렉션은 None입니다.
+    """
+    if hasattr(reviews, 'fingerprint'):
+        return reviews.fingerprint()
+    if not hasattr(reviews, '__len__') or iter(reviews) is reviews:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    count = 0
+    for review in reviews:
+        if not _digest_value(digest, review):
+            return None
+        count += 1
+    return ('sequence', count, digest.hexdigest())
+
+def review_records(reviews: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """(리뷰 ID, 본문) 스트림
+
+    records()가 없는 반복 객체는 (리뷰 ID, 본문) 쌍을 담고 있어야 하며,
+    본문 문자열만 있으면 ValueError입니다 (순번은 ID로 쓰지 않음).
+    """
+    if hasattr(reviews, 'records'):
+        return reviews.records()
+    return _pair_records(reviews)
+
+def _pair_records(reviews: Iterable[Any]) -> Iterator[Tuple[str, str]]:
+    for position, item in enumerate(reviews):
+        if isinstance(item, str) or not isinstance(item, (tuple, list)) or len(item) != 2:
+            raise ValueError(f"review #{position + 1} is not a (review ID, text) pair; "
+                             f"the review index needs explicit review IDs")
+        review_id, text = item
+        if review_id is None or str(review_id).strip() == '':
+            raise ValueError(f"review #{position + 1} has an empty review ID")
+        yield str(review_id), text
@@ -0,0 +1,243 @@
+"""
+sales_workbook.py
+~~~~~~~~~~~~~~~~~
+
+상품별 판매 데이터 Excel 파일을 정규화된 상품 테이블로 읽는 모듈
+
+시트를 한 번 읽은 뒤 데이터 블록(3행부터)을 통째로 잘라내고,
+``pd.to_numeric``과 불리언 마스크로 컬럼 단위 변환과 필터링을 수행합니다.
+행 단위 ``iloc`` 루프나 상품별 출력이 없으므로 10만 행 규모의 시트도 빠르게 처리됩니다.
+
+정규화된 테이블 컬럼:
+    name          상품명 (첫 번째 열)
+    daily_sales   일평균판매량 (두 번째 열, 비어 있으면 0)
+    cost_ratio    원가율 (마지막 열)
+
+파싱 결과는 파일 내용의 SHA-256 해시를 키로 Feather 캐시에 저장하며,
+같은 파일을 다시 읽을 때는 Excel 파싱 없이 메모리 매핑으로 불러옵니다 (pyarrow 필요).
+
+매장별 파일이 여러 개면 ``load_sales_frames``가 프로세스 풀에서 병렬로 파싱한 뒤
+``store``(매장)와 ``partition``(예: 날짜 폴더) 컬럼을 붙여 하나의 상품 테이블로 합칩니다.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+# 시트 상단의 제목/헤더 행을 건너뛰고 데이터가 시작되는 행 번호
+DATA_START_ROW = 3
+
+SALES_COLUMNS = ['name', 'daily_sales', 'cost_ratio']
+
+DEFAULT_CACHE_DIR = '.sales_cache'
+
+# 정규화 규칙이 바뀌면 값을 올려 기존 캐시를 무효화합니다
+CACHE_VERSION = 1
+
+def excel_engine() -> Optional[str]:
+    """사용 가능한 가장 빠른 read_excel 엔진 (calamine이 없으면 pandas 기본값)"""
+    try:
+        import python_calamine  # noqa: F401  (pandas 2.2+의 engine='calamine')
+    except ImportError:
+        return None
+    return 'calamine'
+
+def normalize_sales_frame(raw: pd.DataFrame) -> Tuple[pd.DataFrame, List[int]]:
+    """헤더 없이 읽은 시트를 정규화된 상품 테이블로 변환
+
+    반환값은 (상품 테이블, 숫자 변환에 실패한 원본 행 번호 목록)입니다.
+    상품명이나 원가율이 비어 있는 행, 원가율이 0 이하인 행은 오류 없이 제외됩니다.
+    """
+    if raw.shape[1] < 2:
+        return pd.DataFrame(columns=SALES_COLUMNS), []
+    block = raw.iloc[DATA_START_ROW:]
+    names = block.iloc[:, 0]
+    sales_raw = block.iloc[:, 1]
+    ratio_raw = block.iloc[:, -1]
+
+    present = names.notna() & ratio_raw.notna()
+    daily_sales = pd.to_numeric(sales_raw, errors='coerce')
+    cost_ratio = pd.to_numeric(ratio_raw, errors='coerce')
+    # 값은 있는데 숫자로 변환되지 않은 행
+    rejected = present & (cost_ratio.isna() | (sales_raw.notna() & daily_sales.isna()))
+
+    names = names.astype(str).str.strip()
+    valid = present & ~rejected & (names != '') & (cost_ratio > 0)
+    frame = pd.DataFrame({
+        'name': names[valid],
+        'daily_sales': daily_sales[valid].fillna(0.0).astype(float),
+        'cost_ratio': cost_ratio[valid].astype(float),
+    }).reset_index(drop=True)
+    return frame, block.index[rejected].tolist()
+
+def read_sales_frame(file_path: str, engine: Optional[str] = None) -> Tuple[pd.DataFrame, List[int]]:
+    """Excel 파일을 읽어 (정규화된 상품 테이블, 변환 실패 행 번호 목록) 반환"""
+    raw = pd.read_excel(file_path, header=None, engine=engine or excel_engine())
+    return normalize_sales_frame(raw)
+
+def report_rejected_rows(rejected: List[int], limit: int = 10) -> None:
+    """변환에 실패한 행을 한 번에 요약 출력"""
+    if not rejected:
+        return
+    shown = ', '.join(str(i) for i in rejected[:limit])
+    more = f" 외 {len(rejected) - limit}개" if len(rejected) > limit else ""
+    print(f"데이터 처리 오류: {len(rejected)}개 행 제외 (행 {shown}{more})")
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_path(file_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """파일 내용에 대응하는 Feather 캐시 경로"""
+    return os.path.join(cache_dir, f"{file_digest(file_path)}-v{CACHE_VERSION}.feather")
+
+def _write_cache(path: str, frame: pd.DataFrame, rejected: List[int]) -> None:
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'rejected_rows'] = json.dumps(rejected).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # 메모리 매핑이 가능하도록 비압축으로 저장한 뒤 원자적으로 교체
+    # (쓰기나 교체가 어떤 이유로든 실패하면 임시 파일을 남기지 않음)
+    try:
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _read_cache(path: str) -> Tuple[pd.DataFrame, List[int]]:
+    table = feather.read_table(path, memory_map=True)
+    metadata = table.schema.metadata or {}
+    rejected = json.loads(metadata.get(b'rejected_rows', b'[]'))
+    return table.to_pandas(), rejected
+
+def load_sales_frame(file_path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                     engine: Optional[str] = None) -> Tuple[pd.DataFrame, List[int]]:
+    """캐시를 거쳐 정규화된 상품 테이블 읽기
+
+    cache_dir가 None이거나 pyarrow가 없으면 매번 Excel을 파싱합니다.
+    """
+    if cache_dir is None or feather is None:
+        return read_sales_frame(file_path, engine=engine)
+    path = cache_path(file_path, cache_dir)
+    if os.path.exists(path):
+        try:
+            frame, rejected = _read_cache(path)
+            print(f"캐시에서 읽기: {path}")
+            return frame, rejected
+        except (OSError, ValueError, pa.ArrowException) as e:
+            print(f"캐시 읽기 실패, Excel을 다시 읽습니다: {e}")
+    frame, rejected = read_sales_frame(file_path, engine=engine)
+    try:
+        _write_cache(path, frame, rejected)
+    except (OSError, ValueError, pa.ArrowException) as e:
+        print(f"캐시 저장 실패: {e}")
+    return frame, rejected
+
+def expand_workbook_glob(pattern: str) -> List[str]:
+    """glob 패턴에 맞는 Excel 파일 목록 (정렬, ** 재귀 지원)"""
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+def store_partitions(paths: List[str], pattern: Optional[str] = None) -> List[Tuple[str, str]]:
+    """파일 경로별 (매장, 파티션) 라벨
+
+    pattern이 있으면 '/'로 구분한 경로에서 정규식의 이름 그룹 ``store``(필수)와
+    ``partition``(선택, 예: 날짜)을 찾습니다 (예: r"stores/(?P<store>[^/]+)/(?P<partition>[^/]+)/").
+    없으면 공통 상위 폴더 아래 첫 번째 폴더를 매장, 나머지 폴더 경로를 파티션으로 씁니다
+    (예: "강남점/2025-09-24/상품별 판매 데이터.xlsx" → ("강남점", "2025-09-24")).
+    모든 파일이 같은 폴더에 있으면 파일이 여러 개일 때는 확장자를 뺀 파일명,
+    하나뿐일 때는 그 파일이 있는 폴더 이름을 매장으로 씁니다.
+    """
+    if not paths:
+        return []
+    if pattern is not None:
+        try:
+            regex = re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"invalid store pattern {pattern!r}: {e}") from None
+        if 'store' not in regex.groupindex:
+            raise ValueError(f"store pattern must have a named group 'store': {pattern!r}")
+        labels = []
+        for path in paths:
+            match = regex.search(path.replace(os.sep, '/'))
+            if match is None or not match.group('store'):
+                raise ValueError(f"store pattern {pattern!r} does not match {path!r}")
+            partition = match.group('partition') if 'partition' in regex.groupindex else None
+            labels.append((match.group('store'), partition or ''))
+        return labels
+
+    dirs = [os.path.dirname(os.path.abspath(path)) for path in paths]
+    root = os.path.commonpath(dirs)
+    labels = []
+    for path, directory in zip(paths, dirs):
+        relative = os.path.relpath(directory, root)
+        if relative != '.':
+            store, _, partition = relative.replace(os.sep, '/').partition('/')
+        elif len(paths) > 1:
+            store, partition = os.path.splitext(os.path.basename(path))[0], ''
+        else:
+            store, partition = os.path.basename(directory) or directory, ''
+        labels.append((store, partition))
+    return labels
+
+def store_labels(paths: List[str], pattern: Optional[str] = None) -> List[str]:
+    """파일마다 하나씩인 출력용 라벨 ("매장/파티션", 파티션이 없으면 "매장")"""
+    return [f"{store}/{partition}" if partition else store
+            for store, partition in store_partitions(paths, pattern)]
+
+def _load_workbook(file_path: str, cache_dir: Optional[str],
+                   engine: Optional[str]) -> Tuple[pd.DataFrame, List[int], Optional[str]]:
+    """프로세스 풀 작업 단위: (상품 테이블, 변환 실패 행, 오류 메시지)"""
+    try:
+        frame, rejected = load_sales_frame(file_path, cache_dir=cache_dir, engine=engine)
+    except Exception as e:
+        return pd.DataFrame(columns=SALES_COLUMNS), [], str(e)
+    return frame, rejected, None
+
+def load_sales_frames(paths: List[str], cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                      engine: Optional[str] = None, max_workers: Optional[int] = None,
+                      store_pattern: Optional[str] = None
+                      ) -> Tuple[pd.DataFrame, Dict[str, List[int]], Dict[str, str]]:
+    """여러 매장 파일을 병렬로 읽어 store/partition 컬럼이 붙은 하나의 상품 테이블로 병합
+
+    반환값은 (병합 테이블, 파일 라벨별 변환 실패 행, 파일 라벨별 읽기 오류)입니다.
+    매장/파티션 구분은 ``store_partitions``를 따릅니다.
+    """
+    partitions = store_partitions(paths, store_pattern)
+    labels = [f"{store}/{partition}" if partition else store for store, partition in partitions]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_load_workbook, paths, repeat(cache_dir), repeat(engine)))
+    frames = []
+    rejected_by_store: Dict[str, List[int]] = {}
+    errors: Dict[str, str] = {}
+    for label, (store, partition), (frame, rejected, error) in zip(labels, partitions, results):
+        if error is not None:
+            errors[label] = error
+            continue
+        if rejected:
+            rejected_by_store[label] = rejected
+        frames.append(frame.assign(store=store, partition=partition))
+    if not frames:
+        return pd.DataFrame(columns=['store', 'partition'] + SALES_COLUMNS), rejected_by_store, errors
+    merged = pd.concat(frames, ignore_index=True)
+    return merged[['store', 'partition'] + SALES_COLUMNS], rejected_by_store, errors
@@ -0,0 +1,148 @@
+"""
+survey_cube.py
+~~~~~~~~~~~~~~
+
+설문 응답의 다차원 사전 집계 큐브
+
+연령대 × 성별 × 방문 빈도 × 매장 × 조사 차수(wave)의 조합 중 응답이 있는 칸만 골라
+칸별 응답자 수와 지표(만족/불만/메뉴)별 해당 인원을 한 번에 집계해 보관합니다.
+모든 조합을 담는 밀집 배열은 매장 500곳 × 차수 50회처럼 차원이 커지면 수백 MB가 되지만,
+응답이 있는 칸은 응답 수를 넘지 않으므로 큐브 크기는 응답 수와 지표 수에만 비례합니다.
+
+세그먼트(어떤 차원을 고정하고 나머지를 합친 값)와 차원별 합계는 질의할 때
+칸 배열에 대한 불리언 마스크 합계와 ``np.bincount``로 계산합니다 (DataFrame 재스캔 없음).
+
+cell_counts의 열 0번은 응답자 수, 1번부터는 지표 순서대로의 해당 인원입니다.
+
+사용법:
+    cube = SurveyCube.from_frame(df, indicators)          # indicators: IndicatorMatrix
+    cube.total(age_group='50대', gender='여성')            # 세그먼트 응답자 수
+    cube.count('satisfaction_가격', age_group='50대')      # 세그먼트 지표 해당 인원
+    cube.rollup('age_group', 'complaint_눅눅')             # {연령대: 인원}
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 큐브 차원 (데이터에 없는 차원은 MISSING 한 칸으로 채워짐)
+CUBE_DIMENSIONS = ('age_group', 'gender', 'visit_frequency', 'store', 'wave')
+
+ALL = '전체'
+MISSING = '미기재'
+
+class SurveyCube:
+    """응답이 있는 차원 조합(칸)별 응답자 수와 지표 해당 인원"""
+
+    def __init__(self, dimensions: Sequence[str], members: Dict[str, List[str]],
+                 indicators: Sequence[str], cells: np.ndarray, cell_counts: np.ndarray):
+        self.dimensions: Tuple[str, ...] = tuple(dimensions)
+        self.members = members                # 차원별 구성원 (0번은 ALL)
+        self.indicators: List[str] = list(indicators)
+        self.cells = cells                    # (칸 수, 차원 수) 구성원 번호 (1부터)
+        self.cell_counts = cell_counts        # (칸 수, 지표 수 + 1) 응답자 수와 지표별 인원
+        self._grand_total = cell_counts.sum(axis=0, dtype=np.int64)
+        self._member_index = {dim: {member: i for i, member in enumerate(members[dim])}
+                              for dim in self.dimensions}
+        self._indicator_index = {name: i + 1 for i, name in enumerate(self.indicators)}
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, indicators, dimensions: Sequence[str] = CUBE_DIMENSIONS,
+                   columns: Optional[Dict[str, str]] = None) -> 'SurveyCube':
+        """DataFrame의 차원 컬럼과 IndicatorMatrix로 큐브 생성
+
+        columns로 차원 → 실제 컬럼명을 바꿀 수 있습니다 (예: {'gender': 'gender_clean'}).
+        """
+        columns = columns or {}
+        n = len(frame)
+        members: Dict[str, List[str]] = {}
+        codes = []
+        for dim in dimensions:
+            column = columns.get(dim, dim)
+            if column in frame:
+                values = frame[column].astype(object).where(frame[column].notna(), MISSING)
+                dim_codes, uniques = pd.factorize(values)
+                members[dim] = [ALL] + [str(member) for member in uniques]
+                codes.append(dim_codes + 1)
+            else:
+                members[dim] = [ALL, MISSING]
+                codes.append(np.ones(n, dtype=np.int64))
+
+        # 응답이 있는 칸만 남기고 응답별 칸 번호로 응답자 수와 지표별 인원을 집계
+        values = indicators.values
+        if n:
+            cells, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            cells, inverse = np.zeros((0, len(dimensions)), dtype=np.int64), np.zeros(0, dtype=np.int64)
+        # 칸별 인원은 응답 수를 넘지 않으므로 응답 수에 맞는 작은 정수형으로 보관
+        cell_counts = np.empty((len(cells), values.shape[1] + 1), dtype=np.min_scalar_type(n))
+        cell_counts[:, 0] = np.bincount(inverse, minlength=len(cells))
+        for j in range(values.shape[1]):
+            cell_counts[:, j + 1] = np.bincount(inverse, weights=values[:, j], minlength=len(cells))
+        code_dtype = np.min_scalar_type(max(len(members[dim]) for dim in dimensions))
+        return cls(dimensions, members, indicators.columns, cells.astype(code_dtype), cell_counts)
+
+    def _select(self, filters: Dict[str, str]) -> Optional[np.ndarray]:
+        """필터에 해당하는 칸의 불리언 마스크 (필터가 없으면 모든 칸, 데이터에 없는 구성원이면 None)"""
+        unknown = set(filters) - set(self.dimensions)
+        if unknown:
+            raise KeyError(f"unknown cube dimension(s): {', '.join(sorted(unknown))}")
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, member in filters.items():
+            index = self._member_index[dim].get(member)
+            if index is None:
+                return None
+            if index:                         # ALL(0번)은 그 차원을 고정하지 않음
+                mask &= self.cells[:, self.dimensions.index(dim)] == index
+        return mask
+
+    def _indicator(self, indicator: Optional[str]) -> int:
+        if indicator is None:
+            return 0
+        try:
+            return self._indicator_index[indicator]
+        except KeyError:
+            raise KeyError(f"unknown indicator '{indicator}'")
+
+    def total(self, **filters: str) -> int:
+        """세그먼트 응답자 수"""
+        return self.count(None, **filters)
+
+    def count(self, indicator: Optional[str] = None, **filters: str) -> int:
+        """세그먼트의 지표 해당 인원 (indicator가 None이면 응답자 수)"""
+        return int(self._row(filters)[self._indicator(indicator)])
+
+    def _row(self, filters: Dict[str, str]) -> np.ndarray:
+        """세그먼트의 (응답자 수, 지표별 인원) 합계"""
+        if not filters:
+            return self._grand_total
+        mask = self._select(filters)
+        if mask is None:
+            return np.zeros(len(self.indicators) + 1, dtype=np.int64)
+        return self.cell_counts[mask].sum(axis=0, dtype=np.int64)
+
+    def segment(self, **filters: str) -> Dict[str, int]:
+        """세그먼트의 {지표: 해당 인원} (응답자 수는 'total')"""
+        row = self._row(filters)
+        return {'total': int(row[0]), **{name: int(v) for name, v in zip(self.indicators, row[1:].tolist())}}
+
+    def rollup(self, dimension: str, indicator: Optional[str] = None, **filters: str) -> Dict[str, int]:
+        """차원 구성원별 인원 (데이터에 나온 순서, 다른 필터는 고정)"""
+        if dimension in filters:
+            raise ValueError(f"'{dimension}' is both the rollup dimension and a filter")
+        position = self._indicator(indicator)
+        mask = self._select(filters)
+        members = self.members[dimension][1:]
+        if mask is None:
+            return dict.fromkeys(members, 0)
+        axis = self.dimensions.index(dimension)
+        totals = np.bincount(self.cells[mask, axis], weights=self.cell_counts[mask, position],
+                             minlength=len(members) + 1)
+        return dict(zip(members, totals[1:].astype(np.int64).tolist()))
+
+    @property
+    def nbytes(self) -> int:
+        """칸 배열과 칸별 집계가 차지하는 바이트 수"""
+        return self.cells.nbytes + self.cell_counts.nbytes
@@ -0,0 +1,132 @@
+"""
+survey_features.py
+~~~~~~~~~~~~~~~~~~
+
+설문 응답의 키워드 지표(만족/불만/메뉴)를 한 번에 추출하는 벡터화 추출기
+
+키워드마다 ``str.contains``로 컬럼 전체를 훑으면 지표 수만큼 스캔이 반복됩니다.
+여기서는 지표 그룹(예: 만족 요인 5개)을 키워드 하나당 비트 하나인
+``KeywordAutomaton``으로 컴파일해 응답 문자열을 한 번만 훑고,
+현장조사 응답은 같은 문자열이 반복되므로 서로 다른 문자열마다 한 번만 스캔합니다.
+결과는 응답 × 지표 ``uint8`` 행렬이며, DataFrame의 불리언 지표 컬럼은 이 행렬에서 만듭니다.
+
+사용법:
+    families = [IndicatorFamily('satisfaction_', 'satisfaction', ['가격', '메뉴 다양'])]
+    indicators = extract_indicators(df, families)
+    indicators.values            # (응답 수, 지표 수) uint8
+    indicators.to_frame(df.index) # 'satisfaction_가격' 등 불리언 컬럼
+
+    # 인구통계 차원별 지표 교차표 (groupby 한 번, 정돈된 long 형식)
+    indicator_crosstab(processed_df, 'age_group', ['satisfaction_', 'complaint_'])
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from keyword_matcher import KeywordAutomaton
+
+# 지표 그룹 하나의 비트마스크를 int64에 담으므로 그룹당 키워드 수 제한
+MAX_FAMILY_SIZE = 63
+
+def map_unique(values: Sequence[Any], func: Callable[[Any], Any], missing: Any = None) -> np.ndarray:
+    """서로 다른 값마다 func를 한 번만 호출해 전체에 펼친 결과 (결측값은 missing)"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(value) for value in uniques]
+    mapped[-1] = missing
+    return mapped[codes]
+
+def unpack_masks(masks: np.ndarray, width: int) -> np.ndarray:
+    """비트마스크 배열을 (행 수, width) uint8 지표 행렬로 펼침"""
+    bits = np.arange(width, dtype=np.int64)
+    return ((masks[:, None] >> bits) & 1).astype(np.uint8)
+
+class IndicatorFamily:
+    """한 응답 필드에서 찾는 키워드 지표 그룹 (키워드 i → 비트 ``1 << i``)"""
+
+    def __init__(self, prefix: str, field: str, keywords: Iterable[str]):
+        self.prefix = prefix
+        self.field = field
+        self.keywords: List[str] = list(keywords)
+        if len(set(self.keywords)) != len(self.keywords):
+            raise ValueError(f"duplicate keyword in indicator family '{prefix}'")
+        if len(self.keywords) > MAX_FAMILY_SIZE:
+            raise ValueError(f"indicator family '{prefix}' has more than {MAX_FAMILY_SIZE} keywords")
+        self.automaton = KeywordAutomaton({keyword: [keyword] for keyword in self.keywords})
+
+    @property
+    def columns(self) -> List[str]:
+        return [f'{self.prefix}{keyword}' for keyword in self.keywords]
+
+    def masks(self, values: Optional[Sequence[Any]], n: int) -> np.ndarray:
+        """응답별 키워드 비트마스크 (문자열이 아니거나 필드가 없으면 0)"""
+        if values is None:
+            return np.zeros(n, dtype=np.int64)
+        scan = self.automaton.scan
+        masks = map_unique(values, lambda value: scan(value) if isinstance(value, str) else 0, 0)
+        return masks.astype(np.int64)
+
+    def matrix(self, values: Optional[Sequence[Any]], n: int) -> np.ndarray:
+        """(응답 수, 키워드 수) uint8 지표 행렬"""
+        return unpack_masks(self.masks(values, n), len(self.keywords))
+
+@dataclass
+class IndicatorMatrix:
+    """모든 지표 그룹을 옆으로 이어 붙인 응답 × 지표 행렬"""
+    columns: List[str]
+    values: np.ndarray  # (응답 수, 지표 수) uint8
+
+    def counts(self) -> np.ndarray:
+        """지표별 해당 응답 수"""
+        return self.values.sum(axis=0, dtype=np.int64)
+
+    def to_frame(self, index=None) -> pd.DataFrame:
+        """지표별 불리언 컬럼 DataFrame"""
+        return pd.DataFrame(self.values.astype(bool), columns=self.columns, index=index)
+
+def extract_indicators(frame: pd.DataFrame, families: Iterable[IndicatorFamily]) -> IndicatorMatrix:
+    """DataFrame의 응답 필드에서 모든 지표 그룹을 추출 (그룹당 고유 문자열 한 번씩 스캔)"""
+    n = len(frame)
+    columns: List[str] = []
+    blocks = []
+    for family in families:
+        values = frame[family.field].to_numpy(dtype=object) if family.field in frame else None
+        blocks.append(family.matrix(values, n))
+        columns.extend(family.columns)
+    values = np.hstack(blocks) if blocks else np.zeros((n, 0), dtype=np.uint8)
+    return IndicatorMatrix(columns, values)
+
+CROSSTAB_COLUMNS = ['dimension', 'group', 'family', 'factor', 'count', 'total', 'percentage']
+
+def indicator_crosstab(frame: pd.DataFrame, dimension: str, prefixes: Iterable[str]) -> pd.DataFrame:
+    """인구통계 차원(연령대/성별/방문 빈도 등)별 지표 해당 인원과 비율
+
+    prefixes로 시작하는 모든 지표 컬럼을 ``groupby().sum()`` 한 번으로 집계하고
+    (dimension, group, family, factor, count, total, percentage) 형식의 정돈된 표로 반환합니다.
+    행 순서는 지표 컬럼 순서, 그 안에서 그룹 정렬 순서이며 차원 값이 없는 응답은 제외합니다.
+    """
+    prefixes = tuple(prefixes)
+    labels = {}
+    for column in frame.columns:
+        for prefix in prefixes:
+            if column.startswith(prefix):
+                labels[column] = (prefix.rstrip('_'), column[len(prefix):])
+                break
+    columns = list(labels)
+
+    data = frame[columns].astype(np.int64)
+    data['__total__'] = 1
+    sums = data.groupby(frame[dimension], sort=True).sum()
+    totals = sums.pop('__total__')
+
+    tidy = (sums.rename_axis('group').reset_index()
+            .melt(id_vars='group', var_name='indicator', value_name='count'))
+    tidy.insert(0, 'dimension', dimension)
+    tidy['family'] = tidy['indicator'].map(lambda column: labels[column][0])
+    tidy['factor'] = tidy['indicator'].map(lambda column: labels[column][1])
+    tidy['total'] = tidy['group'].map(totals).astype(np.int64)
+    tidy['percentage'] = tidy['count'] / tidy['total'] * 100
+    return tidy[CROSSTAB_COLUMNS]
@@ -0,0 +1,285 @@
+"""
+survey_table.py
+~~~~~~~~~~~~~~~
+
+사전 인코딩(dictionary-encoded) 컬럼으로 보관하는 설문 응답 테이블
+
+응답을 dict 목록으로 두면 '40대', '여성', '미기재' 같은 반복 값과 키 문자열이 응답마다 따라다닙니다.
+``SurveyTable``은 필드마다 서로 다른 값 목록(categories)과 응답별 정수 코드 배열(codes)만 보관하므로
+메모리가 작고, 필터는 값 목록에 대한 판정을 한 번 한 뒤 코드 배열로 펼친 불리언 마스크가 됩니다.
+문자열 판정(키워드 포함 여부 등)도 서로 다른 값마다 한 번만 하고 ``np.bincount``로 집계합니다.
+
+ID나 자유 응답(불만, 메모)처럼 값이 거의 반복되지 않는 필드는 인코딩해도 값 목록이 응답 수만큼 커지므로
+같은 인터페이스의 ``PlainColumn``(응답별 값을 담은 object 배열)으로 보관합니다.
+``from_records``의 plain_fields로 지정하거나, 서로 다른 값이 응답 수의 ``PLAIN_RATIO``를 넘으면 자동으로 고릅니다.
+
+없는 필드는 None 값으로 다루되 응답별로 필드가 없었는지를 따로 기록하므로,
+``records()``는 원래 dict 형태(없던 필드는 빠지고 명시적인 None은 그대로)로 되돌립니다.
+
+사용법:
+    table = SurveyTable.from_records(raw_records)
+    target = table['age_group'].isin(['40대', '50대'])       # 불리언 마스크
+    table['gender'].filter(target).counts()                 # {'여성': 5, ...}
+    table['complaints'].tally(lambda text: [...])           # 값마다 한 번 판정한 이름별 인원
+"""
+
+import sys
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+# 서로 다른 값이 응답 수의 이 비율을 넘는 필드는 PlainColumn으로 보관
+PLAIN_RATIO = 0.5
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """값 목록을 1차원 object 배열로 (값이 시퀀스여도 원소 하나로 담음)"""
+    array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        array[i] = value
+    return array
+
+def _object_nbytes(values: Iterable[Any]) -> int:
+    """값 객체들이 차지하는 바이트 수 (같은 객체는 한 번만)"""
+    seen = set()
+    total = 0
+    for value in values:
+        if id(value) not in seen:
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+    return total
+
+def _code_dtype(n_categories: int) -> np.dtype:
+    """값 종류 수를 담을 수 있는 가장 작은 부호 없는 정수형"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_categories <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+class CategoricalColumn:
+    """값 목록(categories)과 응답별 코드(codes)로 표현한 컬럼"""
+
+    def __init__(self, codes: np.ndarray, categories: List[Any]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, values: Iterable[Any]) -> 'CategoricalColumn':
+        """값 스트림을 처음 나온 순서의 값 목록과 코드 배열로 인코딩"""
+        index: Dict[Any, int] = {}
+        codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64)
+        return cls(codes.astype(_code_dtype(len(index))), list(index))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, position: int) -> Any:
+        return self.categories[self.codes[position]]
+
+    def __iter__(self):
+        categories = self.categories
+        return (categories[code] for code in self.codes.tolist())
+
+    @property
+    def nbytes(self) -> int:
+        """코드 배열과 값 목록(리스트와 값 객체)이 차지하는 바이트 수"""
+        return self.codes.nbytes + sys.getsizeof(self.categories) + _object_nbytes(self.categories)
+
+    def lookup(self, func: Callable[[Any], Any], dtype=object) -> np.ndarray:
+        """값마다 func를 한 번씩 호출한 결과를 응답별 배열로 펼침"""
+        table = np.empty(len(self.categories), dtype=dtype)
+        for code, value in enumerate(self.categories):
+            table[code] = func(value)
+        return table[self.codes]
+
+    def where(self, predicate: Callable[[Any], bool]) -> np.ndarray:
+        """predicate가 참인 응답의 불리언 마스크 (값마다 한 번 판정)"""
+        return self.lookup(lambda value: bool(predicate(value)), dtype=bool)
+
+    def isin(self, values: Iterable[Any]) -> np.ndarray:
+        """값이 values 중 하나인 응답의 불리언 마스크"""
+        wanted = set(values)
+        return self.where(lambda value: value in wanted)
+
+    def filter(self, mask: np.ndarray) -> 'CategoricalColumn':
+        """마스크가 참인 응답만 남긴 컬럼 (값 목록은 공유)"""
+        return CategoricalColumn(self.codes[mask], self.categories)
+
+    def recode(self, func: Callable[[Any], Any]) -> 'CategoricalColumn':
+        """값마다 func를 적용한 컬럼 (같은 값으로 바뀌는 값끼리 합쳐짐)"""
+        index: Dict[Any, int] = {}
+        mapping = np.array([index.setdefault(func(value), len(index)) for value in self.categories],
+                           dtype=np.int64)
+        codes = mapping[self.codes] if len(mapping) else self.codes.astype(np.int64)
+        return CategoricalColumn(codes.astype(_code_dtype(len(index))), list(index))
+
+    def _first_positions(self) -> np.ndarray:
+        """값별로 처음 나온 응답 위치 (나오지 않은 값은 응답 수)"""
+        first = np.full(len(self.categories), len(self.codes), dtype=np.int64)
+        unique, positions = np.unique(self.codes, return_index=True)
+        first[unique] = positions
+        return first
+
+    def counts(self) -> Dict[Any, int]:
+        """값별 응답 수 (이 컬럼에서 처음 나온 순서, 0명인 값 제외)"""
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        first = self._first_positions()
+        order = sorted(np.flatnonzero(counts).tolist(), key=lambda code: first[code])
+        return {self.categories[code]: int(counts[code]) for code in order}
+
+    def tally(self, names: Callable[[Any], Iterable[str]]) -> Counter:
+        """값마다 names(값)이 돌려준 이름을 응답 수만큼 센 Counter
+
+        names는 서로 다른 값마다 한 번만 호출되며, 같은 이름을 여러 번 돌려주면 그만큼 셉니다.
+        순서는 응답을 차례로 훑으며 이름을 센 것과 같습니다 (처음 나온 응답, 그 안에서 반환 순서).
+        """
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        first = self._first_positions()
+        totals: Dict[str, int] = {}
+        order: Dict[str, tuple] = {}
+        for code in np.flatnonzero(counts).tolist():
+            n = int(counts[code])
+            for rank, name in enumerate(names(self.categories[code])):
+                totals[name] = totals.get(name, 0) + n
+                key = (first[code], rank)
+                if name not in order or key < order[name]:
+                    order[name] = key
+        return Counter({name: totals[name] for name in sorted(totals, key=order.__getitem__)})
+
+class PlainColumn:
+    """응답별 값을 그대로 담은 object 배열 컬럼 (CategoricalColumn과 같은 인터페이스)
+
+    값이 거의 반복되지 않는 필드용이며, 값별 판정/집계는 호출할 때 인코딩한 컬럼에 맡깁니다.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    @classmethod
+    def encode(cls, values: Iterable[Any]) -> 'PlainColumn':
+        """값 스트림을 object 배열로 (같은 값은 객체 하나를 공유)"""
+        shared: Dict[Any, Any] = {}
+        return cls(_object_array([shared.setdefault(value, value) for value in values]))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, position: int) -> Any:
+        return self.values[position]
+
+    def __iter__(self):
+        return iter(self.values.tolist())
+
+    @property
+    def nbytes(self) -> int:
+        """object 배열과 값 객체가 차지하는 바이트 수"""
+        return self.values.nbytes + _object_nbytes(self.values.tolist())
+
+    def encoded(self) -> CategoricalColumn:
+        return CategoricalColumn.encode(self.values.tolist())
+
+    def lookup(self, func: Callable[[Any], Any], dtype=object) -> np.ndarray:
+        return self.encoded().lookup(func, dtype)
+
+    def where(self, predicate: Callable[[Any], bool]) -> np.ndarray:
+        return self.encoded().where(predicate)
+
+    def isin(self, values: Iterable[Any]) -> np.ndarray:
+        return self.encoded().isin(values)
+
+    def filter(self, mask: np.ndarray) -> 'PlainColumn':
+        return PlainColumn(self.values[mask])
+
+    def recode(self, func: Callable[[Any], Any]) -> CategoricalColumn:
+        return self.encoded().recode(func)
+
+    def counts(self) -> Dict[Any, int]:
+        return self.encoded().counts()
+
+    def tally(self, names: Callable[[Any], Iterable[str]]) -> Counter:
+        return self.encoded().tally(names)
+
+Column = Union[CategoricalColumn, PlainColumn]
+
+class SurveyTable:
+    """필드별 CategoricalColumn/PlainColumn으로 보관하는 설문 응답 테이블
+
+    absent는 필드 → 그 필드가 없던 응답의 불리언 마스크이며, 없던 응답이 있는 필드만 담습니다.
+    """
+
+    def __init__(self, columns: Mapping[str, Column], size: int,
+                 absent: Optional[Mapping[str, np.ndarray]] = None):
+        self.columns: Dict[str, Column] = dict(columns)
+        self.size = size
+        self.absent: Dict[str, np.ndarray] = dict(absent or {})
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]],
+                     plain_fields: Iterable[str] = ()) -> 'SurveyTable':
+        """dict 응답 목록을 컬럼으로 인코딩 (필드 순서는 처음 나온 순서, 없는 필드는 None)
+
+        plain_fields의 필드와 서로 다른 값이 많은 필드(``PLAIN_RATIO``)는 PlainColumn으로 보관합니다.
+        """
+        records = list(records)
+        n = len(records)
+        plain = set(plain_fields)
+        fields: Dict[str, None] = {}
+        for record in records:
+            fields.update(dict.fromkeys(record))
+        columns: Dict[str, Column] = {}
+        absent: Dict[str, np.ndarray] = {}
+        for field in fields:
+            values = [record.get(field) for record in records]
+            if field in plain:
+                columns[field] = PlainColumn.encode(values)
+            else:
+                column = CategoricalColumn.encode(values)
+                if len(column.categories) > PLAIN_RATIO * n:
+                    column = PlainColumn.encode(values)
+                columns[field] = column
+            missing = np.fromiter((field not in record for record in records), dtype=bool, count=n)
+            if missing.any():
+                absent[field] = missing
+        return cls(columns, n, absent)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.columns
+
+    def __getitem__(self, field: str) -> Column:
+        """필드 컬럼 (테이블에 없는 필드는 모든 응답이 None인 컬럼)"""
+        column = self.columns.get(field)
+        if column is None:
+            return CategoricalColumn(np.zeros(self.size, dtype=np.uint8), [None])
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼(코드 배열, 값 목록, object 배열과 값 객체)과 없는 필드 마스크가 차지하는 바이트 수
+
+        값 객체는 컬럼마다 따로 세므로 여러 컬럼에 같은 문자열 객체가 있으면 중복해서 셉니다.
+        """
+        return (sum(column.nbytes for column in self.columns.values())
+                + sum(missing.nbytes for missing in self.absent.values()))
+
+    def filter(self, mask: np.ndarray) -> 'SurveyTable':
+        """마스크가 참인 응답만 남긴 테이블"""
+        return SurveyTable({field: column.filter(mask) for field, column in self.columns.items()},
+                           int(np.count_nonzero(mask)),
+                           {field: missing[mask] for field, missing in self.absent.items()})
+
+    def records(self, mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """응답을 원래 dict 형태로 복원 (mask가 있으면 해당 응답만, 없던 필드는 제외)"""
+        table = self if mask is None else self.filter(mask)
+        columns = [(field, list(column), table.absent[field].tolist() if field in table.absent else None)
+                   for field, column in table.columns.items()]
+        records = []
+        for i in range(table.size):
+            record = {}
+            for field, values, missing in columns:
+                if missing is None or not missing[i]:
+                    record[field] = values[i]
+            records.append(record)
+        return records
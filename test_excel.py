@@ -1,18 +1,21 @@
 import pandas as pd
 import sys
 
+from sales_workbook import load_sales_frame, report_rejected_rows
+
 def test_excel():
     try:
         file_path = "C:/Users/kks/Documents/카카오톡 받은 파일/상품별 판매 데이터.xlsx"
         print(f"Excel 파일 읽기 시도: {file_path}")
         
-        df = pd.read_excel(file_path, header=None)
-        print(f"Excel 파일 읽기 완료: {len(df)}행")
+        # 같은 파일은 두 번째 실행부터 Feather 캐시에서 읽음
+        df, rejected = load_sales_frame(file_path)
+        print(f"Excel 파일 읽기 완료: {len(df)}개 상품")
+        report_rejected_rows(rejected)
         
         # 데이터 확인
-        for i in range(3, min(10, len(df))):
-            row = df.iloc[i]
-            print(f"행 {i}: {row[0]} - {row[1]} - {row[-1]}")
+        for i, row in enumerate(df.head(7).itertuples(index=False)):
+            print(f"행 {i}: {row.name} - {row.daily_sales} - {row.cost_ratio}")
             
     except Exception as e:
         print(f"오류: {e}")
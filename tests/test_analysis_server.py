@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from analysis_server import AnalysisService, HTTPError
+
+@pytest.fixture
+def service():
+    service = AnalysisService()
+    yield service
+    service.close()
+
+def request(service, method, target, body=b''):
+    return asyncio.run(service.dispatch(method, target, body))
+
+@pytest.mark.parametrize('target', ['/pricing/quote?cost_ratio=nan', '/pricing/quote?cost_ratio=inf',
+                                    '/pricing/quote?cost_ratio=0.4&base_cost=-inf',
+                                    '/pricing/quote?cost_ratio=0.4&tiers=3990,nan',
+                                    '/pricing/menu?ideal_pct=nan'])
+def test_non_finite_query_values_are_rejected(service, target):
+    with pytest.raises(HTTPError) as error:
+        request(service, 'GET', target)
+    assert error.value.status == 400
+
+@pytest.mark.parametrize('payload', [{'items': [{'cost_ratio': 'nan'}]},
+                                     {'items': [{'cost_ratio': 0.4, 'daily_sales': 'inf'}]},
+                                     {'items': [{'cost_ratio': 0.4}], 'ideal_pct': 'nan'}])
+def test_non_finite_batch_values_are_rejected(service, payload):
+    with pytest.raises(HTTPError) as error:
+        request(service, 'POST', '/pricing/quote', json.dumps(payload).encode('utf-8'))
+    assert error.value.status == 400
+
+def test_quote_is_strict_json(service):
+    status, _, body = request(service, 'GET', '/pricing/quote?cost_ratio=0.45')
+    assert status == 200
+    quote = json.loads(body, parse_constant=lambda name: pytest.fail(f"non-JSON constant {name}"))
+    assert quote['suggested_price'] == 1500.0
+
+def test_menu_pricing_leaves_shared_table_unchanged(service):
+    table = service.state.real_menu_table
+    before = table.suggested_price.copy()
+    request(service, 'GET', '/pricing/menu?ideal_pct=0.25')
+    assert np.array_equal(table.suggested_price, before)
@@ -0,0 +1,68 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from keyword_matcher import KeywordAutomaton, KeywordCounter, keyword_version
+from naver_review_health_food_analysis import NaverReviewHealthFoodAnalyzer
+
+def loop_mask(keywords, text):
+    """원래 분석기의 반복문: 카테고리마다 키워드 하나라도 부분 문자열이면 해당"""
+    return [category for category, words in keywords.items() if any(word in text for word in words)]
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return NaverReviewHealthFoodAnalyzer()
+
+def test_scan_matches_loop_on_sample_reviews(analyzer):
+    automaton = KeywordAutomaton(analyzer.health_keywords)
+    for review in analyzer.reviews:
+        assert automaton.categories_of(automaton.scan(review)) == loop_mask(analyzer.health_keywords, review)
+
+def test_scan_matches_loop_on_random_texts():
+    keywords = {'a': ['가나', '나다라'], 'b': ['다라', '라'], 'c': ['가나다라마'], 'd': ['마마']}
+    automaton = KeywordAutomaton(keywords)
+    rng = np.random.default_rng(5)
+    for _ in range(2000):
+        text = ''.join(rng.choice(list('가나다라마 '), rng.integers(0, 12)))
+        assert automaton.categories_of(automaton.scan(text)) == loop_mask(keywords, text)
+
+def test_overlapping_and_nested_keywords():
+    automaton = KeywordAutomaton({'건강': ['건강식'], '강식': ['강식'], '식': ['식단'], '국물': ['국물']})
+    # '건강식단' 안의 '건강식', '강식', '식단'이 모두 잡힘 (겹치는 매칭)
+    assert automaton.categories_of(automaton.scan('건강식단 추천')) == ['건강', '강식', '식']
+    assert automaton.scan('') == 0
+    assert automaton.scan('아무 관련 없음') == 0
+
+def test_mask_counts_and_count_categories(analyzer):
+    keywords = analyzer.health_keywords
+    automaton = KeywordAutomaton(keywords)
+    masks = Counter(automaton.scan(review) for review in analyzer.reviews)
+    expected = Counter()
+    for review in analyzer.reviews:
+        expected.update(loop_mask(keywords, review))
+    assert automaton.mask_counts(masks) == {category: expected[category] for category in keywords}
+    counts, total = automaton.count_categories(analyzer.reviews)
+    assert total == len(analyzer.reviews)
+    assert counts == automaton.mask_counts(masks)
+
+def test_counter_merge_equals_single_pass(analyzer):
+    automaton = KeywordAutomaton(analyzer.health_keywords)
+    reviews = list(analyzer.reviews)
+    half = len(reviews) // 2
+    merged = KeywordCounter(automaton).update(reviews[:half]).merge(KeywordCounter(automaton).update(reviews[half:]))
+    single = KeywordCounter(automaton).update(reviews)
+    assert merged.counts() == single.counts()
+    assert merged.total == single.total == len(reviews)
+
+def test_exclusions_veto_only_their_category():
+    automaton = KeywordAutomaton({'국물': ['국 '], '나라': ['한국']}, exclusions={'국물': ['한국 ']})
+    assert automaton.categories_of(automaton.scan(' 한국 음식 ')) == ['나라']
+    assert automaton.categories_of(automaton.scan(' 된장국 ')) == ['국물']
+
+def test_version_tracks_keywords_exclusions_and_variant():
+    keywords = {'국물': ['국물']}
+    assert keyword_version(keywords) == KeywordAutomaton(keywords).version
+    assert keyword_version(keywords) != keyword_version({'국물': ['국물', '탕']})
+    assert keyword_version(keywords) != keyword_version(keywords, {'국물': ['한국 ']})
+    assert keyword_version(keywords) != keyword_version(keywords, variant='tokens-v2')
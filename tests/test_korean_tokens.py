@@ -0,0 +1,45 @@
+import pytest
+
+from keyword_matcher import KeywordAutomaton
+from korean_tokens import strip_particle, token_exclusions, token_keywords, token_text, tokenize
+
+SOUP = {'국물': ['국물', '국물요리', '찌개', '탕', '국'], '건강': ['건강'], '자연': ['자연'], '집밥': ['집밥', '집에서', '집에서 만든']}
+
+@pytest.fixture(scope='module')
+def automaton():
+    return KeywordAutomaton(token_keywords(SOUP), exclusions=token_exclusions(SOUP))
+
+def categories(automaton, review):
+    return automaton.categories_of(automaton.scan(token_text(tokenize(review))))
+
+@pytest.mark.parametrize('review', ['김치찌개 최고', '갈비탕 맛집', '된장국 짜요', '국이 시원해요',
+                                    '국물이 진해요', '된장국물이 좋아요'])
+def test_compound_soups_match(automaton, review):
+    assert categories(automaton, review) == ['국물']
+
+@pytest.mark.parametrize('review', ['한국 음식 좋아요', '국가대표 맛집', '흑설탕 라떼', '결국 또 왔어요'])
+def test_words_ending_in_soup_syllables_do_not_match(automaton, review):
+    assert categories(automaton, review) == []
+
+@pytest.mark.parametrize('review', ['동네 국밥집 추천', '중국집 짜장면', '한국 음식 맛집'])
+def test_stripped_keyword_does_not_match_compound_endings(automaton, review):
+    assert '집밥' not in categories(automaton, review)
+
+@pytest.mark.parametrize('review', ['집에서 먹는 맛', '집밥 그리운 날', '우리 집이 최고'])
+def test_stripped_keyword_matches_whole_token(automaton, review):
+    assert categories(automaton, review) == ['집밥']
+
+def test_prefix_and_multi_token_keywords(automaton):
+    assert categories(automaton, '건강한 한 끼') == ['건강']
+    assert categories(automaton, '집에서 만든 맛') == ['집밥']
+    assert categories(automaton, '자연스러운 맛') == ['자연']
+    # 토큰 중간에 들어간 키워드는 매칭하지 않음
+    assert categories(automaton, '부자연스러운 맛') == []
+
+@pytest.mark.parametrize('token, expected', [
+    ('국이', '국'), ('국물이', '국물'), ('국물로', '국물'), ('포도가', '포도'), ('영양가', '영양가'),
+    ('포도', '포도'), ('청포도', '청포도'), ('정도', '정도'), ('하나', '하나'), ('회의', '회의'),
+    ('우도', '우도'), ('바나나', '바나나'),
+])
+def test_strip_particle_keeps_nouns_ending_like_particles(token, expected):
+    assert strip_particle(token) == expected
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from menu_pricing import (BatchPricingEngine, Recipe, categorise_price, gross_margin, load_real_data,
+                          load_sample_data, price_costs, suggest_price)
+
+TIERS = [3990, 7990, 9990]
+
+def loop_pricing(price_lookup, recipes, tiers, ideal_pct):
+    """레시피마다 스칼라 함수로 계산한 기준 결과"""
+    rows = []
+    for recipe in recipes:
+        cost = recipe.cost(price_lookup)
+        price = suggest_price(cost, ideal_pct)
+        rows.append((recipe.name, cost, price, gross_margin(price, cost), categorise_price(price, tiers)))
+    return rows
+
+def engine_lookup(ingredients):
+    return {name: ingredient.price_per_kg for name, ingredient in ingredients.items()}
+
+@pytest.mark.parametrize('loader', [load_sample_data, load_real_data])
+@pytest.mark.parametrize('ideal_pct', [0.25, 0.30, 0.35])
+def test_engine_matches_loop(loader, ideal_pct):
+    ingredients, recipes = loader()
+    engine = BatchPricingEngine.from_ingredients(ingredients, recipes)
+    result = engine.price(TIERS, ideal_pct)
+    expected = loop_pricing(engine_lookup(ingredients), recipes, TIERS, ideal_pct)
+    assert result.names == [row[0] for row in expected]
+    np.testing.assert_allclose(result.costs, [row[1] for row in expected], rtol=1e-12)
+    np.testing.assert_allclose(result.suggested_prices, [row[2] for row in expected], rtol=1e-12)
+    np.testing.assert_allclose(result.gross_margins, [row[3] for row in expected], rtol=1e-12)
+    assert result.tiers == [row[4] for row in expected]
+
+def test_engine_matches_loop_on_random_recipes():
+    rng = np.random.default_rng(3)
+    lookup = {f'item{i}': float(rng.uniform(500, 20000)) for i in range(30)}
+    names = list(lookup)
+    recipes = [Recipe(f'menu{r}', {names[i]: float(rng.uniform(0.01, 0.5))
+                                   for i in rng.choice(30, rng.integers(1, 8), replace=False)})
+               for r in range(200)]
+    result = BatchPricingEngine(lookup, recipes).price(TIERS, 0.3)
+    expected = loop_pricing(lookup, recipes, TIERS, 0.3)
+    np.testing.assert_allclose(result.suggested_prices, [row[2] for row in expected], rtol=1e-12)
+    assert result.tiers == [row[4] for row in expected]
+
+def test_prices_on_tier_boundaries_match_scalar_classifier():
+    costs = np.array([3990, 3990.01, 7990, 9990, 9990.5]) * 0.3
+    result = price_costs(list('abcde'), costs, TIERS, 0.3)
+    assert result.tiers == [categorise_price(price, TIERS) for price in result.suggested_prices.tolist()]
+
+def test_missing_ingredient_and_invalid_inputs():
+    with pytest.raises(KeyError):
+        BatchPricingEngine({'rice': 2000.0}, [Recipe('x', {'beef': 0.1})])
+    with pytest.raises(ValueError):
+        price_costs(['free'], np.array([0.0]), TIERS, 0.3)
+    with pytest.raises(ValueError):
+        price_costs(['x'], np.array([100.0]), TIERS, 1.0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from price_tiers import TierClassifier, tier_classifier
+
+TIERS = [3990, 7990, 9990]
+
+def loop_categorise(price, tiers):
+    """원래 menu_pricing.categorise_price의 반복문"""
+    for threshold in sorted(tiers):
+        if price <= threshold:
+            return f"≤{int(threshold):,}원"
+    return f">{int(tiers[-1]):,}원"
+
+PRICES = [0.0, 3989.99, 3990, 3990.01, 7990, 7990.5, 9990, 9990.01, 1e9, -5.0]
+
+@pytest.mark.parametrize('price', PRICES)
+def test_classify_matches_loop(price):
+    assert TierClassifier(TIERS).classify(price) == loop_categorise(price, TIERS)
+
+def test_boundaries_belong_to_the_lower_tier():
+    classifier = TierClassifier(TIERS)
+    assert [classifier.code(price) for price in (3990, 3990.01, 9990, 9990.01)] == [0, 1, 2, 3]
+    assert classifier.labels == ['≤3,990원', '≤7,990원', '≤9,990원', '>9,990원']
+
+def test_array_paths_match_scalar_path():
+    classifier = TierClassifier(TIERS)
+    prices = np.array(PRICES)
+    codes = classifier.codes(prices)
+    assert codes.tolist() == [classifier.code(price) for price in PRICES]
+    assert classifier.label_array(codes).tolist() == [classifier.classify(price) for price in PRICES]
+    assert classifier.classify_many(prices).tolist() == [loop_categorise(price, TIERS) for price in PRICES]
+
+def test_unsorted_tiers_are_sorted_once():
+    classifier = TierClassifier([9990, 3990, 7990])
+    assert classifier.thresholds == (3990.0, 7990.0, 9990.0)
+    assert classifier.classify(5000) == '≤7,990원'
+    assert classifier.classify(10000) == '>9,990원'
+
+def test_empty_tiers_and_cached_classifier():
+    with pytest.raises(ValueError):
+        TierClassifier([])
+    assert tier_classifier(TIERS) is tier_classifier(tuple(TIERS))
@@ -0,0 +1,76 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from proportion_intervals import beta_quantile, proportion_intervals, regularized_beta, z_value
+
+def loop_wald(k, n, confidence=0.95):
+    """원래 지표별 반복문: 정규 근사 구간"""
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    p = k / n
+    margin = z * math.sqrt(p * (1 - p) / n)
+    return p - margin, p + margin
+
+def test_z_value():
+    assert z_value(0.95) == pytest.approx(1.959964, abs=1e-6)
+    assert z_value(0.99) == pytest.approx(2.575829, abs=1e-6)
+    with pytest.raises(ValueError):
+        z_value(1.0)
+
+def test_clopper_pearson_known_values():
+    lower, upper = proportion_intervals([3, 0, 12], 12, method='clopper-pearson')
+    assert lower[0] == pytest.approx(0.0549, abs=1e-4)
+    assert upper[0] == pytest.approx(0.5719, abs=1e-4)
+    assert lower[1] == 0.0
+    assert upper[1] == pytest.approx(0.2646, abs=1e-4)
+    assert lower[2] == pytest.approx(1 - 0.2646, abs=1e-4)
+    assert upper[2] == 1.0
+
+def test_beta_quantile_inverts_regularized_beta():
+    q = np.array([0.025, 0.5, 0.975])
+    x = beta_quantile(q, 4, 9)
+    np.testing.assert_allclose(regularized_beta(x, 4, 9), q, atol=1e-10)
+
+def test_wilson_edge_cases_at_zero_and_n():
+    z2 = z_value(0.95) ** 2
+    lower, upper = proportion_intervals([0, 12], 12, method='wilson')
+    assert lower[0] == pytest.approx(0.0, abs=1e-12)
+    assert upper[0] == pytest.approx(z2 / 12 / (1 + z2 / 12))
+    assert lower[1] == pytest.approx(1 - upper[0])
+    assert upper[1] == pytest.approx(1.0, abs=1e-12)
+
+def test_wilson_known_value():
+    lower, upper = proportion_intervals(3, 12, method='wilson')
+    assert float(lower) == pytest.approx(0.0889, abs=1e-4)
+    assert float(upper) == pytest.approx(0.5323, abs=1e-4)
+
+def test_wald_matches_loop_and_is_not_clipped():
+    counts = np.array([0, 1, 5, 30, 99, 100])
+    lower, upper = proportion_intervals(counts, 100, method='wald', confidence=0.9)
+    expected = [loop_wald(k, 100, 0.9) for k in counts.tolist()]
+    np.testing.assert_allclose(lower, [row[0] for row in expected], rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(upper, [row[1] for row in expected], rtol=1e-12, atol=1e-15)
+    lower, _ = proportion_intervals(1, 10, method='wald')
+    assert lower < 0
+
+@pytest.mark.parametrize('method', ['wald', 'wilson', 'clopper-pearson', 'bootstrap'])
+def test_empty_sample_is_nan(method):
+    lower, upper = proportion_intervals([0, 2], [0, 4], method=method, seed=1)
+    assert np.isnan(lower[0]) and np.isnan(upper[0])
+    assert 0 <= lower[1] <= 0.5 <= upper[1] <= 1
+
+def test_bootstrap_is_reproducible_with_seed():
+    first = proportion_intervals([3, 40], [12, 80], method='bootstrap', seed=42)
+    second = proportion_intervals([3, 40], [12, 80], method='bootstrap', seed=42)
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[1], second[1])
+
+def test_invalid_method_and_counts():
+    with pytest.raises(ValueError):
+        proportion_intervals(1, 10, method='agresti')
+    with pytest.raises(ValueError):
+        proportion_intervals(11, 10)
+    with pytest.raises(ValueError):
+        proportion_intervals(-1, 10)
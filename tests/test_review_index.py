@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from keyword_matcher import KeywordAutomaton
+from review_index import IndexVersionError, ReviewIndex
+from review_source import ReviewSource, review_records
+
+KEYWORDS = {'국물': ['국물'], '샐러드': ['샐러드']}
+
+@pytest.fixture
+def automaton():
+    return KeywordAutomaton(KEYWORDS)
+
+@pytest.fixture
+def index(tmp_path):
+    with ReviewIndex(str(tmp_path / 'reviews.db')) as index:
+        yield index
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records),
+                    encoding='utf-8')
+    return str(path)
+
+def seed(index, automaton):
+    index.update([('0', '국물 좋음'), ('1', '국물 최고')], automaton)
+    assert index.counts(automaton) == ({'국물': 2, '샐러드': 0}, 2)
+
+def test_delta_with_explicit_id_is_an_edit(index, automaton):
+    seed(index, automaton)
+    update = index.update([('0', '샐러드 좋음')], automaton)
+    assert (update.added, update.changed) == (0, 1)
+    assert index.counts(automaton) == ({'국물': 1, '샐러드': 1}, 2)
+
+def test_delta_file_without_ids_is_rejected(tmp_path, index, automaton):
+    seed(index, automaton)
+    delta = ReviewSource(write_jsonl(tmp_path / 'delta.jsonl', [{'text': '샐러드 좋음'}]))
+    with pytest.raises(ValueError, match="no 'id' value"):
+        index.update(delta.records(), automaton)
+    # 순번 '0'으로 기존 리뷰를 덮어쓰지 않음
+    assert index.counts(automaton) == ({'국물': 2, '샐러드': 0}, 2)
+
+def test_empty_id_is_rejected(tmp_path, automaton):
+    source = ReviewSource(write_jsonl(tmp_path / 'delta.jsonl', [{'id': '', 'text': '샐러드 좋음'}]))
+    with pytest.raises(ValueError):
+        list(source.records())
+
+def test_text_file_has_no_ids(tmp_path):
+    path = tmp_path / 'delta.txt'
+    path.write_text('샐러드 좋음\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='no review IDs'):
+        list(ReviewSource(str(path)).records())
+
+def test_in_memory_reviews_need_id_pairs():
+    assert list(review_records([('a', '국물'), ['b', '샐러드']])) == [('a', '국물'), ('b', '샐러드')]
+    with pytest.raises(ValueError, match='pair'):
+        list(review_records(['샐러드 좋음']))
+
+def test_dictionary_change_refuses_to_report(index, automaton):
+    seed(index, automaton)
+    changed = KeywordAutomaton({**KEYWORDS, '찌개': ['찌개']})
+    with pytest.raises(IndexVersionError):
+        index.counts(changed)
+    with pytest.raises(IndexVersionError):
+        index.update([('2', '김치찌개')], changed)
+    # 색인은 그대로 남아 예전 사전으로는 계속 집계됨
+    assert index.counts(automaton) == ({'국물': 2, '샐러드': 0}, 2)
+
+def test_rebuild_restores_counts(index, automaton):
+    seed(index, automaton)
+    changed = KeywordAutomaton({**KEYWORDS, '찌개': ['찌개']})
+    update = index.rebuild([('0', '국물 좋음'), ('1', '김치찌개')], changed)
+    assert update.added == 2
+    assert index.counts(changed) == ({'국물': 1, '샐러드': 0, '찌개': 1}, 2)
+
+def test_interrupted_rebuild_stays_blocked(index, automaton):
+    seed(index, automaton)
+    changed = KeywordAutomaton({**KEYWORDS, '찌개': ['찌개']})
+
+    def broken_history():
+        yield '0', '국물 좋음'
+        raise OSError('disk read failed')
+
+    with pytest.raises(OSError):
+        index.rebuild(broken_history(), changed, batch_size=1)
+    with pytest.raises(IndexVersionError, match='did not finish'):
+        index.counts(changed)
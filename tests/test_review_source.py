@@ -0,0 +1,14 @@
+from review_source import corpus_fingerprint
+
+def test_fingerprint_is_content_digest():
+    assert corpus_fingerprint(['좋아요', '건강식']) == corpus_fingerprint(('좋아요', '건강식'))
+    assert corpus_fingerprint(['좋아요', '건강식']) != corpus_fingerprint(['좋아요', '건강'])
+
+def test_fingerprint_separates_boundaries_and_pairs():
+    assert corpus_fingerprint(['ab', 'c']) != corpus_fingerprint(['a', 'bc'])
+    assert corpus_fingerprint([('1', '국물')]) != corpus_fingerprint([('1국', '물')])
+    assert corpus_fingerprint([('1', '국물')]) != corpus_fingerprint(['1', '국물'])
+
+def test_unidentifiable_corpora_have_no_fingerprint():
+    assert corpus_fingerprint(iter(['국물'])) is None
+    assert corpus_fingerprint([1.5]) is None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from survey_cube import SurveyCube
+from survey_features import IndicatorMatrix
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(7)
+    n = 2000
+    frame = pd.DataFrame({'age_group': rng.choice(['30대', '40대', '50대', None], n),
+                          'gender': rng.choice(['남성', '여성'], n),
+                          'store': rng.choice([f'매장{i}' for i in range(40)], n),
+                          'wave': rng.choice(['1차', '2차'], n)})
+    values = rng.integers(0, 2, (n, 3)).astype(np.uint8)
+    indicators = IndicatorMatrix(['satisfaction_가격', 'complaint_눅눅', 'menu_샐러드'], values)
+    frame = frame.fillna('미기재')
+    frame[indicators.columns] = values
+    return frame, SurveyCube.from_frame(frame, indicators)
+
+def test_segments_match_groupby(data):
+    frame, cube = data
+    segment = frame[(frame['age_group'] == '40대') & (frame['store'] == '매장3')]
+    assert cube.total(age_group='40대', store='매장3') == len(segment)
+    assert cube.count('complaint_눅눅', age_group='40대', store='매장3') == segment['complaint_눅눅'].sum()
+    assert cube.total() == len(frame)
+    assert cube.segment(gender='여성')['menu_샐러드'] == frame.loc[frame['gender'] == '여성', 'menu_샐러드'].sum()
+
+def test_rollup_matches_groupby(data):
+    frame, cube = data
+    expected = frame[frame['wave'] == '2차'].groupby('store')['satisfaction_가격'].sum()
+    rollup = cube.rollup('store', 'satisfaction_가격', wave='2차')
+    assert rollup == {store: int(expected.get(store, 0)) for store in frame['store'].unique()}
+
+def test_unknown_member_and_dimension(data):
+    _, cube = data
+    assert cube.total(store='없는 매장') == 0
+    with pytest.raises(KeyError):
+        cube.total(region='서울')
+
+def test_only_occupied_cells_are_stored(data):
+    frame, cube = data
+    occupied = frame.groupby(['age_group', 'gender', 'store', 'wave']).ngroups
+    assert len(cube.cells) == occupied
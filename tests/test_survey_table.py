@@ -0,0 +1,40 @@
+import numpy as np
+
+from survey_table import CategoricalColumn, PlainColumn, SurveyTable
+
+RECORDS = [
+    {'id': 'A1', 'age_group': '40대', 'complaints': '튀김이 눅눅함', 'note': None},
+    {'id': 'A2', 'age_group': '50대', 'complaints': '없음'},
+    {'id': 'A3', 'age_group': '40대', 'complaints': '튀김이 눅눅함', 'note': '재방문'},
+    {'id': 'A4', 'age_group': '30대'},
+]
+
+def test_records_round_trip_keeps_explicit_none():
+    table = SurveyTable.from_records(RECORDS, plain_fields=['complaints'])
+    assert table.records() == RECORDS
+    mask = table['age_group'].isin(['40대', '50대'])
+    assert table.records(mask) == RECORDS[:3]
+
+def test_plain_fields_and_high_cardinality_fields_are_plain():
+    records = [{'id': f'A{i}', 'age_group': ('40대', '50대')[i % 2], 'complaints': '없음'} for i in range(10)]
+    table = SurveyTable.from_records(records, plain_fields=['complaints'])
+    assert isinstance(table['complaints'], PlainColumn)
+    assert isinstance(table['id'], PlainColumn)
+    assert isinstance(table['age_group'], CategoricalColumn)
+
+def test_plain_column_matches_categorical_column():
+    values = ['없음', '튀김이 눅눅함', None, '없음', '가격']
+    plain, encoded = PlainColumn.encode(values), CategoricalColumn.encode(values)
+    assert list(plain) == list(encoded) == values
+    assert plain.counts() == encoded.counts()
+    assert plain.tally(lambda text: [text[:1]] if text else []) == encoded.tally(
+        lambda text: [text[:1]] if text else [])
+    mask = np.array([True, False, True, True, False])
+    assert list(plain.filter(mask)) == list(encoded.filter(mask))
+    assert plain.where(lambda text: text == '없음').tolist() == [True, False, False, True, False]
+
+def test_nbytes_counts_value_objects():
+    table = SurveyTable.from_records(RECORDS)
+    codes = sum(column.codes.nbytes for column in table.columns.values()
+                if isinstance(column, CategoricalColumn))
+    assert table.nbytes > codes + sum(len(value) for value in ('40대', '50대', '30대'))